@@ -47,7 +47,8 @@ echo "Creating test table in MariaDB..."
 $KUBECTL exec deployment/cdc-mariadb -- mariadb -udebezium -pdebezium testdb -e "
 CREATE TABLE IF NOT EXISTS cdc_test (
   id INT PRIMARY KEY AUTO_INCREMENT,
-  val INT NOT NULL DEFAULT 0
+  val INT NOT NULL DEFAULT 0,
+  src_us BIGINT NULL
 );
 "
 
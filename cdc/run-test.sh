@@ -1,10 +1,29 @@
 #!/bin/bash
 set -euo pipefail
 
+# CDC replication test: updates N rows in MariaDB and measures how they
+# reach YugabyteDB. Each UPDATE stamps src_us on its rows; a trigger on the
+# sink table (sink-stamp.sql) stamps sink_us as the JDBC sink applies them.
+# The stamps are exported to output/cdc_rows.csv for per-row lag
+# percentiles (scripts/cdc_lag.py), and output/test_times.txt is written
+# with WORKLOAD_TYPE=cdc so `make report` covers the same window.
+#
+# OP=insert measures N fresh INSERTs into emptied tables instead, which
+# also works with the sink's insert.mode=insert (used by sweep.sh).
+#
+# Usage: run-test.sh [rows]    (BATCH rows per source transaction, default 1000)
+
 KUBE_CONTEXT="${KUBE_CONTEXT:?KUBE_CONTEXT must be set}"
 NAMESPACE="${NAMESPACE:?NAMESPACE must be set}"
 KUBECTL="kubectl --context $KUBE_CONTEXT -n $NAMESPACE"
-ROWS="${1:-10000}"
+ROWS="${1:-${ROWS:-10000}}"
+BATCH="${BATCH:-1000}"
+OP="${OP:-update}"
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
+OUTPUT_DIR="${PROJECT_ROOT}/output"
+mkdir -p "$OUTPUT_DIR"
 
 mariadb_sql() {
     $KUBECTL exec deployment/cdc-mariadb -- mariadb -udebezium -pdebezium testdb -sNe "$1"
@@ -14,12 +33,28 @@ ysql() {
     $KUBECTL exec yb-tserver-0 -- /home/yugabyte/bin/ysqlsh -h yb-tserver-service -t -c "$1" 2>/dev/null | tr -d ' \n'
 }
 
-echo "=== CDC Replication Test: ${ROWS} Updates ==="
+if [ "$OP" != "update" ] && [ "$OP" != "insert" ]; then
+    echo "ERROR: OP must be update or insert" >&2
+    exit 1
+fi
+
+echo "=== CDC Replication Test: ${ROWS} ${OP^}s (${BATCH} rows per transaction) ==="
 echo ""
 
+mariadb_sql "ALTER TABLE cdc_test ADD COLUMN IF NOT EXISTS src_us BIGINT NULL;"
+mariadb_sql "TRUNCATE TABLE cdc_test;"
+
+if [ "$OP" = "insert" ]; then
+    # Step 1-2: Start from empty tables on both sides (TRUNCATE is not
+    # replicated). The table matches what the sink's auto.create would make.
+    echo "Step 1: Emptying cdc_test in YugabyteDB..."
+    $KUBECTL exec -i yb-tserver-0 -- /home/yugabyte/bin/ysqlsh -h yb-tserver-service -q -v ON_ERROR_STOP=1 << 'SQL'
+CREATE TABLE IF NOT EXISTS cdc_test (id INT PRIMARY KEY, val INT NOT NULL, src_us BIGINT);
+TRUNCATE cdc_test;
+SQL
+else
 # Step 1: Insert initial rows
 echo "Step 1: Inserting $ROWS rows into MariaDB..."
-mariadb_sql "TRUNCATE TABLE cdc_test;"
 mariadb_sql "INSERT INTO cdc_test (val) SELECT 0 FROM seq_1_to_${ROWS};"
 ROW_COUNT=$(mariadb_sql "SELECT COUNT(*) FROM cdc_test;")
 echo "  MariaDB row count: $ROW_COUNT"
@@ -43,21 +78,38 @@ while true; do
     sleep 2
 done
 echo "  Initial sync complete in ${ELAPSED}s"
+fi
+
+# The sink created (and evolved) cdc_test during the initial sync; stamp
+# arrivals from here on.
+$KUBECTL exec -i yb-tserver-0 -- /home/yugabyte/bin/ysqlsh -h yb-tserver-service \
+    -q -v ON_ERROR_STOP=1 -f - < "$SCRIPT_DIR/sink-stamp.sql"
+echo "  Sink arrival trigger installed"
 
-# Step 3: Run UPDATE benchmark
+# Step 3: Run UPDATE (or INSERT) benchmark
+# One autocommit statement per BATCH ids, in a single session. SYSDATE(6) is
+# evaluated per row, so src_us is within one transaction of the commit.
 echo ""
-echo "Step 3: Running $ROWS updates in MariaDB..."
+echo "Step 3: Running $ROWS ${OP}s in MariaDB..."
+SRC_US="CAST(UNIX_TIMESTAMP(SYSDATE(6)) * 1000000 AS SIGNED)"
 T1=$(date +%s%N)
 
-mariadb_sql "UPDATE cdc_test SET val = val + 1;"
+for ((lo = 1; lo <= ROWS; lo += BATCH)); do
+    hi=$(( lo + BATCH - 1 < ROWS ? lo + BATCH - 1 : ROWS ))
+    if [ "$OP" = "insert" ]; then
+        echo "INSERT INTO cdc_test (val, src_us) SELECT 1, $SRC_US FROM seq_${lo}_to_${hi};"
+    else
+        echo "UPDATE cdc_test SET val = val + 1, src_us = $SRC_US WHERE id BETWEEN $lo AND $hi;"
+    fi
+done | $KUBECTL exec -i deployment/cdc-mariadb -- mariadb -udebezium -pdebezium testdb
 
 T2=$(date +%s%N)
-UPDATE_MS=$(( (T2 - T1) / 1000000 ))
-echo "  UPDATE executed in ${UPDATE_MS}ms"
+SOURCE_MS=$(( (T2 - T1) / 1000000 ))
+echo "  ${OP^^} executed in ${SOURCE_MS}ms"
 
 # Step 4: Wait for updates to replicate
 echo ""
-echo "Step 4: Waiting for updates to replicate..."
+echo "Step 4: Waiting for ${OP}s to replicate..."
 while true; do
     COUNT=$(ysql "SELECT COUNT(*) FROM cdc_test WHERE val >= 1;" || echo "0")
     NOW=$(date +%s%N)
@@ -77,10 +129,36 @@ T3=$(date +%s%N)
 TOTAL_MS=$(( (T3 - T1) / 1000000 ))
 REPL_MS=$(( (T3 - T2) / 1000000 ))
 
+# Step 5: Export per-row stamps and the report window
+echo ""
+echo "Step 5: Exporting per-row stamps..."
+$KUBECTL exec yb-tserver-0 -- /home/yugabyte/bin/ysqlsh -h yb-tserver-service -q -c \
+    "COPY (SELECT id, src_us, sink_us FROM cdc_test WHERE val >= 1 AND id <= $ROWS ORDER BY id) TO STDOUT WITH (FORMAT csv, HEADER)" \
+    > "$OUTPUT_DIR/cdc_rows.csv"
+echo "  $(( $(wc -l < "$OUTPUT_DIR/cdc_rows.csv") - 1 )) rows -> $OUTPUT_DIR/cdc_rows.csv"
+$KUBECTL exec deployment/cdc-kafka-connect -- curl -sf "http://localhost:8083/connectors?expand=info" \
+    > "$OUTPUT_DIR/cdc_connectors.json" 2>/dev/null || echo "  Warning: could not save connector configs"
+{
+    echo "WORKLOAD_TYPE=cdc"
+    echo "RUN_START_TIME=$(( T1 / 1000000000 ))"
+    echo "RUN_END_TIME=$(( T3 / 1000000000 + 1 ))"
+    echo "CDC_ROWS=${ROWS}"
+    echo "CDC_BATCH=${BATCH}"
+    echo "CDC_OP=${OP}"
+} > "$OUTPUT_DIR/test_times.txt"
+
+{
+    echo ""
+    echo "=== Results ==="
+    echo "Rows:             $ROWS"
+    echo "Operation:        $OP, $BATCH rows per transaction"
+    echo "Source time:      ${SOURCE_MS}ms"
+    echo "Replication time: ${REPL_MS}ms (from commit to last row in YugabyteDB)"
+    echo "Total time:       ${TOTAL_MS}ms (end-to-end)"
+    echo "Throughput:       $(( ROWS * 1000 / TOTAL_MS )) rows/s (end-to-end)"
+    echo ""
+    echo "=== Per-row Lag (MariaDB ${OP^^} -> YugabyteDB apply) ==="
+    python3 "$PROJECT_ROOT/scripts/cdc_lag.py" "$OUTPUT_DIR/cdc_rows.csv"
+} | tee "$OUTPUT_DIR/cdc_output.txt"
 echo ""
-echo "=== Results ==="
-echo "Rows:             $ROWS"
-echo "UPDATE time:      ${UPDATE_MS}ms"
-echo "Replication time: ${REPL_MS}ms (from commit to last row in YugabyteDB)"
-echo "Total time:       ${TOTAL_MS}ms (end-to-end)"
-echo "Throughput:       $(( ROWS * 1000 / TOTAL_MS )) updates/s (end-to-end)"
+echo "Next: 'make report' for lag and throughput over time with Kafka Connect and YB metrics"
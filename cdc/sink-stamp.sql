@@ -0,0 +1,20 @@
+-- Sink arrival stamp for the CDC lag test (cdc/run-test.sh).
+-- Sets cdc_test.sink_us (microseconds since the epoch) on every row the
+-- JDBC sink inserts or upserts. clock_timestamp() is per row, not the
+-- transaction start, so rows applied in one sink batch keep distinct stamps.
+-- Idempotent; run after the sink has created cdc_test.
+
+ALTER TABLE cdc_test ADD COLUMN IF NOT EXISTS sink_us BIGINT;
+
+CREATE OR REPLACE FUNCTION cdc_stamp_sink()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.sink_us := (extract(epoch FROM clock_timestamp()) * 1000000)::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER trg_cdc_stamp_sink
+    BEFORE INSERT OR UPDATE ON cdc_test
+    FOR EACH ROW
+    EXECUTE FUNCTION cdc_stamp_sink();
@@ -0,0 +1,177 @@
+#!/bin/bash
+set -euo pipefail
+
+# JDBC sink settings sweep: reconfigures sink-yugabyte through the Kafka
+# Connect REST API and runs the replication test (run-test.sh) once per
+# combination of tasks.max, batch.size and insert.mode. Each step's per-row
+# stamps are kept as output/cdc_sweep_step_<n>.csv and its window recorded as
+# a CDC_SWEEP_STEP line in test_times.txt, so `make report` shows the sweep
+# table and chart over Kafka Connect and YB metrics for the whole sweep.
+# The original sink config is restored on exit.
+#
+#   SWEEP_TASKS         tasks.max values (default: "1 2 4")
+#   SWEEP_BATCH_SIZES   batch.size values; also max.poll.records (default: "500 2000")
+#   SWEEP_INSERT_MODES  insert.mode values (default: "upsert insert")
+#   ROWS, BATCH         passed to run-test.sh (default: 10000, 1000)
+#   OP                  run-test.sh operation (default: insert, so every mode
+#                       sees the same new rows; with OP=update, insert mode is skipped)
+
+KUBE_CONTEXT="${KUBE_CONTEXT:?KUBE_CONTEXT must be set}"
+NAMESPACE="${NAMESPACE:?NAMESPACE must be set}"
+KUBECTL="kubectl --context $KUBE_CONTEXT -n $NAMESPACE"
+
+SWEEP_TASKS="${SWEEP_TASKS:-1 2 4}"
+SWEEP_BATCH_SIZES="${SWEEP_BATCH_SIZES:-500 2000}"
+SWEEP_INSERT_MODES="${SWEEP_INSERT_MODES:-upsert insert}"
+export ROWS="${ROWS:-10000}"
+export BATCH="${BATCH:-1000}"
+export OP="${OP:-insert}"
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
+OUTPUT_DIR="${PROJECT_ROOT}/output"
+mkdir -p "$OUTPUT_DIR"
+rm -f "$OUTPUT_DIR"/cdc_sweep_step_*
+
+CONNECT="http://localhost:8083/connectors/sink-yugabyte"
+TOPIC="cdc.testdb.cdc_test"
+
+connect_get() {
+    $KUBECTL exec deployment/cdc-kafka-connect -- curl -sf "${CONNECT}$1"
+}
+
+# connect_put_config < config.json
+connect_put_config() {
+    $KUBECTL exec -i deployment/cdc-kafka-connect -- curl -sf -X PUT \
+        -H "Content-Type: application/json" --data-binary @- "${CONNECT}/config" > /dev/null
+}
+
+connect_post() {
+    $KUBECTL exec deployment/cdc-kafka-connect -- curl -sf -X POST "${CONNECT}$1" > /dev/null
+}
+
+# Wait until the committed task configs are the step's: tasks.max tasks,
+# each with its batch.size and insert.mode.
+wait_task_configs() {
+    local tasks=$1 batch_size=$2 mode=$3 configs
+    for _ in $(seq 60); do
+        configs=$(connect_get /tasks 2>/dev/null || true)
+        if [ -n "$configs" ] && python3 -c '
+import json, sys
+ts = json.loads(sys.argv[1])
+ok = len(ts) == int(sys.argv[2]) and all(
+    t["config"].get("batch.size") == sys.argv[3] and t["config"].get("insert.mode") == sys.argv[4] for t in ts)
+sys.exit(0 if ok else 1)
+' "$configs" "$tasks" "$batch_size" "$mode"; then
+            return 0
+        fi
+        sleep 2
+    done
+    echo "ERROR: sink-yugabyte task configs not updated to tasks.max=$tasks batch.size=$batch_size insert.mode=$mode" >&2
+    return 1
+}
+
+# Wait until the connector and all its tasks report RUNNING. Right after a
+# config change the old tasks still do, so callers restart them first.
+wait_running() {
+    local tasks=$1 status
+    for _ in $(seq 60); do
+        status=$(connect_get /status 2>/dev/null || true)
+        if [ -n "$status" ] && python3 -c '
+import json, sys
+s = json.loads(sys.argv[1])
+states = [s["connector"]["state"]] + [t["state"] for t in s["tasks"]]
+sys.exit(0 if len(s["tasks"]) == int(sys.argv[2]) and set(states) == {"RUNNING"} else 1)
+' "$status" "$tasks"; then
+            return 0
+        fi
+        sleep 2
+    done
+    echo "ERROR: sink-yugabyte not RUNNING with $tasks task(s): $status" >&2
+    return 1
+}
+
+echo "=== CDC Sink Settings Sweep ==="
+echo "tasks.max:   $SWEEP_TASKS"
+echo "batch.size:  $SWEEP_BATCH_SIZES"
+echo "insert.mode: $SWEEP_INSERT_MODES"
+echo "Per step:    $ROWS ${OP}s, $BATCH rows per source transaction"
+echo ""
+
+BASE_CONFIG="$OUTPUT_DIR/cdc_sweep_base_config.json"
+connect_get /config > "$BASE_CONFIG"
+restore() {
+    echo ""
+    echo "Restoring the original sink-yugabyte config..."
+    connect_put_config < "$BASE_CONFIG" || echo "WARN: restore failed; see $BASE_CONFIG" >&2
+}
+trap restore EXIT
+
+# Sink tasks split the topic's partitions, so tasks.max beyond the partition
+# count would idle. Adding partitions is one-way; run cdc-clean to undo.
+MAX_TASKS=$(printf '%s\n' $SWEEP_TASKS | sort -n | tail -1)
+PARTITIONS=$($KUBECTL exec deployment/cdc-kafka -- /opt/kafka/bin/kafka-topics.sh \
+    --bootstrap-server localhost:9092 --describe --topic "$TOPIC" | grep -oE 'PartitionCount: *[0-9]+' | grep -oE '[0-9]+')
+if [ "$PARTITIONS" -lt "$MAX_TASKS" ]; then
+    echo "Raising $TOPIC from $PARTITIONS to $MAX_TASKS partitions..."
+    $KUBECTL exec deployment/cdc-kafka -- /opt/kafka/bin/kafka-topics.sh \
+        --bootstrap-server localhost:9092 --alter --topic "$TOPIC" --partitions "$MAX_TASKS"
+fi
+
+STEPS=()
+START_TIME=$(date +%s)
+STEP=0
+for tasks in $SWEEP_TASKS; do
+    for batch_size in $SWEEP_BATCH_SIZES; do
+        for mode in $SWEEP_INSERT_MODES; do
+            if [ "$mode" = "insert" ] && [ "$OP" = "update" ]; then
+                echo "Skipping insert.mode=insert: OP=update would violate the primary key"
+                continue
+            fi
+            STEP=$(( STEP + 1 ))
+            echo "=== Step ${STEP}: tasks.max=${tasks} batch.size=${batch_size} insert.mode=${mode} ==="
+            python3 - "$BASE_CONFIG" "$tasks" "$batch_size" "$mode" << 'PY' | connect_put_config
+import json, sys
+config = json.load(open(sys.argv[1]))
+config.update({
+    "tasks.max": sys.argv[2],
+    "batch.size": sys.argv[3],
+    "consumer.override.max.poll.records": sys.argv[3],
+    "insert.mode": sys.argv[4],
+})
+print(json.dumps(config))
+PY
+            # The old tasks keep reporting RUNNING until the rebalance stops
+            # them, even with an unchanged tasks.max: wait for the new task
+            # configs, restart every task on them, then wait for RUNNING.
+            wait_task_configs "$tasks" "$batch_size" "$mode"
+            connect_post "/restart?includeTasks=true"
+            sleep 2
+            wait_running "$tasks"
+
+            STEP_START=$(date +%s)
+            "$SCRIPT_DIR/run-test.sh" | tee "$OUTPUT_DIR/cdc_sweep_step_${STEP}.txt"
+            STEP_END=$(date +%s)
+            cp "$OUTPUT_DIR/cdc_rows.csv" "$OUTPUT_DIR/cdc_sweep_step_${STEP}.csv"
+            # CDC_SWEEP_STEP=<n>,<tasks.max>,<batch.size>,<insert.mode>,<start>,<end>
+            STEPS+=("CDC_SWEEP_STEP=${STEP},${tasks},${batch_size},${mode},${STEP_START},${STEP_END}")
+            echo ""
+        done
+    done
+done
+END_TIME=$(date +%s)
+
+# Replace the last step's test_times.txt with the whole sweep window.
+{
+    echo "WORKLOAD_TYPE=cdc"
+    echo "RUN_START_TIME=${START_TIME}"
+    echo "RUN_END_TIME=${END_TIME}"
+    echo "CDC_ROWS=${ROWS}"
+    echo "CDC_BATCH=${BATCH}"
+    echo "CDC_OP=${OP}"
+    printf '%s\n' "${STEPS[@]}"
+} > "$OUTPUT_DIR/test_times.txt"
+
+python3 "$PROJECT_ROOT/scripts/cdc_lag.py" --sweep "$OUTPUT_DIR" | tee "$OUTPUT_DIR/cdc_sweep.txt"
+echo ""
+echo "Next: 'make report' for the sweep chart with Kafka Connect and YB metrics"
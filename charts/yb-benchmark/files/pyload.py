@@ -0,0 +1,695 @@
+#!/usr/bin/env python3
+"""pyload: asyncio load generator for the sysbench sbtest schema.
+
+Runs the sysbench OLTP workloads (same tables, statements, operation mix
+and flag names) from one Python process over an asyncpg connection pool,
+and prints sysbench-format progress lines and end-of-run statistics, so
+merge-sysbench-output.py and the report generator read its output
+unchanged. Latencies are recorded into log-linear (HdrHistogram-style)
+histograms, one per second; --hist-out writes them as JSON lines so
+percentiles can be merged exactly across pods and over any time window.
+
+    pyload.py oltp_read_write prepare --pgsql-host=127.0.0.1 --tables=2 --table_size=10000
+    pyload.py oltp_read_write run --threads=16 --time=60 --hist-out=hist.jsonl
+    pyload.py oltp_read_write cleanup
+
+The range_scan workload (not a sysbench script) runs one primary-key range
+query per event, with the range size drawn from --range_sizes, and keeps
+latency and rows scanned per range size (end-of-run table, --hist-out and
+--json-out):
+
+    pyload.py range_scan run --threads=32 --range_sizes=1,100,10000 --rand-type=pareto
+
+Any PostgreSQL works as a local stand-in for YugabyteDB. Needs asyncpg
+(pip install asyncpg).
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+from typing import Optional
+
+try:
+    import asyncpg
+except ImportError:
+    print("Error: asyncpg is required. Install with: pip install asyncpg", file=sys.stderr)
+    sys.exit(1)
+
+VERSION = "1"
+
+# Errors sysbench's PostgreSQL driver treats as ignorable: the event is
+# rolled back, counted in "ignored errors" and restarted.
+IGNORED_SQLSTATES = {"40001", "40P01", "23505"}
+CONNECTION_ERRORS = (asyncpg.exceptions.ConnectionDoesNotExistError,
+                     asyncpg.exceptions.InterfaceError, ConnectionError, OSError)
+
+
+class Histogram:
+    """Log-linear latency histogram in integer microseconds.
+
+    HdrHistogram layout with 256 sub-buckets per power of two: values
+    below 256us are exact, larger ones land in buckets under 1% wide.
+    Buckets are identified by their highest value, so histograms from
+    different processes merge by summing counts per value.
+    """
+    SUB_BITS = 8
+    SUB_COUNT = 1 << SUB_BITS
+    HALF = SUB_COUNT >> 1
+
+    __slots__ = ("counts", "total", "sum_us", "min_us", "max_us")
+
+    def __init__(self):
+        self.counts: dict[int, int] = {}
+        self.total = 0
+        self.sum_us = 0
+        self.min_us = 0
+        self.max_us = 0
+
+    @classmethod
+    def bucket_value(cls, us: int) -> int:
+        """Highest value (us) of the bucket holding us."""
+        if us < cls.SUB_COUNT:
+            return us
+        shift = us.bit_length() - cls.SUB_BITS
+        return (((us >> shift) + 1) << shift) - 1
+
+    def record(self, us: int):
+        v = self.bucket_value(us)
+        self.counts[v] = self.counts.get(v, 0) + 1
+        if not self.total or us < self.min_us:
+            self.min_us = us
+        self.max_us = max(self.max_us, us)
+        self.total += 1
+        self.sum_us += us
+
+    def merge(self, other: "Histogram"):
+        for v, c in other.counts.items():
+            self.counts[v] = self.counts.get(v, 0) + c
+        if other.total and (not self.total or other.min_us < self.min_us):
+            self.min_us = other.min_us
+        self.max_us = max(self.max_us, other.max_us)
+        self.total += other.total
+        self.sum_us += other.sum_us
+
+    def percentile_ms(self, pct: float) -> float:
+        if not self.total:
+            return 0.0
+        threshold = self.total * pct / 100.0
+        seen = 0
+        for v in sorted(self.counts):
+            seen += self.counts[v]
+            if seen >= threshold:
+                return v / 1000.0
+        return self.max_us / 1000.0
+
+
+class Window:
+    """Counters and latencies of the events that finished in one second;
+    range_scan events are also kept per range size (scans, scan_rows)."""
+    __slots__ = ("events", "reads", "writes", "others", "errors", "reconnects", "hist",
+                 "scans", "scan_rows")
+
+    def __init__(self):
+        self.events = self.reads = self.writes = self.others = 0
+        self.errors = self.reconnects = 0
+        self.hist = Histogram()
+        self.scans: dict[int, Histogram] = {}
+        self.scan_rows: dict[int, int] = {}
+
+    def record_scan(self, size: int, rows: int, us: int):
+        if size not in self.scans:
+            self.scans[size] = Histogram()
+            self.scan_rows[size] = 0
+        self.scans[size].record(us)
+        self.scan_rows[size] += rows
+
+    def merge(self, other: "Window"):
+        self.events += other.events
+        self.reads += other.reads
+        self.writes += other.writes
+        self.others += other.others
+        self.errors += other.errors
+        self.reconnects += other.reconnects
+        self.hist.merge(other.hist)
+        for size, h in other.scans.items():
+            if size not in self.scans:
+                self.scans[size] = Histogram()
+                self.scan_rows[size] = 0
+            self.scans[size].merge(h)
+            self.scan_rows[size] += other.scan_rows[size]
+
+
+def _digits(n: int) -> str:
+    return "".join(random.choices("0123456789", k=n))
+
+
+def c_value() -> str:
+    """sysbench c column: 10 groups of 11 digits joined by '-'."""
+    return "-".join(_digits(11) for _ in range(10))
+
+
+def pad_value() -> str:
+    """sysbench pad column: 5 groups of 11 digits joined by '-'."""
+    return "-".join(_digits(11) for _ in range(5))
+
+
+class Workload:
+    """The sysbench oltp_* scripts: one event() call is one sysbench event."""
+
+    NAMES = ("oltp_read_write", "oltp_read_only", "oltp_write_only", "oltp_point_select",
+             "oltp_update_index", "oltp_update_non_index", "oltp_delete", "oltp_insert",
+             "range_scan")
+
+    def __init__(self, name: str, args):
+        self.name = name
+        self.args = args
+        self.reads = name in ("oltp_read_write", "oltp_read_only")
+        self.writes = name in ("oltp_read_write", "oltp_write_only")
+        # c/pad strings are drawn from pools built once, so value generation
+        # does not compete with the event loop at high rates.
+        self.c_pool = [c_value() for _ in range(1000)]
+        self.pad_pool = [pad_value() for _ in range(1000)]
+
+    def table(self) -> str:
+        return f"sbtest{random.randint(1, self.args.tables)}"
+
+    def rand(self, n: int) -> int:
+        """1..n drawn by --rand-type, as sysbench's sb_rand_default()."""
+        a = self.args
+        if a.rand_type == "gaussian":
+            return min(n, max(1, round(random.gauss((n + 1) / 2, n / 6))))
+        if a.rand_type == "pareto":
+            # Fraction h of the keys gets 1 - h of the accesses, low ids hottest.
+            power = math.log(a.rand_pareto_h) / math.log(1 - a.rand_pareto_h)
+            return min(n, 1 + int(n * random.random() ** power))
+        return random.randint(1, n)
+
+    def row_id(self) -> int:
+        return self.rand(self.args.table_size)
+
+    async def event(self, conn) -> tuple[int, int, int, Optional[tuple[int, int]]]:
+        """Run one event; returns (reads, writes, others) statement counts and,
+        for range_scan, (range size, rows returned)."""
+        a = self.args
+        t = self.table()
+        if self.name == "range_scan":
+            # Any start that keeps the whole range inside the table. asyncpg
+            # prepares each statement once per connection and reuses it.
+            size = random.choice(a.range_sizes)
+            lo = self.rand(max(1, a.table_size - size + 1))
+            if a.range_query == "count":
+                rows = await conn.fetchval(
+                    f"SELECT COUNT(*) FROM {t} WHERE id BETWEEN $1 AND $2", lo, lo + size - 1)
+            else:
+                rows = len(await conn.fetch(
+                    f"SELECT id, k, c, pad FROM {t} WHERE id BETWEEN $1 AND $2", lo, lo + size - 1))
+            return 1, 0, 0, (size, rows)
+        if self.name == "oltp_point_select":
+            await conn.fetch(f"SELECT c FROM {t} WHERE id=$1", self.row_id())
+            return 1, 0, 0, None
+        if self.name == "oltp_update_index":
+            await conn.execute(f"UPDATE {t} SET k=k+1 WHERE id=$1", self.row_id())
+            return 0, 1, 0, None
+        if self.name == "oltp_update_non_index":
+            await conn.execute(f"UPDATE {t} SET c=$1 WHERE id=$2",
+                               random.choice(self.c_pool), self.row_id())
+            return 0, 1, 0, None
+        if self.name == "oltp_delete":
+            await conn.execute(f"DELETE FROM {t} WHERE id=$1", self.row_id())
+            return 0, 1, 0, None
+        if self.name == "oltp_insert":
+            n = a.num_rows_in_insert
+            values = ", ".join(f"(${3 * i + 1}, ${3 * i + 2}, ${3 * i + 3})" for i in range(n))
+            params = []
+            for _ in range(n):
+                params += [self.row_id(), random.choice(self.c_pool), random.choice(self.pad_pool)]
+            await conn.execute(f"INSERT INTO {t} (k, c, pad) VALUES {values}", *params)
+            return 0, 1, 0, None
+
+        reads = writes = others = 0
+        if not a.skip_trx:
+            await conn.execute("BEGIN")
+            others += 1
+        if self.reads:
+            for _ in range(a.point_selects):
+                await conn.fetch(f"SELECT c FROM {t} WHERE id=$1", self.row_id())
+                reads += 1
+            if a.range_selects:
+                for sql in (
+                    [f"SELECT c FROM {t} WHERE id BETWEEN $1 AND $2"] * a.simple_ranges
+                    + [f"SELECT SUM(k) FROM {t} WHERE id BETWEEN $1 AND $2"] * a.sum_ranges
+                    + [f"SELECT c FROM {t} WHERE id BETWEEN $1 AND $2 ORDER BY c"] * a.order_ranges
+                    + [f"SELECT DISTINCT c FROM {t} WHERE id BETWEEN $1 AND $2 ORDER BY c"]
+                    * a.distinct_ranges
+                ):
+                    lo = self.row_id()
+                    await conn.fetch(sql, lo, lo + a.range_size - 1)
+                    reads += 1
+        if self.writes:
+            for _ in range(a.index_updates):
+                await conn.execute(f"UPDATE {t} SET k=k+1 WHERE id=$1", self.row_id())
+                writes += 1
+            for _ in range(a.non_index_updates):
+                await conn.execute(f"UPDATE {t} SET c=$1 WHERE id=$2",
+                                   random.choice(self.c_pool), self.row_id())
+                writes += 1
+            for _ in range(a.delete_inserts):
+                rid = self.row_id()
+                await conn.execute(f"DELETE FROM {t} WHERE id=$1", rid)
+                await conn.execute(f"INSERT INTO {t} (id, k, c, pad) VALUES ($1, $2, $3, $4)",
+                                   rid, self.row_id(), random.choice(self.c_pool),
+                                   random.choice(self.pad_pool))
+                writes += 2
+        if not a.skip_trx:
+            await conn.execute("COMMIT")
+            others += 1
+        return reads, writes, others, None
+
+
+def connect_kwargs(args) -> dict:
+    return dict(host=args.pgsql_host, port=args.pgsql_port, user=args.pgsql_user,
+                password=args.pgsql_password, database=args.pgsql_db)
+
+
+async def prepare(args):
+    """Create and load sbtest1..N, one table per worker at a time, like sysbench."""
+    print(f"Creating {args.tables} table(s) of {args.table_size} rows "
+          f"with {min(args.threads, args.tables)} worker(s)")
+    pk = "PRIMARY KEY (id ASC)" if args.range_key_partitioning else "PRIMARY KEY (id)"
+    queue: asyncio.Queue = asyncio.Queue()
+    for i in range(1, args.tables + 1):
+        queue.put_nowait(i)
+
+    async def loader():
+        conn = await asyncpg.connect(**connect_kwargs(args))
+        try:
+            while not queue.empty():
+                i = queue.get_nowait()
+                t = f"sbtest{i}"
+                print(f"Creating table '{t}'...")
+                await conn.execute(
+                    f"CREATE TABLE {t} (id SERIAL, k INTEGER DEFAULT '0' NOT NULL, "
+                    f"c CHAR(120) DEFAULT '' NOT NULL, pad CHAR(60) DEFAULT '' NOT NULL, {pk})")
+                if args.serial_cache_size > 1:
+                    await conn.execute(f"ALTER SEQUENCE {t}_id_seq CACHE {args.serial_cache_size}")
+                print(f"Inserting {args.table_size} records into '{t}'")
+                chunk = 10000
+                for lo in range(1, args.table_size + 1, chunk):
+                    hi = min(lo + chunk, args.table_size + 1)
+                    await conn.copy_records_to_table(
+                        t, columns=["id", "k", "c", "pad"],
+                        records=[(rid, random.randint(1, args.table_size), c_value(), pad_value())
+                                 for rid in range(lo, hi)])
+                await conn.execute(f"SELECT setval('{t}_id_seq', $1)", max(args.table_size, 1))
+                if args.create_secondary:
+                    print(f"Creating a secondary index on '{t}'...")
+                    await conn.execute(f"CREATE INDEX k_{i} ON {t}(k)")
+        finally:
+            await conn.close()
+
+    await asyncio.gather(*(loader() for _ in range(min(args.threads, args.tables))))
+
+
+async def cleanup(args):
+    conn = await asyncpg.connect(**connect_kwargs(args))
+    try:
+        for i in range(1, args.tables + 1):
+            print(f"Dropping table 'sbtest{i}'...")
+            await conn.execute(f"DROP TABLE IF EXISTS sbtest{i}")
+    finally:
+        await conn.close()
+
+
+class Runner:
+    """Drives --threads workers for --time seconds (including --warmup-time,
+    as in sysbench) and reports every --report-interval seconds."""
+
+    def __init__(self, args, workload: Workload):
+        self.args = args
+        self.workload = workload
+        self.windows: dict[int, Window] = {}
+        self.total = Window()
+        self.worker_events = [0] * args.threads
+        self.worker_busy = [0.0] * args.threads
+        self.busy = 0
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.stopping = False
+        self.t0 = 0.0
+        self.hist_out = open(args.hist_out, "w") if args.hist_out else None
+
+    def window(self, now: float) -> Window:
+        s = int(now - self.t0)
+        w = self.windows.get(s)
+        if w is None:
+            w = self.windows[s] = Window()
+        return w
+
+    async def generator(self, end: float):
+        """--rate: queue events at exponentially distributed arrival times."""
+        loop = asyncio.get_running_loop()
+        due = self.t0
+        while True:
+            due += random.expovariate(self.args.rate)
+            if due >= end:
+                break
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.queue.put_nowait(due)
+        # Hold the workers until the deadline so the last interval is reported.
+        await asyncio.sleep(max(0.0, end - loop.time()))
+        for _ in range(self.args.threads):
+            self.queue.put_nowait(None)
+
+    async def worker(self, wid: int, pool, end: float):
+        loop = asyncio.get_running_loop()
+        warmup_end = self.t0 + self.args.warmup_time
+        while True:
+            if self.args.rate:
+                start = await self.queue.get()
+                if start is None:
+                    return
+            else:
+                start = loop.time()
+                if start >= end:
+                    return
+            self.busy += 1
+            try:
+                counts = await self.run_event(pool, loop)
+            finally:
+                self.busy -= 1
+            now = loop.time()
+            # Latency runs from the scheduled start with --rate, so queueing
+            # delay is included (no coordinated omission).
+            us = int((now - start) * 1e6)
+            w = self.window(now)
+            w.events += 1
+            w.reads += counts[0]
+            w.writes += counts[1]
+            w.others += counts[2]
+            w.hist.record(us)
+            if counts[3]:
+                w.record_scan(*counts[3], us)
+            if start >= warmup_end:
+                self.worker_events[wid] += 1
+                self.worker_busy[wid] += now - start
+
+    async def run_event(self, pool, loop) -> tuple[int, int, int, Optional[tuple[int, int]]]:
+        while True:
+            try:
+                async with pool.acquire() as conn:
+                    try:
+                        return await self.workload.event(conn)
+                    except asyncpg.PostgresError as e:
+                        if e.sqlstate not in IGNORED_SQLSTATES:
+                            raise
+                        self.window(loop.time()).errors += 1
+                        if not conn.is_in_transaction():
+                            continue
+                        await conn.execute("ROLLBACK")
+            except CONNECTION_ERRORS:
+                self.window(loop.time()).reconnects += 1
+                await asyncio.sleep(0.1)
+
+    def flush(self, upto: int, report: bool):
+        """Fold seconds [.., upto) into the totals and the histogram file;
+        with report, print them as one interval line."""
+        ri = self.args.report_interval
+        interval = Window()
+        for s in sorted(k for k in self.windows if k < upto):
+            w = self.windows.pop(s)
+            interval.merge(w)
+            if s >= self.args.warmup_time:
+                self.total.merge(w)
+            if self.hist_out:
+                rec = {"t": s, "n": w.hist.total, "errors": w.errors,
+                       "b": sorted(w.hist.counts.items())}
+                if w.scans:
+                    # Per range size: queries, rows scanned and their histogram.
+                    rec["scans"] = {str(size): {"n": h.total, "rows": w.scan_rows[size],
+                                                "b": sorted(h.counts.items())}
+                                    for size, h in w.scans.items()}
+                self.hist_out.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        if not report:
+            return
+        queries = interval.reads + interval.writes + interval.others
+        print(f"[ {upto}s ] thds: {self.args.threads} tps: {interval.events / ri:.2f} "
+              f"qps: {queries / ri:.2f} (r/w/o: {interval.reads / ri:.2f}/"
+              f"{interval.writes / ri:.2f}/{interval.others / ri:.2f}) "
+              f"lat (ms,95%): {interval.hist.percentile_ms(95):.2f} "
+              f"err/s: {interval.errors / ri:.2f} reconn/s: {interval.reconnects / ri:.2f}")
+        if self.args.rate:
+            print(f"[ {upto}s ] queue length: {self.queue.qsize()}, concurrency: {self.busy}")
+        sys.stdout.flush()
+
+    async def reporter(self):
+        loop = asyncio.get_running_loop()
+        ri = self.args.report_interval
+        k = 1
+        while not self.stopping:
+            await asyncio.sleep(max(0.0, self.t0 + k * ri - loop.time()))
+            if self.stopping:
+                break
+            self.flush(k * ri, report=True)
+            k += 1
+
+    async def run(self):
+        a = self.args
+        pool_size = a.pool_size or a.threads
+        print(f"pyload {VERSION} (Python {sys.version.split()[0]}, asyncpg {asyncpg.__version__})")
+        print("")
+        print("Running the test with following options:")
+        print(f"Number of threads: {a.threads}")
+        print(f"Connection pool size: {pool_size}")
+        if a.rate:
+            print(f"Target transaction rate: {a.rate}/sec")
+        print(f"Report intermediate results every {a.report_interval} second(s)")
+        print("")
+        print("Initializing worker threads...")
+        print("")
+        pool = await asyncpg.create_pool(min_size=pool_size, max_size=pool_size,
+                                         **connect_kwargs(a))
+        print("Threads started!")
+        print("")
+        sys.stdout.flush()
+
+        loop = asyncio.get_running_loop()
+        self.t0 = loop.time()
+        start_epoch = time.time()
+        end = self.t0 + a.time
+        if self.hist_out:
+            self.hist_out.write(json.dumps({
+                "format": "pyload-histogram", "version": 1, "unit": "us",
+                "start_epoch": start_epoch, "warmup_s": a.warmup_time, "time_s": a.time,
+                "threads": a.threads, "workload": self.workload.name,
+            }) + "\n")
+        reporter = asyncio.create_task(self.reporter())
+        tasks = [self.worker(i, pool, end) for i in range(a.threads)]
+        if a.rate:
+            tasks.append(self.generator(end))
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            self.stopping = True
+            reporter.cancel()
+            await pool.close()
+        elapsed = loop.time() - self.t0
+        # Events still in flight at the deadline land past the last full interval.
+        self.flush(math.inf, report=False)
+        if self.hist_out:
+            self.hist_out.close()
+        self.print_totals(elapsed - a.warmup_time)
+        if self.total.scans:
+            self.print_scans(elapsed - a.warmup_time)
+        if a.json_out:
+            with open(a.json_out, "w") as f:
+                json.dump(self.summary(elapsed - a.warmup_time), f, indent=2)
+
+    def scan_stats(self, elapsed: float) -> list[dict]:
+        """Throughput and latency per range size after warmup."""
+        elapsed = max(elapsed, 1e-9)
+        stats = []
+        for size in sorted(self.total.scans):
+            h = self.total.scans[size]
+            rows = self.total.scan_rows[size]
+            stats.append({
+                "range_size": size, "queries": h.total, "qps": h.total / elapsed,
+                "rows": rows, "rows_s": rows / elapsed,
+                "lat_avg": h.sum_us / h.total / 1000.0 if h.total else None,
+                "lat_p50": h.percentile_ms(50), "lat_p95": h.percentile_ms(95),
+                "lat_p99": h.percentile_ms(99), "lat_max": h.max_us / 1000.0,
+            })
+        return stats
+
+    def summary(self, elapsed: float) -> dict:
+        """--json-out: run options plus the totals after warmup."""
+        a = self.args
+        t = self.total
+        elapsed = max(elapsed, 1e-9)
+        summary = {
+            "workload": self.workload.name, "threads": a.threads,
+            "pool_size": a.pool_size or a.threads, "rate": a.rate,
+            "rand_type": a.rand_type, "time_s": elapsed,
+            "events": t.events, "eps": t.events / elapsed,
+            "errors": t.errors, "reconnects": t.reconnects,
+            "lat_p50": t.hist.percentile_ms(50), "lat_p95": t.hist.percentile_ms(95),
+            "lat_p99": t.hist.percentile_ms(99),
+        }
+        if t.scans:
+            summary["range_query"] = a.range_query
+            summary["range_scans"] = self.scan_stats(elapsed)
+        return summary
+
+    def print_scans(self, elapsed: float):
+        print("Range scans by range size (after warmup, ms):")
+        print(f"    {'size':>8} {'queries':>10} {'qps':>10} {'rows/s':>12} "
+              f"{'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+        for st in self.scan_stats(elapsed):
+            print(f"    {st['range_size']:>8} {st['queries']:>10} {st['qps']:>10.2f} "
+                  f"{st['rows_s']:>12.0f} {st['lat_p50']:>8.2f} {st['lat_p95']:>8.2f} "
+                  f"{st['lat_p99']:>8.2f} {st['lat_max']:>8.2f}")
+        print("")
+
+    def print_totals(self, elapsed: float):
+        a = self.args
+        t = self.total
+        queries = t.reads + t.writes + t.others
+        h = t.hist
+        events_avg = sum(self.worker_events) / a.threads
+        events_sd = math.sqrt(sum((e - events_avg) ** 2 for e in self.worker_events) / a.threads)
+        busy_avg = sum(self.worker_busy) / a.threads
+        busy_sd = math.sqrt(sum((b - busy_avg) ** 2 for b in self.worker_busy) / a.threads)
+        elapsed = max(elapsed, 1e-9)
+        if a.histogram:
+            print("Latency histogram (values are in milliseconds)")
+            print("       value  ------------- distribution ------------- count")
+            peak = max(h.counts.values(), default=1)
+            for v in sorted(h.counts):
+                c = h.counts[v]
+                stars = "*" * max(1, round(40 * c / peak))
+                print(f"{v / 1000.0:>12.3f} |{stars:<40} {c}")
+            print(" ")
+        print("SQL statistics:")
+        print("    queries performed:")
+        print(f"        read:                            {t.reads}")
+        print(f"        write:                           {t.writes}")
+        print(f"        other:                           {t.others}")
+        print(f"        total:                           {queries}")
+        print(f"    transactions:                        {t.events} ({t.events / elapsed:.2f} per sec.)")
+        print(f"    queries:                             {queries} ({queries / elapsed:.2f} per sec.)")
+        print(f"    ignored errors:                      {t.errors}      ({t.errors / elapsed:.2f} per sec.)")
+        print(f"    reconnects:                          {t.reconnects}      ({t.reconnects / elapsed:.2f} per sec.)")
+        print("")
+        print("Throughput:")
+        print(f"    events/s (eps):                      {t.events / elapsed:.4f}")
+        print(f"    time elapsed:                        {elapsed:.4f}s")
+        print(f"    total number of events:              {t.events}")
+        print("")
+        print("Latency (ms):")
+        print(f"         min:                                  {h.min_us / 1000.0:>8.2f}")
+        print(f"         avg:                                  {(h.sum_us / h.total / 1000.0 if h.total else 0.0):>8.2f}")
+        print(f"         max:                                  {h.max_us / 1000.0:>8.2f}")
+        print(f"         95th percentile:                      {h.percentile_ms(95):>8.2f}")
+        print(f"         sum:                            {h.sum_us / 1000.0:.2f}")
+        print("")
+        print("Threads fairness:")
+        print(f"    events (avg/stddev):           {events_avg:.4f}/{events_sd:.2f}")
+        print(f"    execution time (avg/stddev):   {busy_avg:.4f}/{busy_sd:.2f}")
+        print("")
+
+
+def _bool(value: str) -> bool:
+    if value.lower() in ("on", "true", "yes", "1"):
+        return True
+    if value.lower() in ("off", "false", "no", "0"):
+        return False
+    raise argparse.ArgumentTypeError(f"expected on/off or true/false, got {value!r}")
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(
+        description="asyncio load generator for the sysbench sbtest schema "
+                    "(sysbench-compatible flags and output)")
+    p.add_argument("workload", choices=Workload.NAMES)
+    p.add_argument("command", choices=("prepare", "run", "cleanup"))
+    # Connection (sysbench pgsql driver names)
+    p.add_argument("--pgsql-host", default="localhost")
+    p.add_argument("--pgsql-port", type=int, default=5433)
+    p.add_argument("--pgsql-user", default="yugabyte")
+    p.add_argument("--pgsql-password", default="yugabyte")
+    p.add_argument("--pgsql-db", default="yugabyte")
+    # General (sysbench core options)
+    p.add_argument("--threads", type=int, default=1,
+                   help="concurrent workers (asyncio tasks), one event in flight each")
+    p.add_argument("--pool-size", type=int, default=0,
+                   help="connections in the pool (0 = --threads)")
+    p.add_argument("--time", type=int, default=10, help="run time in seconds, warmup included")
+    p.add_argument("--warmup-time", type=int, default=0)
+    p.add_argument("--report-interval", type=int, default=10)
+    p.add_argument("--rate", type=float, default=0,
+                   help="open loop: target events/s with Poisson arrivals (0 = closed loop)")
+    p.add_argument("--histogram", type=_bool, default=False,
+                   help="print the latency histogram at the end, like sysbench")
+    p.add_argument("--hist-out", default="",
+                   help="write per-second latency histograms (JSON lines) to this file")
+    p.add_argument("--json-out", default="",
+                   help="write the run summary (per range size for range_scan) as JSON")
+    p.add_argument("--rand-type", default="uniform", choices=("uniform", "gaussian", "pareto"),
+                   help="distribution of row ids and range starts over the table")
+    p.add_argument("--rand-pareto-h", type=float, default=0.2,
+                   help="pareto: fraction of keys that gets 1 - h of the accesses")
+    # Workload (sysbench oltp_common.lua options)
+    p.add_argument("--tables", type=int, default=1)
+    p.add_argument("--table_size", type=int, default=10000)
+    p.add_argument("--range_key_partitioning", type=_bool, default=False)
+    p.add_argument("--serial_cache_size", type=int, default=1000)
+    p.add_argument("--create_secondary", type=_bool, default=True)
+    p.add_argument("--skip_trx", type=_bool, default=False)
+    p.add_argument("--point_selects", type=int, default=10)
+    p.add_argument("--range_selects", type=_bool, default=True)
+    p.add_argument("--simple_ranges", type=int, default=1)
+    p.add_argument("--sum_ranges", type=int, default=1)
+    p.add_argument("--order_ranges", type=int, default=1)
+    p.add_argument("--distinct_ranges", type=int, default=1)
+    p.add_argument("--range_size", type=int, default=100)
+    p.add_argument("--index_updates", type=int, default=1)
+    p.add_argument("--non_index_updates", type=int, default=1)
+    p.add_argument("--delete_inserts", type=int, default=1)
+    p.add_argument("--num_rows_in_insert", type=int, default=1)
+    # range_scan
+    p.add_argument("--range_sizes", default="1,10,100,1000,10000",
+                   help="range_scan: comma-separated range sizes, one drawn per event")
+    p.add_argument("--range_query", default="select", choices=("select", "count"),
+                   help="range_scan: fetch the rows (select) or count them server-side")
+    args = p.parse_args(argv)
+    if args.threads < 1:
+        p.error("--threads must be >= 1")
+    try:
+        args.range_sizes = sorted({int(v) for v in args.range_sizes.split(",") if v.strip()})
+    except ValueError:
+        p.error(f"--range_sizes must be comma-separated integers, got {args.range_sizes!r}")
+    if not args.range_sizes or args.range_sizes[0] < 1:
+        p.error("--range_sizes must be positive")
+    if not 0 < args.rand_pareto_h < 1:
+        p.error("--rand-pareto-h must be between 0 and 1")
+    if args.report_interval < 1:
+        p.error("--report-interval must be >= 1")
+    return args
+
+
+def main():
+    args = parse_args()
+    if args.command == "prepare":
+        asyncio.run(prepare(args))
+    elif args.command == "cleanup":
+        asyncio.run(cleanup(args))
+    else:
+        asyncio.run(Runner(args, Workload(args.workload, args)).run())
+
+
+if __name__ == "__main__":
+    main()
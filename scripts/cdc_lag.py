@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Per-row replication lag of the CDC test (cdc/run-test.sh).
+
+Every row the test writes carries two stamps, in microseconds since the
+epoch: src_us, set in MariaDB by the UPDATE (or INSERT) that wrote it, and
+sink_us, set in YugabyteDB by a trigger (cdc/sink-stamp.sql) when the JDBC
+sink applied it. run-test.sh exports them to output/cdc_rows.csv.
+
+Shared by cdc/run-test.sh (summary on stdout) and
+report-generator/generate_report.py (--workload-type cdc):
+
+    rows = read_rows(path)            # [(src_us, sink_us), ...]
+    result = analyze(rows, start)     # summary + per-interval series
+
+A sink settings sweep (cdc/sweep.sh) keeps one cdc_sweep_step_<n>.csv per
+setting; analyze_sweep() compares them and `cdc_lag.py --sweep <dir>` prints
+the comparison table.
+
+The stamps come from two different clocks (MariaDB pod and tserver node),
+so lag includes their NTP offset; on one cluster that is well under 1ms.
+"""
+
+import csv
+import math
+import sys
+from pathlib import Path
+from typing import Optional
+
+
+def read_rows(path: Path) -> list[tuple[int, int]]:
+    """(src_us, sink_us) pairs from cdc_rows.csv (header: id,src_us,sink_us).
+
+    Rows missing either stamp (not updated, or applied before the trigger
+    existed) are skipped.
+    """
+    rows = []
+    with open(path, newline="") as f:
+        for rec in csv.DictReader(f):
+            if rec.get("src_us") and rec.get("sink_us"):
+                rows.append((int(rec["src_us"]), int(rec["sink_us"])))
+    return rows
+
+
+def percentile(sorted_values: list[float], p: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list (None if empty)."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(p / 100.0 * len(sorted_values)) - 1)]
+
+
+def analyze(rows: list[tuple[int, int]], start_epoch: float, interval: int = 1) -> Optional[dict]:
+    """Lag distribution, throughput and catch-up rate of one CDC run.
+
+    Intervals follow the sysbench layout used by the report: `time` is the
+    end of the interval in seconds since start_epoch, `tps` the rows applied
+    in YugabyteDB per second and lat_50/95/99 the lag (ms) of those rows.
+    `src_s` is rows committed in MariaDB per second and `backlog` the rows
+    committed but not yet applied at the end of the interval.
+    """
+    if not rows:
+        return None
+    lags = sorted((sink - src) / 1000.0 for src, sink in rows)
+    src_first = min(r[0] for r in rows) / 1e6
+    src_last = max(r[0] for r in rows) / 1e6
+    sink_first = min(r[1] for r in rows) / 1e6
+    sink_last = max(r[1] for r in rows) / 1e6
+    n = len(rows)
+
+    # Catch-up: how fast the sink drained what was still queued when the
+    # source finished.
+    after_source = sum(1 for _, sink in rows if sink / 1e6 > src_last)
+    catch_up_s = max(0.0, sink_last - src_last)
+
+    nbuckets = int((max(src_last, sink_last) - start_epoch) // interval) + 1
+    committed = [0] * nbuckets
+    applied = [0] * nbuckets
+    bucket_lags: list[list[float]] = [[] for _ in range(nbuckets)]
+    for src, sink in rows:
+        committed[max(0, int((src / 1e6 - start_epoch) // interval))] += 1
+        k = max(0, int((sink / 1e6 - start_epoch) // interval))
+        applied[k] += 1
+        bucket_lags[k].append((sink - src) / 1000.0)
+
+    intervals = []
+    backlog = 0
+    for k in range(nbuckets):
+        backlog += committed[k] - applied[k]
+        lat = sorted(bucket_lags[k])
+        intervals.append({
+            "time": (k + 1) * interval,
+            "tps": applied[k] / interval,
+            "src_s": committed[k] / interval,
+            "backlog": backlog,
+            "lat_50": percentile(lat, 50),
+            "lat_95": percentile(lat, 95),
+            "lat_99": percentile(lat, 99),
+            "err_s": 0.0,
+        })
+
+    return {
+        "rows": n,
+        "lag_avg": sum(lags) / n,
+        "lag_p50": percentile(lags, 50),
+        "lag_p95": percentile(lags, 95),
+        "lag_p99": percentile(lags, 99),
+        "lag_max": lags[-1],
+        "source_s": src_last - src_first,
+        "source_rows_s": n / (src_last - src_first) if src_last > src_first else None,
+        "apply_s": sink_last - sink_first,
+        "apply_rows_s": n / (sink_last - sink_first) if sink_last > sink_first else None,
+        "end_to_end_s": sink_last - src_first,
+        "backlog_at_source_end": after_source,
+        "catch_up_s": catch_up_s,
+        "catch_up_rows_s": after_source / catch_up_s if catch_up_s > 0 else None,
+        "intervals": intervals,
+    }
+
+
+def format_summary(result: dict) -> str:
+    def rate(v):
+        return "-" if v is None else f"{v:.0f} rows/s"
+
+    return "\n".join([
+        f"Rows with lag stamps: {result['rows']}",
+        f"Lag (ms):          avg {result['lag_avg']:.1f}  p50 {result['lag_p50']:.1f}  "
+        f"p95 {result['lag_p95']:.1f}  p99 {result['lag_p99']:.1f}  max {result['lag_max']:.1f}",
+        f"Source commits:    {result['source_s']:.2f}s ({rate(result['source_rows_s'])})",
+        f"Sink applies:      {result['apply_s']:.2f}s ({rate(result['apply_rows_s'])})",
+        f"End to end:        {result['end_to_end_s']:.2f}s",
+        f"Catch-up:          {result['backlog_at_source_end']} rows queued at source end, "
+        f"drained in {result['catch_up_s']:.2f}s ({rate(result['catch_up_rows_s'])})",
+    ])
+
+
+def read_sweep_steps(times_file: Path) -> list[dict]:
+    """CDC_SWEEP_STEP lines of test_times.txt, written by cdc/sweep.sh as
+    CDC_SWEEP_STEP=<n>,<tasks.max>,<batch.size>,<insert.mode>,<start>,<end>."""
+    if not times_file.exists():
+        return []
+    steps = []
+    with open(times_file) as f:
+        for line in f:
+            if not line.startswith("CDC_SWEEP_STEP="):
+                continue
+            n, tasks, batch_size, mode, start, end = line.split("=", 1)[1].strip().split(",")
+            steps.append({
+                "step": int(n), "tasks": int(tasks), "batch_size": int(batch_size),
+                "insert_mode": mode, "start_epoch": int(start), "end_epoch": int(end),
+            })
+    return steps
+
+
+def analyze_sweep(workload_dir: Path, steps: list[dict], start_epoch: float) -> Optional[dict]:
+    """Throughput and lag of each sink setting of a sweep.
+
+    Each step is analyzed on its own; its intervals are shifted onto the
+    sweep's time axis (seconds since start_epoch) and tagged with the step.
+    `best_step` is the setting with the highest end-to-end rows/s.
+    """
+    intervals = []
+    sweep = []
+    for st in steps:
+        path = workload_dir / f"cdc_sweep_step_{st['step']}.csv"
+        result = analyze(read_rows(path), st["start_epoch"]) if path.exists() else None
+        if result is None:
+            print(f"Warning: no stamped rows for sweep step {st['step']} ({path})", file=sys.stderr)
+            continue
+        offset = st["start_epoch"] - int(start_epoch)
+        for iv in result["intervals"]:
+            iv["time"] += offset
+            iv["step"] = st["step"]
+            intervals.append(iv)
+        sweep.append({
+            **{k: st[k] for k in ("step", "tasks", "batch_size", "insert_mode")},
+            "rows": result["rows"],
+            "apply_rows_s": result["apply_rows_s"],
+            "rows_s": result["rows"] / result["end_to_end_s"] if result["end_to_end_s"] > 0 else None,
+            "lag_p50": result["lag_p50"],
+            "lag_p95": result["lag_p95"],
+            "lag_p99": result["lag_p99"],
+            "lag_max": result["lag_max"],
+        })
+    if not sweep:
+        return None
+    best = max(sweep, key=lambda p: p["rows_s"] or 0)
+    return {"intervals": intervals, "sweep": sweep, "best_step": best["step"]}
+
+
+def format_sweep(result: dict) -> str:
+    def num(v, fmt):
+        return "-" if v is None else format(v, fmt)
+
+    lines = [f"{'Step':>4}  {'tasks':>5}  {'batch':>6}  {'mode':<7}  {'rows':>7}  {'rows/s':>8}  "
+             f"{'apply/s':>8}  {'p50 ms':>8}  {'p95 ms':>8}  {'p99 ms':>8}"]
+    for p in result["sweep"]:
+        lines.append(
+            f"{p['step']:>4}  {p['tasks']:>5}  {p['batch_size']:>6}  {p['insert_mode']:<7}  {p['rows']:>7}  "
+            f"{num(p['rows_s'], '8.0f')}  {num(p['apply_rows_s'], '8.0f')}  {p['lag_p50']:8.1f}  "
+            f"{p['lag_p95']:8.1f}  {p['lag_p99']:8.1f}"
+            + ("  <- best" if p["step"] == result["best_step"] else ""))
+    lines.append("rows/s is end to end: rows over first source commit to last sink apply.")
+    return "\n".join(lines)
+
+
+def main():
+    if len(sys.argv) == 3 and sys.argv[1] == "--sweep":
+        workload_dir = Path(sys.argv[2])
+        steps = read_sweep_steps(workload_dir / "test_times.txt")
+        result = analyze_sweep(workload_dir, steps, min((st["start_epoch"] for st in steps), default=0))
+        if result is None:
+            print(f"No CDC sweep steps with stamped rows in {workload_dir}", file=sys.stderr)
+            sys.exit(1)
+        print(format_sweep(result))
+        return
+    if len(sys.argv) != 2:
+        print("Usage: cdc_lag.py <cdc_rows.csv> | --sweep <output dir>", file=sys.stderr)
+        sys.exit(1)
+    rows = read_rows(Path(sys.argv[1]))
+    result = analyze(rows, min((r[0] for r in rows), default=0) / 1e6)
+    if result is None:
+        print("No rows with both src_us and sink_us stamps", file=sys.stderr)
+        sys.exit(1)
+    print(format_summary(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -78,6 +78,9 @@ fullnameOverride: ""
 sysbench:
   enabled: false
 
+pyload:
+  enabled: false
+
 # k6 benchmark — connects to tserver VM over libvirt bridge
 k6:
   enabled: true
@@ -98,6 +101,25 @@ k6:
   createSecondary: true
   installTrigger: true
   serialCacheSize: 1000
+  # single | multi (batchSize rows per INSERT) | txn (batchSize INSERTs per transaction)
+  insertMode: single
+  batchSize: 100
+  # Pre-generated c/pad values shared by all VUs (false = build per row)
+  valuePool: true
+  valuePoolSize: 100000
+  executor: constant-vus
+  rate: 100
+  maxVUs: 0
+  rateStages: ""
+  # Limit for setup() creating and (test-mixed.js) loading the tables
+  setupTimeout: "10m"
+  # test-mixed.js operation weights (relative, one operation per iteration; 0 disables)
+  mix:
+    pointSelects: 10
+    indexUpdates: 1
+    nonIndexUpdates: 1
+    deletes: 1
+    inserts: 1
   vus: 4
   warmupTime: 30
   duration: "120s"
@@ -4,108 +4,24 @@
 Used by sysbench-run-with-timestamps.sh when running multiple sysbench pods
 in parallel. Produces a file in the exact same format as a single sysbench
 run so the downstream report pipeline works unmodified.
+
+Inputs are streamed: each pod's intervals are read line by line and
+k-way merged by time, so memory does not grow with run length.
 """
 
 import argparse
+import heapq
 import re
-import sys
-from collections import defaultdict
-
-
-INTERVAL_RE = re.compile(
-    r'\[\s*(\d+)s\s*\]\s*thds:\s*(\d+)\s*tps:\s*([\d.]+)\s*qps:\s*([\d.]+)\s*'
-    r'\(r/w/o:\s*([\d.]+)/([\d.]+)/([\d.]+)\)\s*lat\s*\(ms,95%\):\s*([\d.]+)\s*'
-    r'err/s:\s*([\d.]+)\s*reconn/s:\s*([\d.]+)'
-)
-
-
-def parse_intervals(text):
-    intervals = {}
-    for m in INTERVAL_RE.finditer(text):
-        t = int(m.group(1))
-        intervals[t] = {
-            "time": t,
-            "threads": int(m.group(2)),
-            "tps": float(m.group(3)),
-            "qps": float(m.group(4)),
-            "read_qps": float(m.group(5)),
-            "write_qps": float(m.group(6)),
-            "other_qps": float(m.group(7)),
-            "lat_95": float(m.group(8)),
-            "err_s": float(m.group(9)),
-            "reconn_s": float(m.group(10)),
-        }
-    return intervals
-
-
-def parse_totals(text):
-    totals = {}
-
-    for key in ["read", "write", "other", "total"]:
-        m = re.search(rf'^\s*{key}:\s+(\d+)', text, re.MULTILINE)
-        if m:
-            totals[f"sql_{key}"] = int(m.group(1))
-
-    m = re.search(r'transactions:\s+(\d+)\s+\(([\d.]+) per sec\.\)', text)
-    if m:
-        totals["transactions"] = int(m.group(1))
-        totals["tps"] = float(m.group(2))
-
-    m = re.search(r'queries:\s+(\d+)\s+\(([\d.]+) per sec\.\)', text)
-    if m:
-        totals["queries"] = int(m.group(1))
-        totals["qps"] = float(m.group(2))
-
-    m = re.search(r'ignored errors:\s+(\d+)\s+\(([\d.]+) per sec\.\)', text)
-    if m:
-        totals["errors"] = int(m.group(1))
-        totals["errors_ps"] = float(m.group(2))
-
-    m = re.search(r'reconnects:\s+(\d+)\s+\(([\d.]+) per sec\.\)', text)
-    if m:
-        totals["reconnects"] = int(m.group(1))
-        totals["reconnects_ps"] = float(m.group(2))
-
-    m = re.search(r'events/s \(eps\):\s+([\d.]+)', text)
-    if m:
-        totals["eps"] = float(m.group(1))
-
-    m = re.search(r'time elapsed:\s+([\d.]+)', text)
-    if m:
-        totals["elapsed"] = float(m.group(1))
-
-    m = re.search(r'total number of events:\s+(\d+)', text)
-    if m:
-        totals["total_events"] = int(m.group(1))
+from contextlib import ExitStack
+from itertools import groupby
 
-    for key, label in [("min", "lat_min"), ("avg", "lat_avg"), ("max", "lat_max"),
-                        ("95th percentile", "lat_p95"), ("sum", "lat_sum")]:
-        m = re.search(rf'^\s*{re.escape(key)}:\s+([\d.]+)', text, re.MULTILINE)
-        if m:
-            totals[label] = float(m.group(1))
+import sysbench_parser
 
-    m = re.search(r'events \(avg/stddev\):\s+([\d.]+)/([\d.]+)', text)
-    if m:
-        totals["fair_events_avg"] = float(m.group(1))
-        totals["fair_events_stddev"] = float(m.group(2))
 
-    m = re.search(r'execution time \(avg/stddev\):\s+([\d.]+)/([\d.]+)', text)
-    if m:
-        totals["fair_time_avg"] = float(m.group(1))
-        totals["fair_time_stddev"] = float(m.group(2))
-
-    # Parse thread count from header
-    m = re.search(r'Number of threads:\s+(\d+)', text)
-    if m:
-        totals["threads"] = int(m.group(1))
-
-    return totals
-
-
-def merge_intervals(all_intervals):
-    all_times = sorted(set(t for iv in all_intervals for t in iv))
-    merged = []
-    for t in all_times:
+def merge_intervals(streams):
+    """Merge per-pod Interval streams (each in time order) into summed rows."""
+    merged = heapq.merge(*streams, key=lambda iv: iv.time)
+    for t, pods in groupby(merged, key=lambda iv: iv.time):
         row = {
             "time": t,
             "threads": 0,
@@ -118,21 +34,20 @@ def merge_intervals(all_intervals):
             "err_s": 0.0,
             "reconn_s": 0.0,
         }
-        for iv in all_intervals:
-            if t not in iv:
-                continue
-            pod = iv[t]
-            row["threads"] += pod["threads"]
-            row["tps"] += pod["tps"]
-            row["qps"] += pod["qps"]
-            row["read_qps"] += pod["read_qps"]
-            row["write_qps"] += pod["write_qps"]
-            row["other_qps"] += pod["other_qps"]
-            row["lat_95"] = max(row["lat_95"], pod["lat_95"])
-            row["err_s"] += pod["err_s"]
-            row["reconn_s"] += pod["reconn_s"]
-        merged.append(row)
-    return merged
+        for pod in pods:
+            row["threads"] += pod.threads
+            row["tps"] += pod.tps
+            row["qps"] += pod.qps
+            row["read_qps"] += pod.read_qps
+            row["write_qps"] += pod.write_qps
+            row["other_qps"] += pod.other_qps
+            row["lat_95"] = max(row["lat_95"], pod.lat_95)
+            row["err_s"] += pod.err_s
+            row["reconn_s"] += pod.reconn_s
+            if pod.queue_length is not None:
+                row["queue_length"] = row.get("queue_length", 0) + pod.queue_length
+                row["concurrency"] = row.get("concurrency", 0) + pod.concurrency
+        yield row
 
 
 def merge_totals(all_totals):
@@ -183,23 +98,19 @@ def merge_totals(all_totals):
 
 
 def format_interval(iv):
-    return (
+    line = (
         f'[ {iv["time"]}s ] thds: {iv["threads"]} '
         f'tps: {iv["tps"]:.2f} qps: {iv["qps"]:.2f} '
         f'(r/w/o: {iv["read_qps"]:.2f}/{iv["write_qps"]:.2f}/{iv["other_qps"]:.2f}) '
         f'lat (ms,95%): {iv["lat_95"]:.2f} err/s: {iv["err_s"]:.2f} reconn/s: {iv["reconn_s"]:.2f}'
     )
+    if "queue_length" in iv:
+        line += f'\n[ {iv["time"]}s ] queue length: {iv["queue_length"]}, concurrency: {iv["concurrency"]}'
+    return line
 
 
-def format_output(header_text, intervals, totals, num_pods):
+def format_totals(totals):
     lines = []
-
-    lines.append(header_text.rstrip())
-    lines.append("")
-
-    for iv in intervals:
-        lines.append(format_interval(iv))
-
     lines.append("SQL statistics:")
     lines.append("    queries performed:")
     lines.append(f'        read:                            {totals.get("sql_read", 0)}')
@@ -230,16 +141,11 @@ def format_output(header_text, intervals, totals, num_pods):
     return "\n".join(lines)
 
 
-def extract_header(text):
-    """Extract everything before the first interval line."""
-    m = re.search(r'\[\s*\d+s\s*\]', text)
-    if m:
-        return text[:m.start()].rstrip()
-    # No intervals found — return up to SQL statistics
-    m = re.search(r'^SQL statistics:', text, re.MULTILINE)
-    if m:
-        return text[:m.start()].rstrip()
-    return text[:200]
+def merged_header(header, total_threads, num_pods):
+    """Rewrite the first pod's header to reflect the merged run."""
+    per_pod = total_threads // num_pods if num_pods > 0 else total_threads
+    header = re.sub(r'Threads: \d+', f'Threads: {total_threads} ({num_pods} pods x {per_pod})', header)
+    return re.sub(r'Number of threads: \d+', f'Number of threads: {total_threads}', header)
 
 
 def main():
@@ -248,32 +154,29 @@ def main():
     parser.add_argument("-o", "--output", required=True, help="Output merged file")
     args = parser.parse_args()
 
-    all_texts = []
-    for path in args.inputs:
-        with open(path) as f:
-            all_texts.append(f.read())
-
-    all_intervals = [parse_intervals(t) for t in all_texts]
-    all_totals_parsed = [parse_totals(t) for t in all_texts]
-
-    merged_intervals = merge_intervals(all_intervals)
-    merged_totals = merge_totals(all_totals_parsed)
-
-    header = extract_header(all_texts[0])
-    # Update the header to reflect merged state
-    total_threads = merged_totals.get("threads", 0)
     num_pods = len(args.inputs)
-    per_pod = total_threads // num_pods if num_pods > 0 else total_threads
-    header = re.sub(r'Threads: \d+', f'Threads: {total_threads} ({num_pods} pods x {per_pod})', header)
-    header = re.sub(r'Number of threads: \d+', f'Number of threads: {total_threads}', header)
-
-    output = format_output(header, merged_intervals, merged_totals, num_pods)
-
-    with open(args.output, "w") as f:
-        f.write(output)
+    count = 0
+    with ExitStack() as stack:
+        readers = [sysbench_parser.OutputReader(stack.enter_context(open(p))) for p in args.inputs]
+        rows = merge_intervals(r.intervals() for r in readers)
+        # The merge pulls the first interval of every input before yielding,
+        # so all headers (and their "Number of threads") are parsed by then.
+        first = next(rows, None)
+        total_threads = sum(r.totals.threads or 0 for r in readers)
+
+        with open(args.output, "w") as out:
+            out.write(merged_header(readers[0].header, total_threads, num_pods) + "\n\n")
+            if first is not None:
+                out.write(format_interval(first) + "\n")
+                count = 1
+                for row in rows:
+                    out.write(format_interval(row) + "\n")
+                    count += 1
+            merged_totals = merge_totals([r.totals.as_dict() for r in readers])
+            out.write(format_totals(merged_totals))
 
     print(f"Merged {num_pods} outputs -> {args.output} (total threads: {total_threads}, "
-          f"intervals: {len(merged_intervals)})")
+          f"intervals: {count})")
 
 
 if __name__ == "__main__":
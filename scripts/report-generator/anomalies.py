@@ -0,0 +1,232 @@
+"""
+Anomalous workload intervals (TPS drops, latency spikes, error bursts)
+and the dumped metrics that changed most during each of them.
+
+Detection uses robust z-scores over the post-warmup intervals, so the
+dips being looked for do not inflate the spread they are measured
+against:
+
+    z = (x - median) / (1.4826 * MAD)
+
+(mean absolute deviation x 1.2533 when more than half the values are equal,
+e.g. err/s that is zero almost everywhere). An interval is anomalous when
+TPS has z <= -3.5 and is at least 10% under the median, when p95 has
+z >= 3.5 and is at least 10% over it, or when err/s has z >= 3.5. Flagged
+intervals at most one interval apart merge into one window.
+
+For each window, every dumped series is resampled onto the interval grid
+(suspects.resample) and its window mean compared with a baseline: up to
+`baseline` clean post-warmup intervals either side of the window. Change
+is scored the same robust way against the baseline, and each metric name
+keeps its most-changed series.
+
+Used by generate_report.py (results summary, report panel and chart
+annotations, summary.txt) and on its own against a saved report:
+
+    python3 anomalies.py reports/<run>       # reads results.json + metrics_dump.*
+"""
+
+import math
+import statistics
+import sys
+from pathlib import Path
+from typing import Optional
+
+import suspects
+
+THRESHOLD = 3.5
+MIN_CHANGE = 0.10
+# Robust z of a metric change is capped so flat baselines stay sortable
+# (and JSON-serializable).
+MAX_Z = 999.0
+
+
+def _robust_scale(values: list[float], center: float) -> float:
+    """Spread for a robust z-score: 1.4826 x MAD, falling back to 1.2533 x
+    mean absolute deviation when the MAD is zero; 0 for a constant series."""
+    dev = [abs(v - center) for v in values]
+    mad = statistics.median(dev)
+    if mad > 0:
+        return 1.4826 * mad
+    return 1.2533 * sum(dev) / len(dev)
+
+
+def robust_z(values: list[float]) -> list[Optional[float]]:
+    """Robust z-score of each value; None everywhere for a constant series."""
+    center = statistics.median(values)
+    scale = _robust_scale(values, center)
+    if scale == 0:
+        return [None] * len(values)
+    return [(v - center) / scale for v in values]
+
+
+def _flags(rows: list[dict]) -> list[dict]:
+    """{kind: robust z} for every interval, for each kind it is anomalous in."""
+    flags: list[dict] = [{} for _ in rows]
+    checks = (
+        ("TPS drop", "tps", -1),
+        ("p95 spike", "lat_95", 1),
+        ("err/s burst", "err_s", 1),
+    )
+    for kind, key, sign in checks:
+        values = [iv.get(key) for iv in rows]
+        if any(v is None for v in values):
+            continue
+        values = [float(v) for v in values]
+        median = statistics.median(values)
+        for i, z in enumerate(robust_z(values)):
+            if z is None or sign * z < THRESHOLD:
+                continue
+            if key != "err_s" and abs(values[i] - median) < MIN_CHANGE * abs(median):
+                continue
+            flags[i][kind] = round(z, 2)
+    return flags
+
+
+def _windows(flags: list[dict]) -> list[tuple[int, int]]:
+    """(first, last) row index of each run of flagged rows, allowing
+    single-interval gaps."""
+    windows: list[list[int]] = []
+    for i, f in enumerate(flags):
+        if not f:
+            continue
+        if windows and i - windows[-1][1] <= 2:
+            windows[-1][1] = i
+        else:
+            windows.append([i, i])
+    return [(a, b) for a, b in windows]
+
+
+def _metric_changes(dump: list[dict], ends: list[float], width: float, windows: list[tuple[int, int]],
+                    flagged: set, baseline: int, top_k: int) -> list[list[dict]]:
+    """Top-k most-changed metric names per window (see module docstring)."""
+    # Clean baseline rows around each window, computed once.
+    bases = []
+    for a, b in windows:
+        before = [i for i in range(a - 1, -1, -1) if i not in flagged][:baseline]
+        after = [i for i in range(b + 1, len(ends)) if i not in flagged][:baseline]
+        bases.append(before + after)
+    best: list[dict[str, dict]] = [{} for _ in windows]
+    for s in dump:
+        if s.get("constant"):
+            continue
+        values = suspects.resample(s.get("values", []), ends, width)
+        if values is None:
+            continue
+        metric = s.get("metric", {})
+        name = metric.get("__name__", "")
+        for w, (a, b) in enumerate(windows):
+            base = [values[i] for i in bases[w]]
+            if len(base) < 3:
+                continue
+            center = statistics.median(base)
+            during = sum(values[a:b + 1]) / (b - a + 1)
+            if during == center:
+                continue
+            # A flat baseline is scaled by a hundredth of its level so any
+            # move off it ranks high without dividing by zero.
+            scale = _robust_scale(base, center) or (abs(center) / 100 if center else 0)
+            z = math.copysign(MAX_Z, during - center) if scale == 0 else \
+                max(-MAX_Z, min(MAX_Z, (during - center) / scale))
+            if abs(z) < THRESHOLD:
+                continue
+            prev = best[w].get(name)
+            if prev is not None and abs(prev["z"]) >= abs(z):
+                continue
+            best[w][name] = {
+                "name": name,
+                "series": suspects.series_label(metric),
+                "baseline": center,
+                "during": during,
+                "change_pct": round((during - center) / abs(center) * 100, 1) if center else None,
+                "z": round(z, 2),
+            }
+    return [sorted(b.values(), key=lambda m: -abs(m["z"]))[:top_k] for b in best]
+
+
+def detect_anomalies(intervals: list[dict], start_epoch: float, warmup_s: float = 0,
+                     dump: Optional[list[dict]] = None, baseline: int = 6,
+                     max_anomalies: int = 10, top_k: int = 8) -> list[dict]:
+    """Anomaly windows of a run in time order: the max_anomalies most severe.
+
+    intervals are the report's workload intervals (`time` = seconds since
+    start_epoch at the end of the interval, `tps`, `lat_95`, `err_s`); only
+    those after warmup are used. Each window carries its span in seconds
+    since start (start_s is the start of its first interval), the kinds
+    that fired with their peak robust z, TPS and p95 during the window
+    against the post-warmup median and, given a metrics dump, the metrics
+    that changed most against the surrounding baseline.
+    """
+    rows = [iv for iv in intervals if iv.get("time", 0) > warmup_s and iv.get("tps") is not None]
+    if len(rows) < suspects.MIN_POINTS:
+        return []
+    width = rows[1]["time"] - rows[0]["time"]
+    if width <= 0:
+        return []
+    flags = _flags(rows)
+    windows = _windows(flags)
+    if not windows:
+        return []
+
+    tps_median = statistics.median(float(iv["tps"]) for iv in rows)
+    lat = [iv.get("lat_95") for iv in rows]
+    lat_median = statistics.median(float(v) for v in lat) if all(v is not None for v in lat) else None
+
+    anomalies = []
+    for a, b in windows:
+        kinds: dict[str, float] = {}
+        for f in flags[a:b + 1]:
+            for kind, z in f.items():
+                if abs(z) > abs(kinds.get(kind, 0)):
+                    kinds[kind] = z
+        span = rows[a:b + 1]
+        anomalies.append({
+            "start_s": rows[a]["time"] - width,
+            "end_s": rows[b]["time"],
+            "intervals": b - a + 1,
+            "kinds": kinds,
+            "severity": max(abs(z) for z in kinds.values()),
+            "tps": sum(float(iv["tps"]) for iv in span) / len(span),
+            "tps_median": tps_median,
+            "lat_95": max(float(iv["lat_95"]) for iv in span) if lat_median is not None else None,
+            "lat_95_median": lat_median,
+            "err_s": max(float(iv.get("err_s") or 0) for iv in span),
+        })
+
+    order = sorted(sorted(range(len(anomalies)), key=lambda k: -anomalies[k]["severity"])[:max_anomalies])
+    windows = [windows[k] for k in order]
+    anomalies = [anomalies[k] for k in order]
+    if dump:
+        flagged = {i for i, f in enumerate(flags) if f}
+        ends = [start_epoch + iv["time"] for iv in rows]
+        for anomaly, changes in zip(anomalies, _metric_changes(dump, ends, width, windows, flagged,
+                                                               baseline, top_k)):
+            anomaly["metrics"] = changes
+    return anomalies
+
+
+def format_anomalies(anomalies: list[dict]) -> str:
+    lines = []
+    for i, an in enumerate(anomalies, 1):
+        kinds = ", ".join(f"{k} (z {z:+.1f})" for k, z in an["kinds"].items())
+        lat = f"  p95 {an['lat_95']:.1f}ms vs {an['lat_95_median']:.1f}" if an["lat_95"] is not None else ""
+        lines.append(f"  {i:>2}. {an['start_s']:.0f}-{an['end_s']:.0f}s  {kinds}")
+        lines.append(f"      TPS {an['tps']:.1f} vs median {an['tps_median']:.1f}{lat}"
+                     + (f"  err/s {an['err_s']:.2f}" if an["err_s"] else ""))
+        for m in an.get("metrics", []):
+            change = f"{m['change_pct']:+.0f}%" if m["change_pct"] is not None else "new"
+            series = f" {{{m['series']}}}" if m["series"] else ""
+            lines.append(f"      {m['z']:>+7.1f}  {change:>7}  {m['name']}{series}")
+    return "\n".join(lines)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: anomalies.py <report dir>", file=sys.stderr)
+        sys.exit(1)
+    anomalies = detect_anomalies(*suspects.load_report(Path(sys.argv[1])))
+    print(format_anomalies(anomalies) if anomalies else "No anomalous intervals after warmup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+End-to-end benchmark for the report pipeline against fake_prometheus.py.
+
+Each scenario starts a synthetic Prometheus API with N YB metric names,
+then runs ReportGenerator (vm mode, HttpQueryExecutor) in a fresh
+subprocess over a 1h or 8h window, with a matching synthetic
+sysbench_output.txt so interval enrichment runs too. Recorded per
+scenario: wall time, peak RSS, query count, dump series and output sizes.
+
+Results are compared with bench_baseline.json; the script exits 1 if any
+metric regresses beyond its tolerance. Wall time and RSS are
+machine-dependent — refresh the baseline on the machine that runs the
+comparison (--update-baseline) after intentional changes. CI runners vary
+more than their tolerance, so CI passes --counts-only: query count, dump
+series and output sizes are gated, wall time and RSS only reported.
+
+Usage:
+    python3 bench_pipeline.py                      # default scenarios vs baseline
+    python3 bench_pipeline.py --counts-only        # CI: gate deterministic metrics only
+    python3 bench_pipeline.py --all                # every scenario
+    python3 bench_pipeline.py --scenario 5k-8h
+    python3 bench_pipeline.py --update-baseline
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = SCRIPT_DIR / "bench_baseline.json"
+
+# name -> (YB metric names, window seconds, run in the default/CI set)
+SCENARIOS = {
+    "1k-1h": (1000, 3600, True),
+    "1k-8h": (1000, 8 * 3600, False),
+    # ~2 min and ~2GB RSS: run locally (--scenario 5k-1h), not on every PR.
+    "5k-1h": (5000, 3600, False),
+    "5k-8h": (5000, 8 * 3600, False),
+    "20k-1h": (20000, 3600, False),
+    "20k-8h": (20000, 8 * 3600, False),
+}
+
+# Allowed growth over baseline before a metric counts as a regression.
+# Wall time is noisy on shared runners; counts and sizes are deterministic.
+TOLERANCES = {
+    "wall_s": 0.30,
+    "peak_rss_mb": 0.20,
+    "queries": 0.0,
+    "dump_series": 0.0,
+    "html_bytes": 0.05,
+    "dump_bytes": 0.05,
+}
+
+# Not gated under --counts-only: they depend on the machine.
+MACHINE_DEPENDENT = ("wall_s", "peak_rss_mb")
+
+_START = 1_700_000_000
+_RESULT_PREFIX = "BENCH_RESULT "
+
+
+def _write_sysbench_output(path: Path, window: int, interval: int = 10):
+    lines = [
+        f"[ {t}s ] thds: 24 tps: {900 + t % 97:.2f} qps: {18000 + t % 389:.2f} "
+        f"(r/w/o: 12600.00/3600.00/1800.00) lat (ms,95%): {30 + t % 13:.2f} err/s: 0.00 reconn/s: 0.00"
+        for t in range(interval, window + 1, interval)
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join(lines) + "\n")
+
+
+def run_child(scenario: str, port: int, workdir: Path):
+    """Run one generator pass in this (fresh) process and print the result."""
+    sys.path.insert(0, str(SCRIPT_DIR))
+    import generate_report as g
+    from genstats import peak_rss_mb
+
+    _, window, _ = SCENARIOS[scenario]
+    _write_sysbench_output(workdir / "output" / "sysbench_output.txt", window)
+    config = g.ReportConfig(
+        start_time=_START,
+        end_time=_START + window,
+        prometheus_url=f"http://127.0.0.1:{port}",
+        output_dir=str(workdir / "reports"),
+        mode="vm",
+        title=f"bench {scenario}",
+    )
+    t0 = time.perf_counter()
+    generator = g.ReportGenerator(config)
+    generator.validate_connectivity()
+    html = generator.generate_report()
+    output_file = generator.save_report(html)
+    wall = time.perf_counter() - t0
+
+    dump_files = list(output_file.parent.glob("metrics_dump.*.gz"))
+    result = {
+        "wall_s": round(wall, 2),
+        "peak_rss_mb": round(peak_rss_mb() or 0, 1),
+        "queries": len(generator.stats.queries),
+        "dump_series": len(generator.yb_dump),
+        "html_bytes": output_file.stat().st_size,
+        "dump_bytes": dump_files[0].stat().st_size if dump_files else 0,
+        "phases": {p["name"]: p["wall_s"] for p in generator.stats.phases},
+    }
+    print(_RESULT_PREFIX + json.dumps(result))
+
+
+def run_scenario(scenario: str, latency_ms: float, verbose: bool) -> dict:
+    sys.path.insert(0, str(SCRIPT_DIR))
+    from fake_prometheus import SyntheticMetrics, start_server
+
+    names, _, _ = SCENARIOS[scenario]
+    server = start_server(SyntheticMetrics(names), latency_ms=latency_ms)
+    try:
+        with tempfile.TemporaryDirectory(prefix=f"bench-{scenario}-") as tmp:
+            proc = subprocess.run(
+                [sys.executable, str(Path(__file__).resolve()), "--child", scenario,
+                 "--port", str(server.server_port), "--workdir", tmp],
+                capture_output=True, text=True,
+            )
+    finally:
+        server.shutdown()
+    if verbose or proc.returncode != 0:
+        sys.stderr.write(proc.stdout + proc.stderr)
+    if proc.returncode != 0:
+        raise RuntimeError(f"scenario {scenario} failed (exit {proc.returncode})")
+    for line in proc.stdout.splitlines():
+        if line.startswith(_RESULT_PREFIX):
+            return json.loads(line[len(_RESULT_PREFIX):])
+    raise RuntimeError(f"scenario {scenario} produced no result")
+
+
+def compare(scenario: str, result: dict, baseline: dict, counts_only: bool = False) -> list[str]:
+    """Return one message per metric that exceeds its baseline tolerance."""
+    regressions = []
+    for key, tol in TOLERANCES.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        if counts_only and key in MACHINE_DEPENDENT:
+            print(f"           {key} {result[key]} vs baseline {base} (not gated)")
+            continue
+        if result[key] > base * (1 + tol) + (0 if tol == 0 else 1e-9):
+            regressions.append(f"{scenario}: {key} {result[key]} > baseline {base} (+{tol:.0%} allowed)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline against a fake Prometheus")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="Scenario to run (repeatable; default: the CI set)")
+    parser.add_argument("--all", action="store_true", help="Run every scenario")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write results into the baseline file instead of comparing")
+    parser.add_argument("--counts-only", action="store_true",
+                        help="Gate only deterministic metrics; report wall time and RSS without comparing")
+    parser.add_argument("--latency-ms", type=float, default=0,
+                        help="Per-request delay added by the fake server (default: 0)")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Show generator output")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--port", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--workdir", type=Path, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.port, args.workdir)
+        return
+
+    if args.all:
+        scenarios = list(SCENARIOS)
+    else:
+        scenarios = args.scenario or [s for s, (_, _, ci) in SCENARIOS.items() if ci]
+
+    baseline = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    results = {}
+    regressions = []
+    print(f"{'scenario':<10} {'wall s':>8} {'rss MB':>8} {'queries':>8} {'series':>8} "
+          f"{'html KB':>9} {'dump KB':>9}")
+    for scenario in scenarios:
+        r = run_scenario(scenario, args.latency_ms, args.verbose)
+        results[scenario] = r
+        print(f"{scenario:<10} {r['wall_s']:>8.1f} {r['peak_rss_mb']:>8.0f} {r['queries']:>8} "
+              f"{r['dump_series']:>8} {r['html_bytes'] / 1024:>9.0f} {r['dump_bytes'] / 1024:>9.0f}")
+        slowest = sorted(r["phases"].items(), key=lambda kv: -kv[1])[:3]
+        print("           slowest phases: " + ", ".join(f"{n} {s:.1f}s" for n, s in slowest))
+        if not args.update_baseline and scenario in baseline:
+            regressions.extend(compare(scenario, r, baseline[scenario], args.counts_only))
+
+    if args.update_baseline:
+        for scenario, r in results.items():
+            baseline[scenario] = {k: r[k] for k in TOLERANCES}
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline updated: {args.baseline}")
+        return
+
+    missing = [s for s in scenarios if s not in baseline]
+    if missing:
+        print(f"No baseline for: {', '.join(missing)} (run with --update-baseline)")
+    if regressions:
+        print("\nREGRESSIONS:")
+        for msg in regressions:
+            print(f"  {msg}")
+        sys.exit(1)
+    print("\nNo regressions against baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compare metrics dump encodings: legacy JSON+gzip vs TSZ1 (Gorilla)+gzip.
+
+Reports compressed size, encode time and decode time for both formats, and
+checks that the TSZ1 round trip is lossless for every value.
+
+Usage:
+    python3 bench_tscodec.py                              # synthetic dump
+    python3 bench_tscodec.py reports/<ts>/metrics_dump.json.gz
+    python3 bench_tscodec.py --series 5000 --points 960
+"""
+
+import argparse
+import gzip
+import json
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+import tscodec
+
+
+def synthetic_dump(n_series: int, n_points: int, step: int, seed: int) -> list[dict]:
+    """Build a dump shaped like a real YB run: mostly idle/flat series,
+    some noisy rates, some slowly drifting gauges."""
+    rng = random.Random(seed)
+    t0 = 1_700_000_000
+    dump = []
+    for i in range(n_series):
+        kind = rng.random()
+        if kind < 0.5:
+            vals = [0.0] * n_points
+        elif kind < 0.8:
+            base = rng.uniform(1, 5000)
+            vals = [max(0.0, base * (1 + rng.gauss(0, 0.2))) for _ in range(n_points)]
+        else:
+            level = rng.uniform(1e6, 1e9)
+            vals = []
+            for _ in range(n_points):
+                level += rng.choice((0, 0, 0, 4096, -4096))
+                vals.append(level)
+        dump.append({
+            "metric": {"__name__": f"synthetic_metric_{i % 400}", "exported_instance": f"yb-tserver-{i % 3}"},
+            "values": [[t0 + j * step, str(v)] for j, v in enumerate(vals)],
+        })
+    return dump
+
+
+def timed(fn, *args, repeat: int = 3):
+    best = math.inf
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark metrics dump encodings")
+    parser.add_argument("dump", nargs="?", help="Existing metrics_dump.{json,tsz}.gz (default: synthetic)")
+    parser.add_argument("--series", type=int, default=2000, help="Synthetic series count (default: 2000)")
+    parser.add_argument("--points", type=int, default=720, help="Synthetic points per series (default: 720)")
+    parser.add_argument("--step", type=int, default=5, help="Synthetic step in seconds (default: 5)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.dump:
+        dump = tscodec.load_dump(Path(args.dump))
+        source = args.dump
+    else:
+        dump = synthetic_dump(args.series, args.points, args.step, args.seed)
+        source = f"synthetic {args.series} series x {args.points} points"
+    n_points = sum(len(s["values"]) for s in dump)
+    print(f"Input: {source} ({len(dump)} series, {n_points} points)")
+
+    def json_encode(d):
+        return gzip.compress(json.dumps(d, separators=(",", ":")).encode())
+
+    def json_decode(b):
+        return json.loads(gzip.decompress(b))
+
+    def tsz_encode(d):
+        return gzip.compress(tscodec.encode_dump(d))
+
+    def tsz_decode(b):
+        return tscodec.decode_dump(gzip.decompress(b))
+
+    json_blob, json_enc = timed(json_encode, dump)
+    _, json_dec = timed(json_decode, json_blob)
+    tsz_blob, tsz_enc = timed(tsz_encode, dump)
+    decoded, tsz_dec = timed(tsz_decode, tsz_blob)
+
+    lossy = 0
+    for orig, back in zip(dump, decoded):
+        for (t0, v0), (t1, v1) in zip(orig["values"], back["values"]):
+            a, b = float(v0), v1
+            if round(float(t0) * 1000) != round(t1 * 1000) or not (a == b or (math.isnan(a) and math.isnan(b))):
+                lossy += 1
+
+    print(f"{'format':<12} {'size':>12} {'bytes/pt':>9} {'encode':>9} {'decode':>9}")
+    for name, blob, enc, dec in (("json+gzip", json_blob, json_enc, json_dec),
+                                 ("tsz+gzip", tsz_blob, tsz_enc, tsz_dec)):
+        print(f"{name:<12} {len(blob) / 1024:>9.1f} KB {len(blob) / max(n_points, 1):>9.2f} "
+              f"{enc * 1000:>7.0f}ms {dec * 1000:>7.0f}ms")
+    print(f"Size ratio tsz/json: {len(tsz_blob) / len(json_blob):.2f}")
+    if lossy:
+        print(f"FAIL: {lossy} points did not round-trip", file=sys.stderr)
+        sys.exit(1)
+    print("Round trip: lossless")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Synthetic Prometheus/VictoriaMetrics HTTP API for exercising the report
+generator without a cluster.
+
+Serves the endpoints generate_report.py uses — label values, metadata,
+instant `count by (__name__)` estimates and query_range — for a fixed set
+of synthetic YB (yb-tserver/yb-master) and node-exporter metric names
+across a few instances. Roughly half of all series are flat zeros, like
+an idle YB cluster; the rest are noisy.
+
+Used by bench_pipeline.py; can also be run standalone and pointed at with
+`generate_report.py --mode vm --prometheus-url http://127.0.0.1:<port>`.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+# Series variants: responses reuse one pre-serialized values array per
+# (window, variant), so the server stays cheap at 20k names.
+_VARIANTS = 8
+_FLAT_VARIANTS = 4
+# Values of the extra labels metric_catalog.yaml groups node metrics by;
+# a `sum by` over one of them returns one series per value.
+_LABEL_VALUES = {
+    "mode": ["idle", "user", "system", "iowait", "steal", "softirq", "irq", "nice"],
+    "device": ["eth0", "lo"],
+}
+
+
+class SyntheticMetrics:
+    """Deterministic metric universe for one benchmark scenario."""
+
+    def __init__(self, yb_names: int, node_names: int = 300, instances: int = 3):
+        self.instances = instances
+        # Every third YB name is a gauge; the rest are counters. A few
+        # _bucket names exercise the histogram filter.
+        self.yb_types: dict[str, str] = {}
+        for i in range(yb_names):
+            if i % 50 == 49:
+                self.yb_types[f"ybsyn_latency_{i:05d}_bucket"] = "histogram"
+            else:
+                self.yb_types[f"ybsyn_metric_{i:05d}"] = "gauge" if i % 3 == 0 else "counter"
+        self.node_types = {
+            (f"node_syn_{i:04d}_total" if i % 2 else f"node_syn_{i:04d}"): ("counter" if i % 2 else "gauge")
+            for i in range(node_names)
+        }
+        self._values_cache: dict[tuple, str] = {}
+        self._lock = threading.Lock()
+
+    def ip(self, i: int) -> str:
+        return f"10.0.0.{i + 1}"
+
+    def values_json(self, start: float, end: float, step: int, variant: int) -> str:
+        key = (start, end, step, variant)
+        with self._lock:
+            cached = self._values_cache.get(key)
+        if cached is not None:
+            return cached
+        n = int((end - start) // step) + 1
+        if variant < _FLAT_VARIANTS:
+            vals = ["0"] * n
+        else:
+            rng = random.Random(variant)
+            base = rng.uniform(10, 10000)
+            vals = [repr(round(base * (1 + rng.gauss(0, 0.1)), 6)) for _ in range(n)]
+        text = json.dumps([[start + i * step, v] for i, v in enumerate(vals)], separators=(",", ":"))
+        with self._lock:
+            self._values_cache[key] = text
+        return text
+
+    def names_for(self, match: str) -> list[str]:
+        if "yb-tserver" in match or "yb-master" in match:
+            return sorted(self.yb_types)
+        if "node-exporter" in match:
+            return sorted(self.node_types)
+        return []
+
+    def instances_for(self, match: str) -> list[str]:
+        port = 9100 if "node-exporter" in match else 9000
+        return [f"{self.ip(i)}:{port}" for i in range(self.instances)]
+
+
+class _Handler(BaseHTTPRequestHandler):
+    metrics: SyntheticMetrics = None
+    latency_s: float = 0.0
+    request_count = 0
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def _send(self, payload: Optional[str], status: int = 200):
+        body = (payload or "").encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        type(self).request_count += 1
+        if self.latency_s:
+            time.sleep(self.latency_s)
+        u = urlparse(self.path)
+        qs = {k: v[0] for k, v in parse_qs(u.query).items()}
+        path = u.path
+        m = self.metrics
+
+        if path == "/api/v1/status/config":
+            return self._send('{"status":"success","data":{"yaml":""}}')
+        if path == "/api/v1/label/__name__/values":
+            return self._send(json.dumps({"status": "success", "data": m.names_for(qs.get("match[]", ""))}))
+        if path == "/api/v1/label/instance/values":
+            return self._send(json.dumps({"status": "success", "data": m.instances_for(qs.get("match[]", ""))}))
+        if path == "/api/v1/targets/metadata":
+            target = qs.get("match_target", "")
+            types = m.yb_types if ("yb-tserver" in target or "yb-master" in target) else (
+                m.node_types if "node-exporter" in target else {})
+            data = [{"metric": k, "type": v} for k, v in types.items()]
+            return self._send(json.dumps({"status": "success", "data": data}))
+        if path == "/api/v1/metadata":
+            return self._send('{"status":"success","data":{}}')
+        if path == "/api/v1/query":
+            return self._send(self._instant(qs.get("query", ""), float(qs.get("time", 0))))
+        if path == "/api/v1/query_range":
+            return self._send(self._range(qs.get("query", ""), float(qs["start"]),
+                                          float(qs["end"]), int(float(qs["step"]))))
+        self._send('{"status":"error","error":"not found"}', 404)
+
+    def _query_names(self, query: str) -> list[str]:
+        """Metric names a dump query touches (regex batch or single name)."""
+        regex = re.search(r'__name__=~"([^"]+)"', query)
+        if regex:
+            return regex.group(1).split("|")
+        single = re.search(r'\b((?:ybsyn|node_syn)_\w+)\{', query)
+        return [single.group(1)] if single else []
+
+    def _instant(self, query: str, t: float) -> str:
+        result = []
+        if query.startswith("count by (__name__)"):
+            for name in self.metrics.names_for(query):
+                result.append({"metric": {"__name__": name}, "value": [t, str(self.metrics.instances)]})
+        return json.dumps({"status": "success", "data": {"resultType": "vector", "result": result}})
+
+    def _range(self, query: str, start: float, end: float, step: int) -> str:
+        m = self.metrics
+        names = self._query_names(query)
+        by = re.search(r"sum by \(([^)]*)\)", query)
+        by_labels = [l.strip() for l in by.group(1).split(",")] if by else ["instance"]
+        expand = [label for label in by_labels if label in _LABEL_VALUES]
+        combos = [{}]
+        for label in expand:
+            combos = [{**c, label: v} for c in combos for v in _LABEL_VALUES[label]]
+        parts = []
+        for name in names or [None]:
+            for i, combo in ((i, c) for i in range(m.instances) for c in combos):
+                labels = dict(combo)
+                if name and "__name__" in by_labels:
+                    labels["__name__"] = name
+                for label in by_labels:
+                    if label == "exported_instance":
+                        labels[label] = f"yb-tserver-{i}"
+                    elif label == "instance":
+                        labels[label] = f"{m.ip(i)}:9100"
+                    elif label == "pod":
+                        labels[label] = f"yb-tserver-{i}"
+                    elif label == "container":
+                        labels[label] = "yb-tserver"
+                if not name:
+                    labels.setdefault("pod", f"yb-tserver-{i}")
+                    labels.setdefault("instance", f"{m.ip(i)}:9100")
+                key = f"{name or query}/{i}" + (f"/{sorted(combo.items())}" if combo else "")
+                variant = zlib.crc32(key.encode()) % _VARIANTS
+                parts.append('{"metric":%s,"values":%s}' % (
+                    json.dumps(labels), m.values_json(start, end, step, variant)))
+        return '{"status":"success","data":{"resultType":"matrix","result":[%s]}}' % ",".join(parts)
+
+
+def start_server(metrics: SyntheticMetrics, port: int = 0, latency_ms: float = 0) -> ThreadingHTTPServer:
+    """Start the fake API in a daemon thread; returns the server (see .server_port)."""
+    handler = type("Handler", (_Handler,), {"metrics": metrics, "latency_s": latency_ms / 1000})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic Prometheus API")
+    parser.add_argument("--port", type=int, default=8428)
+    parser.add_argument("--names", type=int, default=1000, help="Synthetic YB metric names (default: 1000)")
+    parser.add_argument("--node-names", type=int, default=300)
+    parser.add_argument("--instances", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=0, help="Added delay per request")
+    args = parser.parse_args()
+
+    server = start_server(SyntheticMetrics(args.names, args.node_names, args.instances),
+                          args.port, args.latency_ms)
+    print(f"Serving synthetic Prometheus API on http://127.0.0.1:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -6,12 +6,19 @@ Generates HTML reports with Chart.js visualizations from Prometheus metrics.
 """
 
 import argparse
+import cProfile
+import gzip
 import json
+import math
 import os
 import re
 import shutil
 import subprocess
 import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -19,6 +26,17 @@ from abc import ABC, abstractmethod
 from typing import Optional
 from urllib.parse import quote
 
+import anomalies
+import metric_catalog
+import suspects
+import tscodec
+from genstats import GeneratorStats
+
+# scripts/sysbench_parser.py, shared with merge-sysbench-output.py and report-parser.py
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import sysbench_parser  # noqa: E402
+import cdc_lag  # noqa: E402  (scripts/cdc_lag.py, shared with cdc/run-test.sh)
+
 # Jinja2 for templating
 try:
     from jinja2 import Template
@@ -71,6 +89,21 @@ class ReportConfig:
     workload_type: str = "sysbench"
     mode: str = "k8s"
     ssh_host: str = ""
+    query_chunk_points: int = 720
+    dump_max_series: int = 0
+    dump_max_mb: float = 0
+    dump_format: str = "tsz"
+    # Where sysbench/k6 output files are read from (default: <output_dir>/../output).
+    workload_dir: str = ""
+    record: bool = False
+    replay: str = ""
+    results_parquet: bool = False
+
+    @property
+    def workload_path(self) -> Path:
+        if self.workload_dir:
+            return Path(self.workload_dir)
+        return Path(self.output_dir).parent / "output"
 
     @property
     def duration_seconds(self) -> float:
@@ -89,6 +122,10 @@ class QueryExecutor(ABC):
         """Execute curl inside a specific pod. Returns None if not supported."""
         return None
 
+    def run(self, cmd: list[str], timeout: int = 30) -> subprocess.CompletedProcess:
+        """Run a local command (kubectl get ...) and capture its output."""
+        return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+
 
 class KubectlQueryExecutor(QueryExecutor):
     """Executes queries via kubectl exec using wget."""
@@ -150,27 +187,182 @@ class HttpQueryExecutor(QueryExecutor):
             return None
 
 
+ARCHIVE_NAME = "query_archive.jsonl.gz"
+
+# ReportConfig fields that determine which queries are issued. A replay
+# takes these from the archive header so every request key matches.
+_ARCHIVED_CONFIG_FIELDS = (
+    "start_time", "end_time", "warmup_end", "step", "kube_context", "namespace",
+    "release_name", "prometheus_url", "pods", "rate_metrics", "total_metrics",
+    "title", "workload_type", "mode", "query_chunk_points", "dump_max_series",
+    "dump_max_mb",
+)
+
+
+def archive_config(config: ReportConfig) -> dict:
+    """The query-shaping subset of a ReportConfig, for the archive header."""
+    return {f: getattr(config, f) for f in _ARCHIVED_CONFIG_FIELDS}
+
+
+# Structured per-report results (see ReportGenerator._build_results), read
+# by scripts/report-parser.py and cross-run tooling instead of report.html.
+RESULTS_NAME = "results.json"
+RESULTS_VERSION = 1
+
+
+def to_columns(rows: list[dict]) -> dict[str, list]:
+    """Row dicts -> {column: values}; keys missing from a row become None."""
+    keys: dict[str, None] = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    return {k: [row.get(k) for row in rows] for k in keys}
+
+
+class RecordingExecutor(QueryExecutor):
+    """Wraps another executor and appends every response to a query archive.
+
+    The archive is gzipped JSON Lines: a header line holding the
+    ReportConfig fields that shape the queries, then one {"k": key, "v":
+    value} line per call. Keys are ["curl", url], ["pod_curl", pod,
+    container, url] or ["run", *cmd]; "run" values are [returncode,
+    stdout, stderr], or {"error": ...} if the command raised.
+    """
+
+    def __init__(self, inner: QueryExecutor, path: Path, header: dict):
+        self.inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = gzip.open(path, "wt", compresslevel=6)
+        self._write({"archive_version": 1, "config": header})
+
+    def _write(self, entry: dict):
+        line = json.dumps(entry, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._file.write(line)
+
+    def exec_curl(self, url: str) -> Optional[str]:
+        response = self.inner.exec_curl(url)
+        self._write({"k": ["curl", url], "v": response})
+        return response
+
+    def exec_pod_curl(self, pod: str, container: str, url: str) -> Optional[str]:
+        output = self.inner.exec_pod_curl(pod, container, url)
+        self._write({"k": ["pod_curl", pod, container, url], "v": output})
+        return output
+
+    def run(self, cmd: list[str], timeout: int = 30) -> subprocess.CompletedProcess:
+        try:
+            result = self.inner.run(cmd, timeout)
+        except Exception as e:
+            self._write({"k": ["run", *cmd], "v": {"error": f"{type(e).__name__}: {e}"}})
+            raise
+        self._write({"k": ["run", *cmd], "v": [result.returncode, result.stdout, result.stderr]})
+        return result
+
+    def finish(self, dest: Path):
+        """Close the archive and move it to its final location."""
+        with self._lock:
+            self._file.close()
+        shutil.move(str(self.path), dest)
+        print(f"Saved query archive: {dest} ({dest.stat().st_size / 1024 / 1024:.1f} MB)")
+
+
+class ReplayExecutor(QueryExecutor):
+    """Serves responses from a RecordingExecutor archive; no cluster needed.
+
+    Calls that were not recorded behave like failures (None / exit code 1)
+    and are counted in `misses`.
+    """
+
+    def __init__(self, path: Path):
+        self.entries: dict[str, object] = {}
+        self.misses = 0
+        with gzip.open(path, "rt") as f:
+            self.header = json.loads(f.readline())
+            for line in f:
+                entry = json.loads(line)
+                self.entries[json.dumps(entry["k"])] = entry["v"]
+        print(f"Loaded query archive: {path} ({len(self.entries)} responses)")
+
+    def _lookup(self, key: list):
+        k = json.dumps(key)
+        if k not in self.entries:
+            self.misses += 1
+            return None
+        return self.entries[k]
+
+    def exec_curl(self, url: str) -> Optional[str]:
+        return self._lookup(["curl", url])
+
+    def exec_pod_curl(self, pod: str, container: str, url: str) -> Optional[str]:
+        return self._lookup(["pod_curl", pod, container, url])
+
+    def run(self, cmd: list[str], timeout: int = 30) -> subprocess.CompletedProcess:
+        v = self._lookup(["run", *cmd])
+        if v is None:
+            return subprocess.CompletedProcess(cmd, 1, "", "not in query archive")
+        if isinstance(v, dict):
+            raise RuntimeError(v["error"])
+        return subprocess.CompletedProcess(cmd, v[0], v[1], v[2])
+
+
 class PrometheusClient:
     """Client for querying Prometheus metrics."""
 
-    def __init__(self, executor: QueryExecutor, base_url: str):
+    # Parallel fetches per chunked query. Callers already fan out across
+    # metric names, so this stays small to bound concurrent kubectl execs.
+    _CHUNK_WORKERS = 4
+
+    def __init__(self, executor: QueryExecutor, base_url: str, chunk_points: int = 720,
+                 stats: Optional[GeneratorStats] = None):
         self.executor = executor
         self.base_url = base_url
+        self.stats = stats
+        # Max evaluation points per query_range request (0 = never split).
+        # 720 points is 1h at step=5, well under VictoriaMetrics'
+        # -search.maxPointsPerTimeseries and the 30s exec timeout.
+        self.chunk_points = chunk_points
+        self._chunk_pool: Optional[ThreadPoolExecutor] = None
+
+    def _get_json(self, url: str, endpoint: str, query: str = "") -> Optional[dict]:
+        """Fetch and decode one API response. Returns None if the request or
+        JSON decoding fails; records timing/size in self.stats if set."""
+        t0 = time.perf_counter()
+        response = self.executor.exec_curl(url)
+        t1 = time.perf_counter()
+        data = None
+        if response:
+            try:
+                data = json.loads(response)
+            except json.JSONDecodeError as e:
+                print(f"JSON decode error ({endpoint}): {e}", file=sys.stderr)
+        if self.stats is not None:
+            payload = data.get("data") if isinstance(data, dict) else None
+            if isinstance(payload, dict) and "result" in payload:
+                payload = payload["result"]
+            self.stats.record_query(
+                endpoint, query or url, fetch_s=t1 - t0, parse_s=time.perf_counter() - t1,
+                nbytes=len(response or ""), series=len(payload) if payload else 0,
+                ok=isinstance(data, dict) and data.get("status") == "success",
+            )
+        return data
 
     def label_values(self, label: str, match: str = "") -> list[str]:
         """Fetch distinct values for a label, optionally filtered by match[]."""
         url = f"{self.base_url}/api/v1/label/{label}/values"
         if match:
             url += f"?match[]={quote(match)}"
-        response = self.executor.exec_curl(url)
-        if not response:
-            return []
-        try:
-            data = json.loads(response)
-            if data.get("status") == "success":
-                return data.get("data", [])
-        except json.JSONDecodeError:
-            pass
+        data = self._get_json(url, "label_values", f"{label} {match}".strip())
+        if data and data.get("status") == "success":
+            return data.get("data", [])
+        return []
+
+    def query_instant(self, query: str, time: float) -> list[dict]:
+        """Execute an instant query and return raw result dicts (metric + value)."""
+        url = f"{self.base_url}/api/v1/query?query={quote(query)}&time={time}"
+        data = self._get_json(url, "query", query)
+        if data and data.get("status") == "success":
+            return data.get("data", {}).get("result", [])
         return []
 
     def targets_metadata(self, match_target: str, limit: int = 5000) -> dict[str, str]:
@@ -178,95 +370,135 @@ class PrometheusClient:
         (Prometheus), falls back to /api/v1/metadata (VictoriaMetrics)."""
         qs = f"match_target={quote(match_target)}&limit={limit}"
         url = f"{self.base_url}/api/v1/targets/metadata?{qs}"
-        response = self.executor.exec_curl(url)
-        if response:
+        data = self._get_json(url, "targets_metadata", match_target)
+        if data and data.get("status") == "success":
             try:
-                data = json.loads(response)
-                if data.get("status") == "success":
-                    types: dict[str, str] = {}
-                    for m in data.get("data", []):
-                        types[m["metric"]] = m["type"]
-                    return types
-            except (json.JSONDecodeError, KeyError):
+                types: dict[str, str] = {}
+                for m in data.get("data", []):
+                    types[m["metric"]] = m["type"]
+                return types
+            except (KeyError, TypeError):
                 pass
         # Fallback: VictoriaMetrics /api/v1/metadata (no match_target filter)
         url = f"{self.base_url}/api/v1/metadata?limit={limit}"
-        response = self.executor.exec_curl(url)
-        if not response:
+        data = self._get_json(url, "metadata")
+        if not data or data.get("status") != "success":
             return {}
         try:
-            data = json.loads(response)
-            if data.get("status") != "success":
-                return {}
             types = {}
             for name, entries in data.get("data", {}).items():
                 if entries:
                     types[name] = entries[0].get("type", "")
             return types
-        except (json.JSONDecodeError, KeyError):
+        except (AttributeError, KeyError):
             return {}
 
-    def query_range_raw(self, query: str, start: float, end: float, step: int) -> list[dict]:
-        """Execute a range query and return raw result dicts (metric + values)."""
+    def _query_range_once(self, query: str, start: float, end: float,
+                          step: int) -> Optional[list[dict]]:
+        """Execute one query_range request. Returns None on failure."""
         encoded_query = quote(query)
         url = f"{self.base_url}/api/v1/query_range?query={encoded_query}&start={start}&end={end}&step={step}"
-        response = self.executor.exec_curl(url)
-        if not response:
-            return []
-        try:
-            data = json.loads(response)
-            if data.get("status") != "success":
-                return []
-            return data.get("data", {}).get("result", [])
-        except json.JSONDecodeError:
-            return []
+        data = self._get_json(url, "query_range", query)
+        if data is None:
+            return None
+        if data.get("status") != "success":
+            print(f"Query failed: {data.get('error', 'unknown error')}", file=sys.stderr)
+            return None
+        return data.get("data", {}).get("result", [])
+
+    def _range_chunks(self, start: float, end: float, step: int) -> list[tuple[float, float]]:
+        """Split [start, end] into windows of at most chunk_points evaluation
+        points each.
+
+        Every chunk starts on the original start + k*step grid and the next
+        chunk begins exactly one step after the previous one ends, so the
+        stitched result has the same evaluation timestamps as a single
+        request. irate()/rate() windows look back from each evaluation
+        point into raw samples, which are not affected by where a chunk
+        starts — no overlap or padding is needed at the seams.
+        """
+        span = self.chunk_points * step
+        if self.chunk_points <= 0 or end - start < span:
+            return [(start, end)]
+        chunks = []
+        t = start
+        while t <= end:
+            chunks.append((t, min(t + span - step, end)))
+            t += span
+        return chunks
 
-    def query_range(self, query: str, start: float, end: float, step: int) -> list[MetricSeries]:
-        """Execute a range query and return metric series."""
-        encoded_query = quote(query)
-        url = f"{self.base_url}/api/v1/query_range?query={encoded_query}&start={start}&end={end}&step={step}"
+    def query_range_raw(self, query: str, start: float, end: float, step: int) -> list[dict]:
+        """Execute a range query and return raw result dicts (metric + values).
 
-        response = self.executor.exec_curl(url)
-        if not response:
-            return []
+        Long windows are split into step-aligned chunks (see _range_chunks),
+        fetched in parallel, and stitched back into one series per label set.
+        A failed chunk leaves a gap rather than discarding the whole series.
+        """
+        chunks = self._range_chunks(start, end, step)
+        if len(chunks) == 1:
+            return self._query_range_once(query, start, end, step) or []
+
+        if self._chunk_pool is None:
+            self._chunk_pool = ThreadPoolExecutor(max_workers=self._CHUNK_WORKERS)
+        parts = list(self._chunk_pool.map(
+            lambda c: self._query_range_once(query, c[0], c[1], step), chunks
+        ))
+        failed = sum(1 for p in parts if p is None)
+        if failed:
+            print(f"Warning: {failed}/{len(chunks)} chunks failed for query: {query[:120]}",
+                  file=sys.stderr)
+
+        # Stitch chunks in time order, keyed by the full label set. The
+        # last-seen timestamp guards against a boundary point being returned
+        # by both neighbours (e.g. if the server re-aligns start to the step).
+        merged: dict[tuple, dict] = {}
+        last_ts: dict[tuple, float] = {}
+        for part in parts:
+            for r in part or []:
+                metric = r.get("metric", {})
+                key = tuple(sorted(metric.items()))
+                entry = merged.get(key)
+                if entry is None:
+                    entry = merged[key] = {"metric": metric, "values": []}
+                    last_ts[key] = float("-inf")
+                for v in r.get("values", []):
+                    ts = float(v[0])
+                    if ts > last_ts[key]:
+                        entry["values"].append(v)
+                        last_ts[key] = ts
+        return list(merged.values())
 
-        try:
-            data = json.loads(response)
-            if data.get("status") != "success":
-                print(f"Query failed: {data.get('error', 'unknown error')}", file=sys.stderr)
-                return []
-
-            results = []
-            for result in data.get("data", {}).get("result", []):
-                metric = result.get("metric", {})
-                values = result.get("values", [])
-
-                series = MetricSeries(
-                    name=metric.get("__name__", query),
-                    labels=metric,
-                    timestamps=[float(v[0]) for v in values],
-                    values=[float(v[1]) for v in values]
-                )
-                results.append(series)
+    def query_range(self, query: str, start: float, end: float, step: int) -> list[MetricSeries]:
+        """Execute a range query and return metric series."""
+        results = []
+        for result in self.query_range_raw(query, start, end, step):
+            metric = result.get("metric", {})
+            values = result.get("values", [])
+
+            series = MetricSeries(
+                name=metric.get("__name__", query),
+                labels=metric,
+                timestamps=[float(v[0]) for v in values],
+                values=[float(v[1]) for v in values]
+            )
+            results.append(series)
 
-            return results
-        except json.JSONDecodeError as e:
-            print(f"JSON decode error: {e}", file=sys.stderr)
-            return []
+        return results
 
 
 class KubeClusterSpecCollector:
     """Collects YugabyteDB cluster specifications via kubectl."""
 
-    def __init__(self, kube_context: str, namespace: str):
+    def __init__(self, kube_context: str, namespace: str, executor: QueryExecutor):
         self.kube_context = kube_context
         self.namespace = namespace
+        self.executor = executor
 
     def _run_kubectl(self, args: list[str]) -> Optional[str]:
         """Run kubectl command and return output."""
         cmd = ["kubectl", "--context", self.kube_context, "-n", self.namespace] + args
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = self.executor.run(cmd)
             if result.returncode == 0:
                 return result.stdout.strip()
             return None
@@ -403,13 +635,26 @@ class ReportGenerator:
     def __init__(self, config: ReportConfig):
         self.config = config
         project_root = str(Path(config.output_dir).parent)
-        if config.mode == "vm":
+        if config.replay:
+            self.executor = ReplayExecutor(Path(config.replay))
+        elif config.mode == "vm":
             self.executor = HttpQueryExecutor()
-            self.cluster_collector = VmClusterSpecCollector(project_root)
         else:
             self.executor = KubectlQueryExecutor(config.kube_context, config.namespace, config.release_name)
-            self.cluster_collector = KubeClusterSpecCollector(config.kube_context, config.namespace)
-        self.prometheus = PrometheusClient(self.executor, config.prometheus_url)
+        if config.record and not config.replay:
+            Path(config.output_dir).mkdir(parents=True, exist_ok=True)
+            self.executor = RecordingExecutor(
+                self.executor, Path(config.output_dir) / f".{ARCHIVE_NAME}.partial",
+                archive_config(config),
+            )
+        if config.mode == "vm":
+            self.cluster_collector = VmClusterSpecCollector(project_root)
+        else:
+            self.cluster_collector = KubeClusterSpecCollector(config.kube_context, config.namespace, self.executor)
+        self.stats = GeneratorStats()
+        self.prometheus = PrometheusClient(self.executor, config.prometheus_url,
+                                           chunk_points=config.query_chunk_points,
+                                           stats=self.stats)
         self.metrics_data = {}
         self.by_pod = {"master": [], "tserver": [], "other": []}
         self.by_node = {}
@@ -418,6 +663,19 @@ class ReportGenerator:
         self._node_instance_filter = ""
         self._tserver_instance_filter = ""
         self._metric_queries: dict[str, str] = {}
+        # Container/node metrics shared by the charts, the interval table and
+        # the dump (metric_catalog.yaml). Node filters are filled in once
+        # container metrics are known. The client container writing to YB is
+        # also its pod name fragment; for CDC it is the Kafka Connect JDBC sink.
+        self.metric_plan = metric_catalog.MetricPlan(metric_catalog.load_catalog(), {
+            "namespace": config.namespace,
+            "client": {"k6": "k6", "cdc": "kafka-connect"}.get(config.workload_type, self.output_prefix),
+            "node_filter": "",
+            "tserver_node_filter": "",
+        })
+        self.results: dict = {}
+        # Rate-sweep steps from test_times.txt (sweep-run-with-timestamps.sh); [] otherwise.
+        self.sweep_steps = read_sweep_steps(config.workload_path / "test_times.txt")
 
     def _derive_node_instances(self):
         """Extract node hostnames from container metrics and build instance filters.
@@ -493,7 +751,7 @@ class ReportGenerator:
             "-o", "name"
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = self.executor.run(cmd)
             if result.returncode != 0:
                 print(f"Error: Cannot access namespace '{self.config.namespace}' in context '{self.config.kube_context}'", file=sys.stderr)
                 print(f"kubectl error: {result.stderr}", file=sys.stderr)
@@ -513,7 +771,7 @@ class ReportGenerator:
             "-o", "name"
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = self.executor.run(cmd)
             if result.returncode != 0:
                 print(f"Error: VictoriaMetrics statefulset '{self.config.release_name}-prom-replay-victoriametrics' not found in namespace '{self.config.namespace}'", file=sys.stderr)
                 print(f"kubectl error: {result.stderr}", file=sys.stderr)
@@ -522,203 +780,54 @@ class ReportGenerator:
             print(f"Error: Failed to check VictoriaMetrics statefulset: {e}", file=sys.stderr)
             sys.exit(1)
 
-    # (pod_regex, container_label_match) for each role we chart. Each role
-    # queries the pod's MAIN container only (yb-tserver pods → container=
-    # "yb-tserver", yb-master pods → container="yb-master"). Sidecars
-    # (yb-cleanup, yugabyted-ui), pod-cgroup row, and pause container are
-    # implicitly excluded by the positive container match.
-    #
-    # Why per-role + positive match instead of negative-filter sum across
-    # containers: when one container's irate window contains only 1 raw
-    # sample, Prometheus drops its irate to null. sum() across the rest then
-    # leaves only tiny sidecar values, producing false-zero dips on the chart
-    # (the original Issue #2 symptom resurfaced for one container's bad luck).
-    # Positive single-container match is either present or absent — never
-    # artificially small.
-    _ROLE_QUERIES = (
-        ("yb-tserver.*", 'container="yb-tserver"'),
-        ("yb-master.*",  'container="yb-master"'),
-    )
-
-    # Prometheus query_range step per metric source. Each step is matched
-    # to its source's natural sample cadence — denser steps just plateau,
-    # sparser steps lose detail.
-    #
-    # cAdvisor refreshes internally every ~10-15s regardless of Prometheus
-    # scrape_interval, so step=10 yields one fresh value per cAdvisor cycle
-    # plus ~one repeat plateau per ~15s gap. step=5 here would add no real
-    # information (just more plateaus), and step >=15 risks dropping points
-    # at irate-window edges where only one raw sample falls in [t-30, t].
-    _CADVISOR_STEP = 10
-    # node_exporter is updated on every Prometheus scrape (5s in this chart),
-    # so each step=5 evaluation point gives a genuinely new value. Going to
-    # step=10 would throw away half the resolution for no reason.
-    _NODE_STEP = 5
-
-    def collect_container_metrics(self):
-        """Collect CPU, memory, network, disk metrics for pods."""
-        ns = self.config.namespace
-
-        # Window for cAdvisor-sourced rates. cAdvisor refreshes its counters
-        # internally only every ~10-15s regardless of Prometheus scrape_interval,
-        # so a 15s window often captures fewer than 2 distinct raw samples and
-        # irate returns no value. 30s reliably spans 2+ refreshes.
-        cadvisor_window = "30s"
-
-        # Build the union of per-role queries via PromQL `or`. Label sets
-        # (instance, pod) never overlap between roles, so `or` gives a clean
-        # union without dedup surprises.
-        def union(make_one):
-            return " or ".join(make_one(pods, cf) for pods, cf in self._ROLE_QUERIES)
-
-        # Pod-level metrics with no container labels (network, shared netns).
-        net_pods_regex = "|".join(p for p, _ in self._ROLE_QUERIES)
-
-        # CPU usage (cores).
-        cpu_query = union(lambda pods, cf: (
-            f'sum by (instance, pod) ('
-            f'irate(container_cpu_usage_seconds_total{{namespace="{ns}",'
-            f'pod=~"{pods}",{cf}}}[{cadvisor_window}]))'
-        ))
-        self.metrics_data["cpu"] = self._query_and_aggregate(cpu_query, "CPU Usage (cores)", step=self._CADVISOR_STEP)
-
-        # Memory usage (MB) — gauge, no rate.
-        mem_query = union(lambda pods, cf: (
-            f'sum by (instance, pod) ('
-            f'container_memory_working_set_bytes{{namespace="{ns}",'
-            f'pod=~"{pods}",{cf}}}) / 1024 / 1024'
-        ))
-        self.metrics_data["memory"] = self._query_and_aggregate(mem_query, "Memory Usage (MB)", step=self._CADVISOR_STEP)
-
-        # Network RX/TX (MB/s) — cAdvisor only emits pod-level rows for these
-        # (shared netns), so no container filter is needed. Unit matches
-        # memory (MB) for consistent axes across pod cards.
-        net_rx_query = (
-            f'sum by (instance, pod) ('
-            f'irate(container_network_receive_bytes_total{{namespace="{ns}",'
-            f'pod=~"{net_pods_regex}"}}[{cadvisor_window}])) / 1024 / 1024'
-        )
-        self.metrics_data["network_rx"] = self._query_and_aggregate(net_rx_query, "Network RX (MB/s)", step=self._CADVISOR_STEP)
+    def _fetch_catalog(self, source: str):
+        """Fetch every metric_catalog.yaml metric of source into
+        self.metric_plan: one query_range per metric, in parallel."""
+        fetches = self.metric_plan.fetches(source)
 
-        net_tx_query = (
-            f'sum by (instance, pod) ('
-            f'irate(container_network_transmit_bytes_total{{namespace="{ns}",'
-            f'pod=~"{net_pods_regex}"}}[{cadvisor_window}])) / 1024 / 1024'
-        )
-        self.metrics_data["network_tx"] = self._query_and_aggregate(net_tx_query, "Network TX (MB/s)", step=self._CADVISOR_STEP)
+        def fetch(item: tuple[str, str, int]) -> tuple[str, list[dict]]:
+            name, query, step = item
+            return name, self.prometheus.query_range_raw(
+                query, self.config.start_time, self.config.end_time, step)
 
-        # Disk Read/Write IOPS and Throughput — same per-role split as CPU.
-        disk_read_iops_query = union(lambda pods, cf: (
-            f'sum by (instance, pod) ('
-            f'irate(container_fs_reads_total{{namespace="{ns}",'
-            f'pod=~"{pods}",{cf}}}[{cadvisor_window}]))'
-        ))
-        self.metrics_data["disk_read_iops"] = self._query_and_aggregate(disk_read_iops_query, "Disk Read IOPS", step=self._CADVISOR_STEP)
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            for name, rows in pool.map(fetch, fetches):
+                self.metric_plan.add(name, rows)
+        print(f"  {len(fetches)} {source} catalog metrics, "
+              f"{sum(len(self.metric_plan.rows[name]) for name, _, _ in fetches)} series")
 
-        disk_write_iops_query = union(lambda pods, cf: (
-            f'sum by (instance, pod) ('
-            f'irate(container_fs_writes_total{{namespace="{ns}",'
-            f'pod=~"{pods}",{cf}}}[{cadvisor_window}]))'
-        ))
-        self.metrics_data["disk_write_iops"] = self._query_and_aggregate(disk_write_iops_query, "Disk Write IOPS", step=self._CADVISOR_STEP)
+    @staticmethod
+    def _catalog_series(key: str, series: list) -> list[MetricSeries]:
+        return [MetricSeries(name=key, labels=labels, timestamps=ts, values=values)
+                for labels, ts, values in series]
 
-        disk_read_throughput_query = union(lambda pods, cf: (
-            f'sum by (instance, pod) ('
-            f'irate(container_fs_reads_bytes_total{{namespace="{ns}",'
-            f'pod=~"{pods}",{cf}}}[{cadvisor_window}])) / 1024 / 1024'
-        ))
-        self.metrics_data["disk_read_throughput"] = self._query_and_aggregate(disk_read_throughput_query, "Disk Read (MB/s)", step=self._CADVISOR_STEP)
+    def collect_container_metrics(self):
+        """Collect CPU, memory, network, disk metrics for pods.
 
-        disk_write_throughput_query = union(lambda pods, cf: (
-            f'sum by (instance, pod) ('
-            f'irate(container_fs_writes_bytes_total{{namespace="{ns}",'
-            f'pod=~"{pods}",{cf}}}[{cadvisor_window}])) / 1024 / 1024'
-        ))
-        self.metrics_data["disk_write_throughput"] = self._query_and_aggregate(disk_write_throughput_query, "Disk Write (MB/s)", step=self._CADVISOR_STEP)
+        These are the cAdvisor chart views of metric_catalog.yaml (per pod,
+        main container per role), derived from the same fetch as the
+        interval table and the cAdvisor part of the metrics dump.
+        """
+        self._fetch_catalog("cadvisor")
+        for key, title, series in self.metric_plan.charts("cadvisor"):
+            self.metrics_data[key] = self._aggregate(self._catalog_series(key, series), title)
 
     def collect_node_metrics(self):
         """Collect node-level CPU/memory/network/disk from node_exporter.
 
-        Filtered to only nodes hosting pods in the YB namespace (via
-        _node_instance_filter derived from container metrics).
+        These are the node chart views of metric_catalog.yaml, filtered to the
+        nodes hosting pods in the YB namespace (_node_instance_filter, derived
+        from container metrics) and shared with the interval table and the
+        node-exporter dump.
         """
-        nf = self._node_instance_filter
-        nf_comma = f",{nf}" if nf else ""
-
-        # Node CPU in cores-used, per instance.
-        #   count-by-instance of idle rows  = total CPUs on that node
-        #   sum-by-instance of irate(idle)  = idle cores
-        #   difference                      = cores in use
-        # Reported in cores so it overlays 1:1 with container CPU (also cores).
-        node_cpu_query = (
-            f'(count by (instance) (node_cpu_seconds_total{{mode="idle"{nf_comma}}})) '
-            f'- sum by (instance) (irate(node_cpu_seconds_total{{mode="idle"{nf_comma}}}[15s]))'
-        )
-        self.metrics_data["node_cpu"] = self._query_and_aggregate_by_instance(
-            node_cpu_query, "Node CPU Total (cores)", step=self._NODE_STEP)
-
-        # CPU breakdown by mode (kept as percent — informational detail charts).
-        for mode in ["user", "system", "iowait", "steal", "softirq"]:
-            query = f'avg by (instance) (irate(node_cpu_seconds_total{{mode="{mode}"{nf_comma}}}[15s])) * 100'
-            self.metrics_data[f"node_cpu_{mode}"] = self._query_and_aggregate_by_instance(
-                query, f"Node CPU {mode} (%)", step=self._NODE_STEP)
-
-        # Node memory used (MB) = MemTotal - MemAvailable.
-        node_mem_query = (
-            f'(node_memory_MemTotal_bytes{{{nf}}} - node_memory_MemAvailable_bytes{{{nf}}}) / 1024 / 1024'
-        )
-        self.metrics_data["node_memory"] = self._query_and_aggregate_by_instance(
-            node_mem_query, "Node Memory Used (MB)", step=self._NODE_STEP)
-
-        # Node network RX/TX — pick the BUSIEST non-loopback interface per node.
-        # Can't sum here: on K8s, CNI plugins mirror pod traffic across multiple
-        # virtual interfaces (flannel.1, cni0, vethXX, ...) so summing counts
-        # the same bytes 3-4× (seen: 4× over-count on k3s-virsh). A filter-list
-        # of virtual-interface names is fragile (new CNIs, multi-ENI on EKS).
-        # max() reports the hottest interface, which is either the physical NIC
-        # (single-NIC + mirrors) or the busiest ENI (multi-NIC) — both are
-        # meaningful ceilings for "how loaded is the node's network path".
-        # Underreports in the rare case of balanced multi-NIC traffic.
-        self.metrics_data["node_network_rx"] = self._query_and_aggregate_by_instance(
-            f'max by (instance) (irate(node_network_receive_bytes_total{{device!="lo"{nf_comma}}}[15s])) / 1024 / 1024',
-            "Node Network RX (MB/s)", step=self._NODE_STEP,
-        )
-        self.metrics_data["node_network_tx"] = self._query_and_aggregate_by_instance(
-            f'max by (instance) (irate(node_network_transmit_bytes_total{{device!="lo"{nf_comma}}}[15s])) / 1024 / 1024',
-            "Node Network TX (MB/s)", step=self._NODE_STEP,
-        )
-
-        # Node disk I/O summed across devices. Exclude loop/dm devices to focus
-        # on physical disks; wrapped in sum-by-instance so a node with multiple
-        # devices still returns one series per instance.
-        disk_filter = f'device!~"loop.*|dm-.*"{nf_comma}'
-        self.metrics_data["node_disk_read_iops"] = self._query_and_aggregate_by_instance(
-            f'sum by (instance) (irate(node_disk_reads_completed_total{{{disk_filter}}}[15s]))',
-            "Node Disk Read IOPS", step=self._NODE_STEP,
-        )
-        self.metrics_data["node_disk_write_iops"] = self._query_and_aggregate_by_instance(
-            f'sum by (instance) (irate(node_disk_writes_completed_total{{{disk_filter}}}[15s]))',
-            "Node Disk Write IOPS", step=self._NODE_STEP,
-        )
-        self.metrics_data["node_disk_read_throughput"] = self._query_and_aggregate_by_instance(
-            f'sum by (instance) (irate(node_disk_read_bytes_total{{{disk_filter}}}[15s])) / 1024 / 1024',
-            "Node Disk Read (MB/s)", step=self._NODE_STEP,
-        )
-        self.metrics_data["node_disk_write_throughput"] = self._query_and_aggregate_by_instance(
-            f'sum by (instance) (irate(node_disk_written_bytes_total{{{disk_filter}}}[15s])) / 1024 / 1024',
-            "Node Disk Write (MB/s)", step=self._NODE_STEP,
-        )
-
-    def _query_and_aggregate_by_instance(self, query: str, display_name: str,
-                                         step: Optional[int] = None) -> dict:
-        """Query metrics and aggregate results, grouped by instance (node)."""
-        series_list = self.prometheus.query_range(
-            query,
-            self.config.start_time,
-            self.config.end_time,
-            step if step is not None else self.config.step
-        )
-
+        self.metric_plan.params.update(node_filter=self._node_instance_filter,
+                                       tserver_node_filter=self._tserver_instance_filter)
+        self._fetch_catalog("node")
+        for key, title, series in self.metric_plan.charts("node"):
+            self.metrics_data[key] = self._aggregate_by_instance(self._catalog_series(key, series), title)
+
+    def _aggregate_by_instance(self, series_list: list[MetricSeries], display_name: str) -> dict:
+        """Summary stats and per-instance (node) series of one chart."""
         all_values = []
         for series in series_list:
             if series.values:
@@ -753,73 +862,15 @@ class ReportGenerator:
             ]
         }
 
-    def collect_interval_series(self, step: int) -> dict:
+    def collect_interval_series(self) -> dict:
         """Collect single-series aggregates for the per-interval sysbench table.
 
-        Each metric is summed/averaged across the DB tier at `step` resolution,
-        so rows line up with sysbench's reportInterval.
+        These are the interval views of metric_catalog.yaml (DB-tier sums and
+        averages, client CPU), derived from the metrics already fetched for
+        the charts at their sources' steps; enrich_intervals_with_metrics()
+        picks the sample nearest each interval end.
         """
-        ns = self.config.namespace
-        tserver_regex = "yb-tserver.*"
-        # Main t-server container only (see _ROLE_QUERIES rationale).
-        tserver_container = 'container="yb-tserver"'
-        # node_cpu_seconds_total refreshes every scrape (5s); cAdvisor refreshes
-        # every ~10-15s so its rate windows must be wider. See collect_container_metrics.
-        node_window = "15s"
-        cadvisor_window = "30s"
-
-        tf = self._tserver_instance_filter
-        tf_comma = f",{tf}" if tf else ""
-
-        queries = {
-            # DB-node VM CPU in cores-used, averaged across tserver nodes only.
-            "cpu_cores": (
-                'avg('
-                f'count by (instance) (node_cpu_seconds_total{{mode="idle"{tf_comma}}}) '
-                f'- sum by (instance) (irate(node_cpu_seconds_total{{mode="idle"{tf_comma}}}[{node_window}])))'
-            ),
-            # Total tserver-container memory in MB (sum of per-container rows).
-            "mem_mb": (
-                f'sum(container_memory_working_set_bytes{{namespace="{ns}",'
-                f'pod=~"{tserver_regex}",{tserver_container}}}) / 1024 / 1024'
-            ),
-            # Network RX+TX MB/s across tserver pods (pod-level only — no container filter).
-            "net_rx_mb": (
-                f'sum(irate(container_network_receive_bytes_total{{namespace="{ns}",'
-                f'pod=~"{tserver_regex}"}}[{cadvisor_window}])) / 1024 / 1024'
-            ),
-            "net_tx_mb": (
-                f'sum(irate(container_network_transmit_bytes_total{{namespace="{ns}",'
-                f'pod=~"{tserver_regex}"}}[{cadvisor_window}])) / 1024 / 1024'
-            ),
-            # Disk write IOPS across tserver pods.
-            "disk_write_iops": (
-                f'sum(irate(container_fs_writes_total{{namespace="{ns}",'
-                f'pod=~"{tserver_regex}",{tserver_container}}}[{cadvisor_window}]))'
-            ),
-            # Client pod CPU in cores consumed, summed across replicas.
-            "client_cpu_cores": (
-                f'sum(irate(container_cpu_usage_seconds_total{{namespace="{ns}",'
-                f'pod=~".*k6.*",container="k6"}}[{cadvisor_window}]))'
-                if self.config.workload_type == "k6" else
-                f'sum(irate(container_cpu_usage_seconds_total{{namespace="{ns}",'
-                f'pod=~".*sysbench.*",container="sysbench"}}[{cadvisor_window}]))'
-            ),
-        }
-
-        series_by_key: dict[str, dict[int, float]] = {}
-        for key, q in queries.items():
-            result = self.prometheus.query_range(
-                q, self.config.start_time, self.config.end_time, step
-            )
-            if result and result[0].values:
-                s = result[0]
-                series_by_key[key] = {
-                    int(t): v for t, v in zip(s.timestamps, s.values)
-                }
-            else:
-                series_by_key[key] = {}
-        return series_by_key
+        return self.metric_plan.intervals()
 
     @staticmethod
     def _nearest_value(series: dict[int, float], target_ts: int, max_skew: int):
@@ -836,7 +887,7 @@ class ReportGenerator:
         """Attach per-interval CPU/mem/net/disk samples to each sysbench row."""
         if not intervals:
             return intervals
-        series = self.collect_interval_series(step)
+        series = self.collect_interval_series()
         max_skew = max(step, 15)
         enriched = []
         for iv in intervals:
@@ -879,7 +930,10 @@ class ReportGenerator:
             self.config.end_time,
             step if step is not None else self.config.step
         )
+        return self._aggregate(series_list, display_name)
 
+    def _aggregate(self, series_list: list[MetricSeries], display_name: str) -> dict:
+        """Summary stats (tserver pods) and per-pod series of one chart."""
         # Filter to only tserver pods for summary statistics
         tserver_values = []
         for series in series_list:
@@ -1031,6 +1085,94 @@ class ReportGenerator:
 
         return types
 
+    # Gauge batches are cut at this many estimated output series, so one
+    # high-cardinality gauge can't make its whole batch time out.
+    _YB_DUMP_BATCH_SERIES = 500
+    # Average raw-JSON size of one [ts, "value"] pair in the metrics dump;
+    # the --dump-max-mb budget is expressed in these units for either format.
+    _DUMP_BYTES_PER_POINT = 22
+    _YB_SELECTOR = '{job=~"yb-tserver|yb-master"}'
+
+    def _estimate_dump_series(self, selector: str, by_label: str) -> dict[str, int]:
+        """Estimate output series per metric name for a `sum by (by_label)` dump.
+
+        One instant query at end_time counts distinct by_label values per
+        __name__ seen anywhere in the window — the same cardinality the dump
+        query will produce — without pulling any samples. last_over_time()
+        keeps series that ended mid-run (a replaced pod, churned per-tablet
+        series), which a plain selector at end_time would miss and the plan
+        would then cost as one series. Names with no series in the window
+        are absent from the result.
+        """
+        window = max(1, math.ceil(self.config.end_time - self.config.start_time))
+        query = (f'count by (__name__) (count by (__name__, {by_label}) '
+                 f'(last_over_time({selector}[{window}s])))')
+        counts: dict[str, int] = {}
+        for r in self.prometheus.query_instant(query, self.config.end_time):
+            name = r.get("metric", {}).get("__name__")
+            try:
+                counts[name] = int(float(r["value"][1]))
+            except (KeyError, IndexError, TypeError, ValueError):
+                continue
+        return counts
+
+    def _plan_dump(self, names: list[str], counts: dict[str, int],
+                   step: int) -> tuple[list[str], list[tuple[str, int]]]:
+        """Admit metric names cheapest-first until the series/byte budget is hit.
+
+        Returns (kept names, skipped (name, est_series) pairs). Admitting in
+        ascending cost keeps as many metrics as possible; what gets dropped
+        is the handful of per-tablet explosions. Names missing from `counts`
+        are costed as one series.
+        """
+        max_series = self.config.dump_max_series
+        max_bytes = self.config.dump_max_mb * 1024 * 1024
+        points = int(self.config.duration_seconds / step) + 1
+
+        kept: list[str] = []
+        skipped: list[tuple[str, int]] = []
+        used_series = 0
+        for name in sorted(names, key=lambda n: (counts.get(n, 1), n)):
+            est = counts.get(name, 1)
+            over_series = max_series and used_series + est > max_series
+            over_bytes = max_bytes and (used_series + est) * points * self._DUMP_BYTES_PER_POINT > max_bytes
+            if over_series or over_bytes:
+                skipped.append((name, est))
+                continue
+            kept.append(name)
+            used_series += est
+
+        est_mb = used_series * points * self._DUMP_BYTES_PER_POINT / 1024 / 1024
+        print(f"  Plan: {len(kept)} names, ~{used_series} series, ~{est_mb:.1f} MB raw "
+              f"({points} points/series)")
+        if skipped:
+            skipped.sort(key=lambda x: -x[1])
+            print(f"  Warning: budget exceeded, skipping {len(skipped)} metric names "
+                  f"(~{sum(c for _, c in skipped)} series):", file=sys.stderr)
+            for name, est in skipped[:50]:
+                print(f"    skipped {name} (~{est} series)", file=sys.stderr)
+            if len(skipped) > 50:
+                print(f"    ... and {len(skipped) - 50} more", file=sys.stderr)
+        return kept, skipped
+
+    def _batch_by_cost(self, names: list[str], counts: dict[str, int]) -> list[list[str]]:
+        """Group gauge names into regex batches bounded by name count and
+        estimated output series."""
+        batches: list[list[str]] = []
+        batch: list[str] = []
+        batch_series = 0
+        for name in sorted(names, key=lambda n: counts.get(n, 1)):
+            est = counts.get(name, 1)
+            if batch and (len(batch) >= self._YB_DUMP_BATCH_SIZE
+                          or batch_series + est > self._YB_DUMP_BATCH_SERIES):
+                batches.append(batch)
+                batch, batch_series = [], 0
+            batch.append(name)
+            batch_series += est
+        if batch:
+            batches.append(batch)
+        return batches
+
     def collect_yb_metrics_dump(self) -> list[dict]:
         """Dump all YugabyteDB metrics for the run window with meaningful PromQL.
 
@@ -1039,15 +1181,18 @@ class ReportGenerator:
 
         Prometheus doesn't support irate() with __name__ regex selectors,
         so counters are queried one metric at a time. Gauges can be batched.
+
+        A cardinality estimate per name drives the plan: names are admitted
+        against --dump-max-series / --dump-max-mb, counters run largest-first
+        so the slowest queries start early, and gauge batches are sized by
+        estimated series rather than a fixed name count.
         """
         metric_types = self._fetch_yb_metric_types()
         print(f"Fetched {len(metric_types)} YB metric type annotations "
               f"({sum(1 for v in metric_types.values() if v == 'counter')} counters, "
               f"{sum(1 for v in metric_types.values() if v == 'gauge')} gauges)")
 
-        names = self.prometheus.label_values(
-            "__name__", '{job=~"yb-tserver|yb-master"}'
-        )
+        names = self.prometheus.label_values("__name__", self._YB_SELECTOR)
         if not names:
             print("Warning: no YB metric names found", file=sys.stderr)
             return []
@@ -1065,8 +1210,21 @@ class ReportGenerator:
             else:
                 counters.append(n)
 
+        counts = self._estimate_dump_series(self._YB_SELECTOR, "exported_instance")
+        if counts:
+            kept, _ = self._plan_dump(names, counts, self._YB_DUMP_STEP)
+            kept_set = set(kept)
+            counters = [n for n in counters if n in kept_set]
+            gauges = [n for n in gauges if n in kept_set]
+        else:
+            print("  Warning: cardinality estimate unavailable, dumping without budget",
+                  file=sys.stderr)
+        # Largest-first so the long-running counter queries overlap the rest.
+        counters.sort(key=lambda n: -counts.get(n, 1))
+        gauge_batches = self._batch_by_cost(gauges, counts)
+
         print(f"Querying {len(counters)} counters (irate, parallel) + "
-              f"{len(gauges)} gauges ({self._YB_DUMP_BATCH_SIZE}/batch)...")
+              f"{len(gauges)} gauges ({len(gauge_batches)} batches)...")
 
         all_series: list[dict] = []
 
@@ -1108,8 +1266,8 @@ class ReportGenerator:
 
         # Gauges: can batch via __name__ regex.
         print("  Gauges (raw, sum by instance):")
-        for i in range(0, len(gauges), self._YB_DUMP_BATCH_SIZE):
-            batch = gauges[i:i + self._YB_DUMP_BATCH_SIZE]
+        done = 0
+        for i, batch in enumerate(gauge_batches):
             regex = "|".join(batch)
             query = (
                 f'sum by (__name__, exported_instance)'
@@ -1120,14 +1278,12 @@ class ReportGenerator:
                 self._YB_DUMP_STEP,
             )
             all_series.extend(results)
-            done = min(i + self._YB_DUMP_BATCH_SIZE, len(gauges))
-            if (i // self._YB_DUMP_BATCH_SIZE) % 10 == 0 or done == len(gauges):
+            done += len(batch)
+            if i % 10 == 0 or done == len(gauges):
                 print(f"    {done}/{len(gauges)}, {len(all_series)} series total")
 
         return all_series
 
-    _NODE_DUMP_STEP = 5
-    _NODE_IRATE_WINDOW = "15s"
     _NODE_BATCH_SIZE = 50
 
     def collect_node_metrics_dump(self) -> list[dict]:
@@ -1136,8 +1292,10 @@ class ReportGenerator:
         Same approach as collect_yb_metrics_dump: counters as irate() rates,
         gauges as raw values, aggregated with sum by (instance).
         Filtered to only nodes hosting YB pods (via _node_instance_filter).
-        Output is normalized to use exported_instance key so the Metrics
-        Explorer JS works without changes.
+        Names in metric_catalog.yaml were already fetched for the node charts
+        and are derived from that result. Step and irate window come from the
+        catalog's node source. Output is normalized to use exported_instance
+        key so the Metrics Explorer JS works without changes.
         """
         type_map = self.prometheus.targets_metadata('{job="node-exporter"}')
         if not type_map:
@@ -1153,9 +1311,17 @@ class ReportGenerator:
 
         names = [n for n in names if not n.endswith("_bucket")]
 
+        all_series: list[dict] = []
+        derived = [n for n in names if n in self.metric_plan.rows]
+        for name in derived:
+            self._metric_queries[name] = self.metric_plan.dump_query(name)
+            all_series.extend(self.metric_plan.dump(name))
+
         counters = []
         gauges = []
         for n in names:
+            if n in self.metric_plan.rows:
+                continue
             t = type_map.get(n, "")
             if t == "counter" or n.endswith("_total"):
                 counters.append(n)
@@ -1164,14 +1330,16 @@ class ReportGenerator:
 
         nf = self._node_instance_filter
         nf_comma = f",{nf}" if nf else ""
+        src = self.metric_plan.source("node")
 
         print(f"  {len(counters)} counters + {len(gauges)} gauges "
-              f"({len(names)} names, {len(type_map)} metadata entries)")
+              f"({len(names)} names, {len(type_map)} metadata entries; "
+              f"{len(derived)} from the catalog fetch)")
 
         for name in counters:
             self._metric_queries[name] = (
                 f'sum by (instance)'
-                f'(irate({name}{{job="node-exporter"{nf_comma}}}[{self._NODE_IRATE_WINDOW}]))'
+                f'(irate({name}{{job="node-exporter"{nf_comma}}}[{src["window"]}]))'
             )
         for name in gauges:
             self._metric_queries[name] = (
@@ -1179,15 +1347,13 @@ class ReportGenerator:
                 f'({name}{{job="node-exporter"{nf_comma}}})'
             )
 
-        all_series: list[dict] = []
-
         from concurrent.futures import ThreadPoolExecutor, as_completed
 
         def _query_counter(name: str) -> list[dict]:
             query = self._metric_queries[name]
             results = self.prometheus.query_range_raw(
                 query, self.config.start_time, self.config.end_time,
-                self._NODE_DUMP_STEP,
+                src["step"],
             )
             for r in results:
                 r.setdefault("metric", {})["__name__"] = name
@@ -1213,7 +1379,7 @@ class ReportGenerator:
             )
             results = self.prometheus.query_range_raw(
                 query, self.config.start_time, self.config.end_time,
-                self._NODE_DUMP_STEP,
+                src["step"],
             )
             all_series.extend(results)
             done = min(i + self._NODE_BATCH_SIZE, len(gauges))
@@ -1229,8 +1395,6 @@ class ReportGenerator:
 
         return all_series
 
-    _CADVISOR_DUMP_STEP = 10
-    _CADVISOR_IRATE_WINDOW = "30s"
     _CADVISOR_BATCH_SIZE = 50
 
     def collect_cadvisor_metrics_dump(self) -> list[dict]:
@@ -1240,7 +1404,9 @@ class ReportGenerator:
         gauges as raw values.  Aggregated with sum by (pod, container) and
         filtered to the target namespace with non-empty container label
         (excludes pod-level aggregates).
-        cAdvisor housekeeping cadence is ~10-15s, so irate window must be >=30s.
+        cAdvisor housekeeping cadence is ~10-15s, so irate window must be >=30s
+        (the catalog's cadvisor source). Names in metric_catalog.yaml were
+        already fetched for the pod charts and are derived from that result.
         """
         ns = self.config.namespace
 
@@ -1259,23 +1425,32 @@ class ReportGenerator:
         names = [n for n in names
                  if n.startswith("container_") and not n.endswith("_bucket")]
 
+        all_series: list[dict] = []
+        derived = [n for n in names if n in self.metric_plan.rows]
+        for name in derived:
+            self._metric_queries[name] = self.metric_plan.dump_query(name)
+            all_series.extend(self.metric_plan.dump(name))
+
         counters = []
         gauges = []
         for n in names:
+            if n in self.metric_plan.rows:
+                continue
             t = type_map.get(n, "")
             if t == "counter" or n.endswith("_total"):
                 counters.append(n)
             else:
                 gauges.append(n)
 
+        src = self.metric_plan.source("cadvisor")
         print(f"  {len(counters)} counters + {len(gauges)} gauges "
-              f"({len(names)} container_* names)")
+              f"({len(names)} container_* names; {len(derived)} from the catalog fetch)")
 
         for name in counters:
             self._metric_queries[name] = (
                 f'sum by (pod, container)'
                 f'(irate({name}{{job="cadvisor",namespace="{ns}",'
-                f'container!=""}}[{self._CADVISOR_IRATE_WINDOW}]))'
+                f'container!=""}}[{src["window"]}]))'
             )
         for name in gauges:
             self._metric_queries[name] = (
@@ -1283,15 +1458,13 @@ class ReportGenerator:
                 f'({name}{{job="cadvisor",namespace="{ns}",container!=""}})'
             )
 
-        all_series: list[dict] = []
-
         from concurrent.futures import ThreadPoolExecutor, as_completed
 
         def _query_counter(name: str) -> list[dict]:
             query = self._metric_queries[name]
             results = self.prometheus.query_range_raw(
                 query, self.config.start_time, self.config.end_time,
-                self._CADVISOR_DUMP_STEP,
+                src["step"],
             )
             for r in results:
                 r.setdefault("metric", {})["__name__"] = name
@@ -1319,7 +1492,7 @@ class ReportGenerator:
             )
             results = self.prometheus.query_range_raw(
                 query, self.config.start_time, self.config.end_time,
-                self._CADVISOR_DUMP_STEP,
+                src["step"],
             )
             all_series.extend(results)
             done = min(i + self._CADVISOR_BATCH_SIZE, len(gauges))
@@ -1338,11 +1511,24 @@ class ReportGenerator:
         Counters (_total suffix) as irate() rates, everything else as raw values.
         k6 pushes every 5s by default, so we use step=5.
         """
-        names = self.prometheus.label_values(
-            "__name__", '{__name__=~"k6_.*"}'
-        )
+        return self._collect_selector_dump('{__name__=~"k6_.*"}', "k6")
+
+    def collect_kafka_connect_metrics_dump(self) -> list[dict]:
+        """Dump Kafka Connect metrics (JMX exporter, job="kafka-connect").
+
+        Sink/source task throughput, batch sizes, consumer lag and Debezium
+        MilliSecondsBehindSource, plus the JVM. Scraped every 5s, so step=5.
+        """
+        job = '{job="kafka-connect"}'
+        return self._collect_selector_dump(job, "Kafka Connect", matchers=job)
+
+    def _collect_selector_dump(self, selector: str, label: str, matchers: str = "") -> list[dict]:
+        """Dump every metric name matching selector: counters (_total suffix)
+        as irate() rates, the rest raw, at step=5. matchers ("{...}") is
+        added to each query."""
+        names = self.prometheus.label_values("__name__", selector)
         if not names:
-            print("  No k6 metrics found, skipping")
+            print(f"  No {label} metrics found, skipping")
             return []
 
         counters = [n for n in names if n.endswith("_total")]
@@ -1351,9 +1537,9 @@ class ReportGenerator:
         print(f"  {len(counters)} counters + {len(gauges)} gauges ({len(names)} names)")
 
         for name in counters:
-            self._metric_queries[name] = f'irate({name}[30s])'
+            self._metric_queries[name] = f'irate({name}{matchers}[30s])'
         for name in gauges:
-            self._metric_queries[name] = name
+            self._metric_queries[name] = f'{name}{matchers}'
 
         all_series: list[dict] = []
         step = 5
@@ -1376,7 +1562,12 @@ class ReportGenerator:
         return all_series
 
     def build_metrics_index(self, dump: list[dict]) -> list[dict]:
-        """Build a summary index of metric names for the explorer picker."""
+        """Build a summary index of metric names for the explorer picker.
+
+        A name is marked `constant` when every one of its series was
+        compacted by compact_constant_series(), and `zero` when they are
+        all flat at 0 — the picker sorts these last and hides them by default.
+        """
         name_info: dict[str, dict] = {}
         for s in dump:
             m = s.get("metric", {})
@@ -1386,47 +1577,73 @@ class ReportGenerator:
                     "name": name,
                     "count": 0,
                     "query": self._metric_queries.get(name, name),
+                    "constant": True,
+                    "zero": True,
                 }
-            name_info[name]["count"] += 1
+            info = name_info[name]
+            info["count"] += 1
+            if not s.get("constant"):
+                info["constant"] = False
+                info["zero"] = False
+            elif info["zero"]:
+                try:
+                    info["zero"] = float(s["values"][0][1]) == 0
+                except (IndexError, ValueError):
+                    info["zero"] = False
         return sorted(name_info.values(), key=lambda x: x["name"])
 
     def generate_report(self) -> str:
         """Generate HTML report."""
         # Collect cluster specifications
-        self.cluster_spec = self.cluster_collector.collect()
+        with self.stats.phase("cluster_spec"):
+            self.cluster_spec = self.cluster_collector.collect()
 
         # Collect metrics
-        if self.config.mode == "vm":
-            print("Skipping container metrics (no cAdvisor on VMs)...")
-            print("Deriving node instance filter from Prometheus targets...")
-            self._derive_vm_node_instances()
-        else:
-            print("Collecting container metrics...")
-            self.collect_container_metrics()
-            print("Deriving node instance filter from container metrics...")
-            self._derive_node_instances()
+        with self.stats.phase("container_metrics"):
+            if self.config.mode == "vm":
+                print("Skipping container metrics (no cAdvisor on VMs)...")
+                print("Deriving node instance filter from Prometheus targets...")
+                self._derive_vm_node_instances()
+            else:
+                print("Collecting container metrics...")
+                self.collect_container_metrics()
+                print("Deriving node instance filter from container metrics...")
+                self._derive_node_instances()
 
         print("Collecting node metrics...")
-        self.collect_node_metrics()
+        with self.stats.phase("node_metrics"):
+            self.collect_node_metrics()
 
         print("Collecting custom metrics...")
-        self.collect_custom_metrics()
+        with self.stats.phase("custom_metrics"):
+            self.collect_custom_metrics()
 
         # Dump all YB + node + k6 metrics for the Metrics Explorer tab.
         print("Collecting YB metrics dump...")
-        self.yb_dump = self.collect_yb_metrics_dump()
+        with self.stats.phase("yb_dump"):
+            self.yb_dump = self.collect_yb_metrics_dump()
         print("Collecting node-exporter metrics dump...")
-        self.yb_dump.extend(self.collect_node_metrics_dump())
+        with self.stats.phase("node_dump"):
+            self.yb_dump.extend(self.collect_node_metrics_dump())
         if self.config.mode != "vm":
             print("Collecting cAdvisor metrics dump...")
-            self.yb_dump.extend(self.collect_cadvisor_metrics_dump())
+            with self.stats.phase("cadvisor_dump"):
+                self.yb_dump.extend(self.collect_cadvisor_metrics_dump())
         if self.config.workload_type == "k6":
             print("Collecting k6 metrics dump...")
-            self.yb_dump.extend(self.collect_k6_metrics_dump())
-        self.yb_metrics_index = self.build_metrics_index(self.yb_dump)
-
-        # Reshape flat series into by_pod / by_node views for the tabbed template.
-        self.restructure_by_pod_and_node()
+            with self.stats.phase("k6_dump"):
+                self.yb_dump.extend(self.collect_k6_metrics_dump())
+        if self.config.workload_type == "cdc":
+            print("Collecting Kafka Connect metrics dump...")
+            with self.stats.phase("kafka_connect_dump"):
+                self.yb_dump.extend(self.collect_kafka_connect_metrics_dump())
+        with self.stats.phase("dump_index"):
+            compacted = compact_constant_series(self.yb_dump)
+            print(f"Compacted {compacted}/{len(self.yb_dump)} constant series in the metrics dump")
+            self.yb_metrics_index = self.build_metrics_index(self.yb_dump)
+
+            # Reshape flat series into by_pod / by_node views for the tabbed template.
+            self.restructure_by_pod_and_node()
 
         # Load template
         template_path = Path(__file__).parent / "report_template.html"
@@ -1443,23 +1660,51 @@ class ReportGenerator:
         duration_min = self.config.duration_seconds / 60
 
         # Parse workload results based on type
-        if self.config.workload_type == "k6":
-            workload_name = "k6"
-            latency_percentile = "p95"
-            print("Collecting k6 results from Prometheus...")
-            sysbench_results = self.collect_k6_results_from_prometheus(step=10)
-            sysbench_params = self._get_k6_params()
-        else:
-            workload_name = "Sysbench"
-            latency_percentile = "p95"
-            sysbench_output_path = Path(self.config.output_dir).parent / "output" / "sysbench_output.txt"
-            sysbench_results = parse_sysbench_output(sysbench_output_path)
-            sysbench_params = self._get_sysbench_params()
+        with self.stats.phase("workload_results"):
+            if self.config.workload_type == "k6":
+                workload_name = "k6"
+                latency_percentile = "p95"
+                print("Collecting k6 results from Prometheus...")
+                sysbench_results = self.collect_k6_results_from_prometheus(step=10)
+                sysbench_params = self._get_k6_params()
+            elif self.config.workload_type == "cdc":
+                workload_name = "CDC"
+                latency_percentile = "p95 Replication"
+                sysbench_results = parse_cdc_rows(self.config.workload_path, self.config.start_time)
+                sysbench_params = read_cdc_sink_config(self.config.workload_path)
+                if sysbench_results and sysbench_results.get("cdc_sweep") and sysbench_params:
+                    # The saved config is the last step's; the swept keys vary per step.
+                    for key in ("tasks.max", "batch.size", "insert.mode",
+                                "consumer.override.max.poll.records"):
+                        sysbench_params.pop(key, None)
+            elif self.sweep_steps:
+                workload_name = "Sysbench"
+                latency_percentile = "p95"
+                sysbench_results = parse_sysbench_sweep(
+                    self.config.workload_path, self.sweep_steps, self.config.start_time)
+                sysbench_params = self._get_sysbench_params()
+            else:
+                workload_name = "pyload" if self.config.workload_type == "pyload" else "Sysbench"
+                latency_percentile = "p95"
+                sysbench_output_path = self.config.workload_path / f"{self.output_prefix}_output.txt"
+                sysbench_results = parse_sysbench_output(sysbench_output_path)
+                sysbench_params = self._get_sysbench_params()
+                if sysbench_results and self.config.workload_type == "pyload":
+                    apply_pyload_histograms(sysbench_results, self.config.workload_path)
+            if sysbench_results and self.sweep_steps and self.config.workload_type == "k6":
+                sysbench_results["sweep"] = self.collect_k6_sweep(self.sweep_steps)
+            if sysbench_results and sysbench_results.get("sweep"):
+                knee = find_knee(sysbench_results["sweep"])
+                if knee is not None:
+                    sysbench_results["sweep_knee_step"] = sysbench_results["sweep"][knee]["step"]
+                    if knee > 0:
+                        sysbench_results["max_sustainable_tps"] = \
+                            sysbench_results["sweep"][knee - 1]["achieved"]
 
         # Enrich intervals with per-interval Prometheus samples (CPU/mem/net/disk).
         if sysbench_results and sysbench_results.get("intervals"):
             interval_step = 10
-            if self.config.workload_type == "sysbench":
+            if self.config.workload_type in ("sysbench", "pyload", "cdc"):
                 if sysbench_params and sysbench_params.get("report-interval"):
                     try:
                         interval_step = int(sysbench_params["report-interval"])
@@ -1471,9 +1716,28 @@ class ReportGenerator:
                     if t1 > t0:
                         interval_step = t1 - t0
             print(f"Enriching {len(sysbench_results['intervals'])} {workload_name} intervals with Prometheus metrics (step={interval_step}s)...")
-            sysbench_results["intervals"] = self.enrich_intervals_with_metrics(
-                sysbench_results["intervals"], interval_step
-            )
+            with self.stats.phase("enrich_intervals"):
+                sysbench_results["intervals"] = self.enrich_intervals_with_metrics(
+                    sysbench_results["intervals"], interval_step
+                )
+
+        # Rank dumped metrics against TPS dips and latency spikes, and find
+        # the anomalous intervals themselves. Rate and sink sweeps change
+        # throughput on purpose, so they are skipped.
+        if (sysbench_results and sysbench_results.get("intervals")
+                and not self.sweep_steps and not sysbench_results.get("cdc_sweep")):
+            warmup_s = (self.config.warmup_end - self.config.start_time) if self.config.warmup_end else 0
+            if self.yb_dump:
+                with self.stats.phase("suspects"):
+                    sysbench_results["suspects"] = suspects.rank_suspects(
+                        self.yb_dump, sysbench_results["intervals"], self.config.start_time, warmup_s)
+                    print(f"Ranked {len(sysbench_results['suspects'])} bottleneck suspect(s)")
+            with self.stats.phase("anomalies"):
+                sysbench_results["anomalies"] = anomalies.detect_anomalies(
+                    sysbench_results["intervals"], self.config.start_time, warmup_s, self.yb_dump)
+                print(f"Detected {len(sysbench_results['anomalies'])} anomalous window(s)")
+
+        self.results = self._build_results(workload_name, sysbench_results, sysbench_params)
 
         report_data = {
             "title": self.config.title,
@@ -1489,6 +1753,10 @@ class ReportGenerator:
             "metrics": self.metrics_data,
             "by_pod": self.by_pod,
             "by_node": self.by_node,
+            # Chart arrays are shipped Gorilla-encoded; the template decodes them.
+            "metrics_tsz": tscodec.encode_series_fields(self.metrics_data),
+            "by_pod_tsz": tscodec.encode_series_fields(self.by_pod),
+            "by_node_tsz": tscodec.encode_series_fields(self.by_node),
             "pod_to_node": self.pod_to_node,
             "cluster_spec": self.cluster_spec,
             "sysbench_results": sysbench_results,
@@ -1497,9 +1765,97 @@ class ReportGenerator:
             "yb_metrics_index": self.yb_metrics_index,
             "metrics_dump_url": "__METRICS_DUMP_URL__",
             "summary_txt_url": "./summary.txt",
+            # Filled in by save_report() once the dump has been written.
+            "generator_stats": "__GENERATOR_STATS__",
         }
 
-        return template.render(**report_data)
+        with self.stats.phase("render"):
+            return template.render(**report_data)
+
+    def _build_results(self, workload_name: str, results: Optional[dict],
+                       params: Optional[dict]) -> dict:
+        """Columnar results artifact: enriched intervals, per-pod intervals
+        (multi-pod sysbench), warmup/run phase boundaries and summary stats.
+
+        Interval `time` is seconds since start_epoch, as in the report."""
+        start = int(self.config.start_time)
+        end = int(self.config.end_time)
+        warmup_end = int(self.config.warmup_end) if self.config.warmup_end else None
+        phases = []
+        if self.sweep_steps:
+            # One phase per offered rate; warmup_end_epoch marks its settled part.
+            for st in self.sweep_steps:
+                phases.append({"name": f"step_{st['step']}", "start_epoch": st["start_epoch"],
+                               "end_epoch": st["end_epoch"],
+                               "warmup_end_epoch": st["warmup_end_epoch"],
+                               "offered_rate": st["offered_rate"]})
+        else:
+            if warmup_end:
+                phases.append({"name": "warmup", "start_epoch": start, "end_epoch": warmup_end})
+            phases.append({"name": "run", "start_epoch": warmup_end or start, "end_epoch": end})
+        for p in phases:
+            p["start_s"] = p["start_epoch"] - start
+            p["end_s"] = p["end_epoch"] - start
+
+        per_pod = []
+        if self.config.workload_type in ("sysbench", "pyload"):
+            i = 0
+            while (pod_file := self.config.workload_path / f"{self.output_prefix}_output_{i}.txt").exists():
+                with open(pod_file) as f:
+                    reader = sysbench_parser.OutputReader(f)
+                    rows = [iv.as_dict() for iv in reader.intervals()]
+                per_pod.append({
+                    "pod": str(i),
+                    "summary": reader.totals.as_dict(),
+                    "intervals": to_columns(rows),
+                })
+                i += 1
+
+        results = results or {}
+        return {
+            "version": RESULTS_VERSION,
+            "title": self.config.title,
+            "workload_type": self.config.workload_type,
+            "workload_name": workload_name,
+            "start_epoch": start,
+            "end_epoch": end,
+            "warmup_end_epoch": warmup_end,
+            "phases": phases,
+            "params": params or {},
+            "summary": {k: v for k, v in results.items() if k != "intervals"},
+            "intervals": to_columns(results.get("intervals") or []),
+            "per_pod": per_pod,
+        }
+
+    def _write_results_parquet(self, path: Path):
+        """Long-format interval table (pod "all" = aggregate) for cross-run
+        analysis; needs pyarrow, which is otherwise not required."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            print("Warning: --results-parquet needs pyarrow (pip install pyarrow); skipped",
+                  file=sys.stderr)
+            return
+        r = self.results
+        tables = [("all", r["intervals"])] + [(p["pod"], p["intervals"]) for p in r["per_pod"]]
+        rows = []
+        for pod, cols in tables:
+            n = len(cols.get("time", []))
+            for i in range(n):
+                row = {k: v[i] for k, v in cols.items()}
+                row["pod"] = pod
+                row["epoch"] = r["start_epoch"] + row["time"]
+                row["phase"] = next((p["name"] for p in r["phases"]
+                                     if p["start_s"] < row["time"] <= p["end_s"]), None)
+                rows.append(row)
+        table = pa.Table.from_pylist(rows)
+        table = table.replace_schema_metadata({
+            "title": r["title"], "workload_type": r["workload_type"],
+            "start_epoch": str(r["start_epoch"]), "end_epoch": str(r["end_epoch"]),
+        })
+        pq.write_table(table, path)
+        print(f"Saved results table: {path} ({len(rows)} rows)")
 
     def _upload_to_s3(self, local_file: Path, s3_key: str):
         """Upload a file to S3 using aws cli."""
@@ -1528,56 +1884,105 @@ class ReportGenerator:
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # Resolve metrics dump URL now that timestamp is known.
+        dump_name = "metrics_dump.tsz.gz" if self.config.dump_format == "tsz" else "metrics_dump.json.gz"
         if self.config.metrics_dump_base_url:
-            dump_url = f"{self.config.metrics_dump_base_url}/reports/{timestamp}/metrics_dump.json.gz"
+            dump_url = f"{self.config.metrics_dump_base_url}/reports/{timestamp}/{dump_name}"
         else:
-            dump_url = "./metrics_dump.json.gz"
+            dump_url = f"./{dump_name}"
         html_content = html_content.replace("__METRICS_DUMP_URL__", dump_url)
 
+        # Save YB metrics dump for the Metrics Explorer tab (gzip compressed).
+        # Written before report.html so the stats panel includes the encode.
+        dump_file = None
+        if self.yb_dump:
+            import gzip as _gzip
+            with self.stats.phase("dump_write"):
+                dump_file = output_dir / dump_name
+                if self.config.dump_format == "tsz":
+                    raw = tscodec.encode_dump(self.yb_dump)
+                else:
+                    raw = json.dumps(self.yb_dump, separators=(",", ":")).encode()
+                with _gzip.open(dump_file, "wb") as f:
+                    f.write(raw)
+            size_mb = dump_file.stat().st_size / 1024 / 1024
+            raw_mb = len(raw) / 1024 / 1024
+            print(f"Saved YB metrics dump: {dump_file} ({size_mb:.1f} MB gzip, {raw_mb:.1f} MB {self.config.dump_format}, {len(self.yb_dump)} series)")
+
+        # The panel gets the summary only; the per-query list stays in the JSON file.
+        panel_stats = json.dumps(self.stats.to_dict(include_queries=False)).replace("</", "<\\/")
+        html_content = html_content.replace('"__GENERATOR_STATS__"', panel_stats)
+
         output_file = output_dir / "report.html"
         with open(output_file, "w") as f:
             f.write(html_content)
 
         print(f"Report saved to: {output_file}")
 
-        # Save YB metrics dump for the Metrics Explorer tab (gzip compressed).
-        if self.yb_dump:
-            import gzip as _gzip
-            dump_file = output_dir / "metrics_dump.json.gz"
-            raw = json.dumps(self.yb_dump, separators=(",", ":")).encode()
-            with _gzip.open(dump_file, "wb") as f:
-                f.write(raw)
-            size_mb = dump_file.stat().st_size / 1024 / 1024
-            raw_mb = len(raw) / 1024 / 1024
-            print(f"Saved YB metrics dump: {dump_file} ({size_mb:.1f} MB gzip, {raw_mb:.1f} MB raw, {len(self.yb_dump)} series)")
+        results_file = output_dir / RESULTS_NAME
+        with open(results_file, "w") as f:
+            json.dump(self.results, f, separators=(",", ":"))
+        print(f"Saved results: {results_file}")
+        if self.config.results_parquet:
+            self._write_results_parquet(output_dir / "results.parquet")
 
-            # Upload to S3 if configured.
-            if self.config.metrics_dump_base_url:
-                s3_key = f"reports/{timestamp}/metrics_dump.json.gz"
-                self._upload_to_s3(dump_file, s3_key)
+        # Upload to S3 if configured.
+        if dump_file and self.config.metrics_dump_base_url:
+            s3_key = f"reports/{timestamp}/{dump_name}"
+            self._upload_to_s3(dump_file, s3_key)
 
         # Copy workload output files from unified output/ directory
-        workload_dir = Path(self.config.output_dir).parent / "output"
+        workload_dir = self.config.workload_path
         for spec_name in ["RUN_NODE_SPEC.txt", "CLIENT_NODE_SPEC.txt", "test_times.txt"]:
             src = workload_dir / spec_name
             if src.exists():
                 shutil.copy(src, output_dir / spec_name)
                 print(f"Copied {spec_name}")
+        for step_file in sorted(workload_dir.glob("sweep_step_*.txt")):
+            shutil.copy(step_file, output_dir / step_file.name)
+        if self.sweep_steps:
+            print(f"Copied sweep step outputs ({len(self.sweep_steps)} steps)")
         if self.config.workload_type == "k6":
             for k6_file in sorted(workload_dir.glob("k6_output_*.txt")):
                 shutil.copy(k6_file, output_dir / k6_file.name)
                 print(f"Copied {k6_file.name}")
             self._save_k6_configmap(output_dir)
+        elif self.config.workload_type == "cdc":
+            for name in ("cdc_output.txt", "cdc_rows.csv", "cdc_connectors.json", "cdc_sweep.txt"):
+                src = workload_dir / name
+                if src.exists():
+                    shutil.copy(src, output_dir / name)
+                    print(f"Copied {name}")
+            for step_file in sorted(workload_dir.glob("cdc_sweep_step_*")):
+                shutil.copy(step_file, output_dir / step_file.name)
         else:
-            sysbench_output = workload_dir / "sysbench_output.txt"
+            prefix = self.output_prefix
+            sysbench_output = workload_dir / f"{prefix}_output.txt"
             if sysbench_output.exists():
-                shutil.copy(sysbench_output, output_dir / "sysbench_output.txt")
-                print(f"Copied sysbench_output.txt")
-            for pod_file in sorted(workload_dir.glob("sysbench_output_*.txt")):
+                shutil.copy(sysbench_output, output_dir / sysbench_output.name)
+                print(f"Copied {sysbench_output.name}")
+            for pod_file in sorted(workload_dir.glob(f"{prefix}_output_*.txt")):
                 shutil.copy(pod_file, output_dir / pod_file.name)
                 print(f"Copied {pod_file.name}")
+            for hist_file in sorted(workload_dir.glob("pyload_hist_*.jsonl")):
+                shutil.copy(hist_file, output_dir / hist_file.name)
+                print(f"Copied {hist_file.name}")
             self._save_sysbench_configmap(output_dir)
 
+        if isinstance(self.executor, RecordingExecutor):
+            self.executor.finish(output_dir / ARCHIVE_NAME)
+        elif isinstance(self.executor, ReplayExecutor):
+            # Keep the regenerated report replayable on its own.
+            shutil.copy(self.config.replay, output_dir / ARCHIVE_NAME)
+            if self.executor.misses:
+                print(f"Warning: {self.executor.misses} calls were not in the query archive "
+                      f"(changed queries return no data on replay)", file=sys.stderr)
+
+        stats_file = output_dir / "generator_stats.json"
+        with open(stats_file, "w") as f:
+            json.dump(self.stats.to_dict(), f, indent=2)
+        self.stats.print_summary()
+        print(f"Saved generator stats: {stats_file}")
+
         return output_file
 
     def collect_k6_results_from_prometheus(self, step: int = 10) -> Optional[dict]:
@@ -1595,22 +2000,61 @@ class ReportGenerator:
             start, end, step
         )
 
-        # Insert latency p95 — requires K6_PROMETHEUS_RW_TREND_STATS=p(95),...
-        lat_series = self.prometheus.query_range(
+        # Cluster-wide latency histograms per interval, from the scripts'
+        # latency_bucket counter. Runs from scripts without it fall back to
+        # the per-pod p95 trend stat (K6_PROMETHEUS_RW_TREND_STATS=p(95),...).
+        lat_hists = self._k6_latency_histograms(step, start, end, step).get("", {})
+        lat_series = [] if lat_hists else self.prometheus.query_range(
             'k6_iteration_duration_p95',
             start, end, step
         )
 
+        # Rows/s differs from TPS when K6_INSERT_MODE batches rows; the
+        # scripts tag every series with insert_mode and batch_size.
+        rows_series = self.prometheus.query_range(
+            'sum by (insert_mode, batch_size) (irate(k6_rows_inserted_total[30s]))',
+            start, end, step
+        )
+
         if not tps_series:
             print("Warning: no k6_iterations_total data in Prometheus", file=sys.stderr)
             return None
 
+        rows_at: dict[int, float] = {}
+        for rs in rows_series:
+            for ts, v in zip(rs.timestamps, rs.values):
+                rows_at[int(ts)] = rows_at.get(int(ts), 0.0) + v
+
+        # Open-model runs (arrival-rate executors): iterations skipped because
+        # every VU was busy, and VUs in use (the in-flight backlog).
+        dropped_at = self._series_by_ts(self.prometheus.query_range(
+            'sum(irate(k6_dropped_iterations_total[30s]))', start, end, step))
+        vus_at = self._series_by_ts(self.prometheus.query_range(
+            'sum(k6_vus)', start, end, step))
+
+        # Per-operation rate and p95 from test-mixed.js (op=<operation> tag).
+        op_tps = {
+            s.labels.get("op", ""): dict(zip(map(int, s.timestamps), s.values))
+            for s in self.prometheus.query_range(
+                'sum by (op) (irate(k6_ops_total[30s]))', start, end, step)
+        }
+        op_lat = {
+            s.labels.get("op", ""): dict(zip(map(int, s.timestamps), s.values))
+            for s in self.prometheus.query_range(
+                'max by (op) (k6_op_duration_p95)', start, end, step)
+        }
+
         s = tps_series[0]
         intervals = []
         for ts, tps_val in zip(s.timestamps, s.values):
             t_offset = int(ts - start)
             lat_val = 0.0
-            if lat_series and lat_series[0].values:
+            pcts = {}
+            if lat_hists:
+                hist = lat_hists.get(int(ts), [])
+                pcts = {pct: sysbench_parser.histogram_percentile(hist, pct) for pct in (50, 95, 99)}
+                lat_val = pcts[95] or 0.0
+            elif lat_series and lat_series[0].values:
                 lat_s = lat_series[0]
                 closest_idx = min(range(len(lat_s.timestamps)),
                                   key=lambda i: abs(lat_s.timestamps[i] - ts))
@@ -1618,12 +2062,23 @@ class ReportGenerator:
                     # k6 iteration_duration is in seconds; convert to ms
                     lat_val = lat_s.values[closest_idx] * 1000.0
 
-            intervals.append({
+            row = {
                 "time": t_offset,
                 "tps": tps_val,
                 "lat_95": lat_val,
                 "err_s": 0.0,
-            })
+            }
+            if lat_hists:
+                row["lat_50"], row["lat_99"] = pcts[50] or 0.0, pcts[99] or 0.0
+            if rows_series:
+                row["rows_s"] = rows_at.get(int(ts))
+            if op_tps:
+                row["op_tps"] = {op: series.get(int(ts)) for op, series in op_tps.items()}
+            if dropped_at:
+                row["dropped_s"] = dropped_at.get(int(ts), 0.0)
+            if vus_at:
+                row["vus"] = vus_at.get(int(ts))
+            intervals.append(row)
 
         # Summary stats
         result = {"intervals": intervals}
@@ -1634,13 +2089,57 @@ class ReportGenerator:
         )
         if total_series and total_series[0].values:
             result["transactions"] = int(total_series[0].values[-1])
+        if dropped_at:
+            dropped_total = self.prometheus.query_range(
+                'sum(k6_dropped_iterations_total)', end - 1, end, step
+            )
+            if dropped_total and dropped_total[0].values:
+                result["dropped_iterations"] = int(dropped_total[0].values[-1])
 
         non_zero_tps = [iv["tps"] for iv in intervals if iv["tps"] > 0]
         if non_zero_tps:
             result["tps"] = sum(non_zero_tps) / len(non_zero_tps)
 
+        non_zero_rows = [iv["rows_s"] for iv in intervals if iv.get("rows_s")]
+        if non_zero_rows:
+            result["rows_per_sec"] = sum(non_zero_rows) / len(non_zero_rows)
+        batches = sorted({(rs.labels.get("insert_mode", ""), rs.labels.get("batch_size", ""))
+                          for rs in rows_series})
+        if len(batches) == 1 and batches[0][1]:
+            result["insert_mode"], result["batch_size"] = batches[0][0], int(batches[0][1])
+
+        # Steady-state percentiles over the whole post-warmup window, from
+        # the bucket counts summed across pods (as sysbench totals report).
+        steady_start = self.config.warmup_end or start
+        steady = {}
+        if lat_hists and end > steady_start:
+            steady = self._k6_latency_histograms(
+                int(end - steady_start), end, end, step, by="op" if op_tps else "")
+
+        if op_tps:
+            operations = []
+            for op in sorted(op_tps):
+                tps_vals = [v for v in op_tps[op].values() if v > 0]
+                # Time trends are exported in seconds, like iteration_duration.
+                lat_vals = [v * 1000.0 for v in op_lat.get(op, {}).values() if v > 0]
+                op_hist = list(steady.get(op, {}).values())
+                operations.append({
+                    "op": op,
+                    "tps": sum(tps_vals) / len(tps_vals) if tps_vals else 0.0,
+                    "lat_p95": (sysbench_parser.histogram_percentile(op_hist[-1], 95) if op_hist
+                                else sum(lat_vals) / len(lat_vals) if lat_vals else None),
+                    "lat_p95_max": max(lat_vals) if lat_vals else None,
+                })
+            result["operations"] = operations
+
+        if steady:
+            hist = sysbench_parser.merge_histograms(
+                by_ts[max(by_ts)] for by_ts in steady.values() if by_ts)
+            if hist:
+                for pct in (50, 95, 99):
+                    result[f"lat_p{pct}"] = sysbench_parser.histogram_percentile(hist, pct)
         non_zero_lat = [iv["lat_95"] for iv in intervals if iv["lat_95"] > 0]
-        if non_zero_lat:
+        if non_zero_lat and "lat_p95" not in result:
             result["lat_avg"] = sum(non_zero_lat) / len(non_zero_lat)
             result["lat_min"] = min(non_zero_lat)
             result["lat_max"] = max(non_zero_lat)
@@ -1649,6 +2148,73 @@ class ReportGenerator:
         result["elapsed"] = end - start
         return result
 
+    def collect_k6_sweep(self, steps: list[dict]) -> list[dict]:
+        """Achieved rate and latency percentiles of each sweep step.
+
+        Throughput is averaged over the post-warmup part of the step, and
+        percentiles come from the latency_bucket counts of that window. For
+        scripts without the counter, the last p50/p95/p99 trend sample of
+        the step is used instead: trend stats cover the whole k6 run (warmup
+        included), and each step is its own run."""
+        sweep = []
+        for st in steps:
+            start, end = st["warmup_end_epoch"], st["end_epoch"]
+            tps = self._series_by_ts(self.prometheus.query_range(
+                'sum(irate(k6_iterations_total[30s]))', start, end, 10))
+            dropped = self._series_by_ts(self.prometheus.query_range(
+                'sum(irate(k6_dropped_iterations_total[30s]))', start, end, 10))
+            point = {
+                "step": st["step"],
+                "load_pct": st["load_pct"],
+                "offered": st["offered_rate"],
+                "achieved": sum(tps.values()) / len(tps) if tps else 0.0,
+                "err_s": 0.0,
+                "dropped_s": sum(dropped.values()) / len(dropped) if dropped else 0.0,
+            }
+            hists = self._k6_latency_histograms(end - start, end, end, 10).get("", {})
+            for pct in (50, 95, 99):
+                if hists:
+                    point[f"lat_p{pct}"] = sysbench_parser.histogram_percentile(
+                        hists[max(hists)], pct)
+                    continue
+                lat = self._series_by_ts(self.prometheus.query_range(
+                    f'max(k6_iteration_duration_p{pct})', start, end, 10))
+                # k6 exports seconds; convert to ms
+                point[f"lat_p{pct}"] = lat[max(lat)] * 1000.0 if lat else None
+            sweep.append(point)
+        return sweep
+
+    def _k6_latency_histograms(self, window: int, start: float, end: float, step: int,
+                               by: str = "") -> dict[str, dict[int, list[tuple[float, float]]]]:
+        """Latency histograms of all k6 pods from the scripts' latency_bucket
+        counter: {<`by` label value>: {ts: [(le_ms, count), ...]}}, each
+        counting the samples of the `window` seconds up to ts. Buckets are
+        the same on every pod, so summing by le merges the pods; the counts
+        are increase() estimates (extrapolated, possibly fractional) and
+        percentiles taken from them resolve only to a bucket (~9%; 1ms and
+        below is one bucket)."""
+        group = f"{by}, le" if by else "le"
+        series = self.prometheus.query_range(
+            f'sum by ({group}) (increase(k6_latency_bucket_total[{window}s]))', start, end, step)
+        hists: dict[str, dict[int, list[tuple[float, float]]]] = {}
+        for s in series:
+            try:
+                le = float(s.labels.get("le", ""))
+            except ValueError:
+                continue
+            by_ts = hists.setdefault(s.labels.get(by, "") if by else "", {})
+            for ts, v in zip(s.timestamps, s.values):
+                if v > 0:
+                    by_ts.setdefault(int(ts), []).append((le, v))
+        return hists
+
+    @staticmethod
+    def _series_by_ts(series: list) -> dict[int, float]:
+        """First series of a query_range result as {timestamp: value}."""
+        if not series:
+            return {}
+        return dict(zip(map(int, series[0].timestamps), series[0].values))
+
     def _get_k6_params(self) -> Optional[dict]:
         """Get k6 parameters from the k6 pod env vars (k8s) or ansible vars (vm)."""
         if self.config.mode == "vm":
@@ -1661,7 +2227,7 @@ class ReportGenerator:
             "-o", "jsonpath={.items[0].spec.containers[0].env}"
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = self.executor.run(cmd)
             if result.returncode == 0 and result.stdout.strip():
                 envs = json.loads(result.stdout)
                 params = {}
@@ -1693,6 +2259,19 @@ class ReportGenerator:
             "k6_create_secondary": "K6_CREATE_SECONDARY",
             "k6_install_trigger": "K6_INSTALL_TRIGGER",
             "k6_serial_cache_size": "K6_SERIAL_CACHE_SIZE",
+            "k6_insert_mode": "K6_INSERT_MODE",
+            "k6_batch_size": "K6_BATCH_SIZE",
+            "k6_value_pool": "K6_VALUE_POOL",
+            "k6_value_pool_size": "K6_VALUE_POOL_SIZE",
+            "k6_mix_point_selects": "K6_MIX_POINT_SELECTS",
+            "k6_mix_index_updates": "K6_MIX_INDEX_UPDATES",
+            "k6_mix_non_index_updates": "K6_MIX_NON_INDEX_UPDATES",
+            "k6_mix_deletes": "K6_MIX_DELETES",
+            "k6_mix_inserts": "K6_MIX_INSERTS",
+            "k6_executor": "K6_EXECUTOR",
+            "k6_rate": "K6_RATE",
+            "k6_max_vus": "K6_MAX_VUS",
+            "k6_rate_stages": "K6_RATE_STAGES",
         }
         for yml_key, env_key in key_map.items():
             m = re.search(rf'^{yml_key}:\s*"?([^"\n]+)"?', text, re.MULTILINE)
@@ -1723,7 +2302,7 @@ class ReportGenerator:
             "-o", "yaml"
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = self.executor.run(cmd)
             if result.returncode == 0:
                 configmap_file = output_dir / "k6-configmap.yaml"
                 with open(configmap_file, "w") as f:
@@ -1734,9 +2313,14 @@ class ReportGenerator:
         except Exception as e:
             print(f"Warning: Failed to save k6 configmap: {e}", file=sys.stderr)
 
+    @property
+    def output_prefix(self) -> str:
+        """Output file and configmap prefix of the sysbench-format workloads."""
+        return "pyload" if self.config.workload_type == "pyload" else "sysbench"
+
     def _get_sysbench_params(self) -> Optional[dict]:
-        """Get sysbench parameters from the live configmap."""
-        configmap_name = f"{self.config.release_name}-sysbench-scripts"
+        """Get sysbench (or pyload) parameters from the live configmap."""
+        configmap_name = f"{self.config.release_name}-{self.output_prefix}-scripts"
         cmd = [
             "kubectl", "--context", self.config.kube_context,
             "-n", self.config.namespace,
@@ -1744,14 +2328,14 @@ class ReportGenerator:
             "-o", "yaml"
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = self.executor.run(cmd)
             if result.returncode == 0:
                 # Write to a temp path and parse
                 import tempfile
                 with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
                     f.write(result.stdout)
                     tmp_path = Path(f.name)
-                params = parse_sysbench_configmap(tmp_path)
+                params = parse_sysbench_configmap(tmp_path, self.output_prefix)
                 tmp_path.unlink()
                 return params
         except Exception:
@@ -1759,8 +2343,8 @@ class ReportGenerator:
         return None
 
     def _save_sysbench_configmap(self, output_dir: Path):
-        """Save the sysbench scripts configmap to capture exact parameters used."""
-        configmap_name = f"{self.config.release_name}-sysbench-scripts"
+        """Save the sysbench (or pyload) scripts configmap to capture exact parameters used."""
+        configmap_name = f"{self.config.release_name}-{self.output_prefix}-scripts"
         cmd = [
             "kubectl", "--context", self.config.kube_context,
             "-n", self.config.namespace,
@@ -1768,16 +2352,16 @@ class ReportGenerator:
             "-o", "yaml"
         ]
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = self.executor.run(cmd)
             if result.returncode == 0:
-                configmap_file = output_dir / "sysbench-configmap.yaml"
+                configmap_file = output_dir / f"{self.output_prefix}-configmap.yaml"
                 with open(configmap_file, "w") as f:
                     f.write(result.stdout)
-                print(f"Saved sysbench configmap to: {configmap_file}")
+                print(f"Saved {self.output_prefix} configmap to: {configmap_file}")
             else:
-                print(f"Warning: Could not get sysbench configmap: {result.stderr}", file=sys.stderr)
+                print(f"Warning: Could not get {self.output_prefix} configmap: {result.stderr}", file=sys.stderr)
         except Exception as e:
-            print(f"Warning: Failed to save sysbench configmap: {e}", file=sys.stderr)
+            print(f"Warning: Failed to save {self.output_prefix} configmap: {e}", file=sys.stderr)
 
 
 def parse_sysbench_output(filepath: Path) -> Optional[dict]:
@@ -1785,97 +2369,287 @@ def parse_sysbench_output(filepath: Path) -> Optional[dict]:
     if not filepath.exists():
         return None
 
-    text = filepath.read_text()
-    result = {}
+    with open(filepath) as f:
+        reader = sysbench_parser.OutputReader(f)
+        intervals = [iv.as_dict() for iv in reader.intervals()]
+    t = reader.totals
+
+    result = {"intervals": intervals}
+    result["sql_stats"] = {
+        key: getattr(t, f"sql_{key}") for key in ("read", "write", "other", "total")
+        if getattr(t, f"sql_{key}") is not None
+    }
+    for key, value in (
+        ("transactions", t.transactions), ("tps", t.tps),
+        ("queries", t.queries), ("qps", t.qps),
+        ("errors", t.errors), ("errors_per_sec", t.errors_ps),
+        ("lat_min", t.lat_min), ("lat_avg", t.lat_avg),
+        ("lat_max", t.lat_max), ("lat_p95", t.lat_p95),
+        ("fairness_avg", t.fair_events_avg), ("fairness_stddev", t.fair_events_stddev),
+        ("elapsed", t.elapsed),
+    ):
+        if value is not None:
+            result[key] = value
+    return result
+
+
+def apply_pyload_histograms(results: dict, workload_dir: Path):
+    """Replace the merged p95s of a pyload run with cluster-wide
+    percentiles from the pods' histograms and add p50/p99.
+
+    Summing the histograms merges the pods exactly; each percentile is
+    then the upper bound of its bucket (exact below 256us, <1% wide above).
+
+    Each pod's pyload_hist_<i>.jsonl holds one latency histogram per second
+    of its run; seconds are aligned by offset from the pod's start, as
+    merge-sysbench-output.py aligns intervals. Interval rows get the
+    percentiles of the seconds they cover, the summary those of the seconds
+    after warmup. For the range_scan workload, `range_scans` gets one row
+    per range size: queries/s, rows scanned/s and latency percentiles after
+    warmup, summed over pods."""
+    by_second: dict[int, list] = {}
+    scans: dict[int, dict] = {}
+    warmup_s = 0
+    measured_s = 0
+    files = sorted(workload_dir.glob("pyload_hist_*.jsonl"))
+    for path in files:
+        with open(path) as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("format") != "pyload-histogram":
+                print(f"Warning: {path.name} is not a pyload histogram file", file=sys.stderr)
+                continue
+            warmup_s = max(warmup_s, header.get("warmup_s", 0))
+            measured_s = max(measured_s, header.get("time_s", 0) - header.get("warmup_s", 0))
+            for line in f:
+                rec = json.loads(line)
+                by_second.setdefault(rec["t"], []).append(
+                    [(us / 1000.0, count) for us, count in rec["b"]])
+                if rec["t"] < header.get("warmup_s", 0):
+                    continue
+                for size, sc in rec.get("scans", {}).items():
+                    acc = scans.setdefault(int(size), {"n": 0, "rows": 0, "hists": []})
+                    acc["n"] += sc["n"]
+                    acc["rows"] += sc["rows"]
+                    acc["hists"].append([(us / 1000.0, count) for us, count in sc["b"]])
+    if not by_second:
+        return
+
+    def percentiles(seconds) -> dict:
+        merged = sysbench_parser.merge_histograms(
+            [h for s in seconds for h in by_second.get(s, [])])
+        return {pct: sysbench_parser.histogram_percentile(merged, pct) for pct in (50, 95, 99)}
+
+    prev = 0
+    for row in results.get("intervals", []):
+        p = percentiles(range(prev, row["time"]))
+        prev = row["time"]
+        if p[95] is not None:
+            row["lat_50"], row["lat_95"], row["lat_99"] = p[50], p[95], p[99]
+    p = percentiles(s for s in by_second if s >= warmup_s)
+    if p[95] is not None:
+        results["lat_p50"], results["lat_p95"], results["lat_p99"] = p[50], p[95], p[99]
+    if scans and measured_s > 0:
+        results["range_scans"] = []
+        for size in sorted(scans):
+            acc = scans[size]
+            merged = sysbench_parser.merge_histograms(acc["hists"])
+            row = {"range_size": size, "queries": acc["n"], "qps": acc["n"] / measured_s,
+                   "rows_s": acc["rows"] / measured_s}
+            for pct in (50, 95, 99):
+                row[f"lat_p{pct}"] = sysbench_parser.histogram_percentile(merged, pct)
+            results["range_scans"].append(row)
+    print(f"Merged latency histograms of {len(files)} pyload pod(s)")
+
+
+def parse_cdc_rows(workload_dir: Path, start_time: float) -> Optional[dict]:
+    """Per-row lag results of a CDC run from cdc_rows.csv (cdc/run-test.sh).
+
+    1s intervals: tps is rows applied in YugabyteDB per second, lat_* the
+    replication lag (ms) of those rows; see scripts/cdc_lag.py. For a sink
+    settings sweep (cdc/sweep.sh) the intervals of all steps are joined and
+    `cdc_sweep` holds one point per setting."""
+    steps = cdc_lag.read_sweep_steps(workload_dir / "test_times.txt")
+    if steps:
+        sweep = cdc_lag.analyze_sweep(workload_dir, steps, start_time)
+        if sweep is None:
+            return None
+        print(f"Parsed CDC sink sweep of {len(sweep['sweep'])} steps")
+        return {"intervals": sweep["intervals"], "cdc_sweep": sweep["sweep"],
+                "cdc_sweep_best_step": sweep["best_step"]}
+    rows_file = workload_dir / "cdc_rows.csv"
+    if not rows_file.exists():
+        print(f"Warning: {rows_file} not found", file=sys.stderr)
+        return None
+    results = cdc_lag.analyze(cdc_lag.read_rows(rows_file), start_time)
+    if results is None:
+        print(f"Warning: no stamped rows in {rows_file}", file=sys.stderr)
+        return None
+    results["lat_p50"], results["lat_p95"], results["lat_p99"] = \
+        results["lag_p50"], results["lag_p95"], results["lag_p99"]
+    print(f"Parsed lag of {results['rows']} CDC rows")
+    return results
+
+
+def read_cdc_sink_config(workload_dir: Path) -> Optional[dict]:
+    """JDBC sink connector config saved by cdc/run-test.sh (cdc_connectors.json)."""
+    path = workload_dir / "cdc_connectors.json"
+    try:
+        with open(path) as f:
+            connectors = json.load(f)
+        return connectors["sink-yugabyte"]["info"]["config"]
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Warning: no sink connector config in {path}: {e}", file=sys.stderr)
+        return None
 
-    # Parse interval reports: [ 10s ] thds: 24 tps: 98.19 qps: 3372.21 (r/w/o: 997.53/2176.67/198.01) lat (ms,95%): 297.92 err/s: 1.02 reconn/s: 0.00
+
+def read_sweep_steps(times_file: Path) -> list[dict]:
+    """SWEEP_STEP lines of test_times.txt, written by sweep-run-with-timestamps.sh as
+    SWEEP_STEP=<n>,<% of max>,<offered/s>,<start>,<warmup end>,<end>."""
+    if not times_file.exists():
+        return []
+    steps = []
+    with open(times_file) as f:
+        for line in f:
+            if not line.startswith("SWEEP_STEP="):
+                continue
+            n, pct, offered, start, warmup_end, end = line.split("=", 1)[1].strip().split(",")
+            steps.append({
+                "step": int(n), "load_pct": int(pct), "offered_rate": int(offered),
+                "start_epoch": int(start), "warmup_end_epoch": int(warmup_end),
+                "end_epoch": int(end),
+            })
+    return steps
+
+
+def parse_sysbench_sweep(workload_dir: Path, steps: list[dict],
+                         start_time: float) -> Optional[dict]:
+    """Results of a sysbench rate sweep, one sysbench run per step.
+
+    Intervals of all steps are joined on the report's time axis (tagged with
+    their step). Each step's latency percentiles come from the --histogram
+    output of its pods, merged bucket by bucket; the merged sweep_step_<n>.txt
+    provides intervals and achieved TPS."""
     intervals = []
-    for m in re.finditer(
-        r'\[\s*(\d+)s\s*\]\s*thds:\s*(\d+)\s*tps:\s*([\d.]+)\s*qps:\s*([\d.]+)\s*'
-        r'\(r/w/o:\s*([\d.]+)/([\d.]+)/([\d.]+)\)\s*lat\s*\(ms,95%\):\s*([\d.]+)\s*'
-        r'err/s:\s*([\d.]+)',
-        text
-    ):
-        intervals.append({
-            "time": int(m.group(1)),
-            "threads": int(m.group(2)),
-            "tps": float(m.group(3)),
-            "qps": float(m.group(4)),
-            "read_qps": float(m.group(5)),
-            "write_qps": float(m.group(6)),
-            "other_qps": float(m.group(7)),
-            "lat_95": float(m.group(8)),
-            "err_s": float(m.group(9)),
-        })
-    result["intervals"] = intervals
-
-    # Parse SQL statistics
-    sql_stats = {}
-    for key in ["read", "write", "other", "total"]:
-        m = re.search(rf'^\s*{key}:\s+(\d+)', text, re.MULTILINE)
-        if m:
-            sql_stats[key] = int(m.group(1))
-    result["sql_stats"] = sql_stats
-
-    # Parse summary stats
-    m = re.search(r'transactions:\s+(\d+)\s+\(([\d.]+) per sec\.\)', text)
-    if m:
-        result["transactions"] = int(m.group(1))
-        result["tps"] = float(m.group(2))
-
-    m = re.search(r'queries:\s+(\d+)\s+\(([\d.]+) per sec\.\)', text)
-    if m:
-        result["queries"] = int(m.group(1))
-        result["qps"] = float(m.group(2))
-
-    m = re.search(r'ignored errors:\s+(\d+)\s+\(([\d.]+) per sec\.\)', text)
-    if m:
-        result["errors"] = int(m.group(1))
-        result["errors_per_sec"] = float(m.group(2))
-
-    # Latency
-    for key, label in [("min", "min"), ("avg", "avg"), ("max", "max"), ("95th percentile", "p95")]:
-        m = re.search(rf'^\s*{re.escape(key)}:\s+([\d.]+)', text, re.MULTILINE)
-        if m:
-            result[f"lat_{label}"] = float(m.group(1))
-
-    # Thread fairness
-    m = re.search(r'events \(avg/stddev\):\s+([\d.]+)/([\d.]+)', text)
-    if m:
-        result["fairness_avg"] = float(m.group(1))
-        result["fairness_stddev"] = float(m.group(2))
-
-    m = re.search(r'time elapsed:\s+([\d.]+)', text)
-    if m:
-        result["elapsed"] = float(m.group(1))
+    sweep = []
+    for st in steps:
+        n = st["step"]
+        merged = workload_dir / f"sweep_step_{n}.txt"
+        if not merged.exists():
+            print(f"Warning: {merged} missing; sweep step {n} skipped", file=sys.stderr)
+            continue
+        offset = st["start_epoch"] - int(start_time)
+        with open(merged) as f:
+            reader = sysbench_parser.OutputReader(f)
+            for iv in reader.intervals():
+                row = iv.as_dict()
+                row["time"] += offset
+                row["step"] = n
+                intervals.append(row)
+        t = reader.totals
+
+        histograms = []
+        i = 0
+        while (pod_file := workload_dir / f"sweep_step_{n}_{i}.txt").exists():
+            with open(pod_file) as f:
+                pod_reader = sysbench_parser.OutputReader(f)
+                for _ in pod_reader.intervals():
+                    pass
+            histograms.append(pod_reader.histogram)
+            i += 1
+        histogram = sysbench_parser.merge_histograms(histograms)
+
+        point = {
+            "step": n,
+            "load_pct": st["load_pct"],
+            "offered": st["offered_rate"],
+            "achieved": t.tps or 0.0,
+            "err_s": t.errors_ps or 0.0,
+        }
+        for pct in (50, 95, 99):
+            point[f"lat_p{pct}"] = sysbench_parser.histogram_percentile(histogram, pct)
+        if point["lat_p95"] is None:
+            point["lat_p95"] = t.lat_p95
+        sweep.append(point)
 
-    return result
+    if not sweep:
+        return None
+    return {"intervals": intervals, "sweep": sweep}
+
+
+def find_knee(sweep: list[dict], min_ratio: float = 0.95,
+              lat_factor: float = 2.0) -> Optional[int]:
+    """Index of the first sweep step past the latency knee: achieved
+    throughput below min_ratio of offered, or tail latency (p99, else p95)
+    above lat_factor times the lightest step's. None if no step saturates."""
+    def tail(p):
+        return p.get("lat_p99") if p.get("lat_p99") is not None else p.get("lat_p95")
+
+    base = tail(sweep[0]) if sweep else None
+    for i, p in enumerate(sweep):
+        if p["offered"] and p["achieved"] < min_ratio * p["offered"]:
+            return i
+        lat = tail(p)
+        if base and lat is not None and lat > lat_factor * base:
+            return i
+    return None
+
+
+def compact_constant_series(dump: list[dict]) -> int:
+    """Collapse gap-free series whose value never changes to their endpoints.
+
+    Most YB counters sit at 0 for the whole run; storing hundreds of
+    identical [ts, "0"] pairs dominates the dump size. A compacted series
+    keeps only its first and last sample and gains `"constant": true`, so
+    the Explorer still draws the same flat line without any decoding.
+    Series with gaps are left alone — a missing stretch (e.g. a pod that
+    was down) is information a two-point line would hide.
+
+    Mutates `dump` in place and returns the number of series compacted.
+    """
+    compacted = 0
+    for s in dump:
+        values = s.get("values", [])
+        if len(values) < 3:
+            continue
+        first = values[0][1]
+        if any(v[1] != first for v in values):
+            continue
+        t0, t1 = float(values[0][0]), float(values[1][0])
+        step = t1 - t0
+        if step <= 0 or abs((float(values[-1][0]) - t0) - step * (len(values) - 1)) > 1e-6:
+            continue
+        s["values"] = [values[0], values[-1]]
+        s["constant"] = True
+        compacted += 1
+    return compacted
 
 
-def parse_sysbench_configmap(filepath: Path) -> Optional[dict]:
-    """Parse sysbench-configmap.yaml and extract run parameters."""
+def parse_sysbench_configmap(filepath: Path, script: str = "sysbench") -> Optional[dict]:
+    """Parse sysbench-configmap.yaml (or pyload-configmap.yaml with
+    script="pyload") and extract run parameters."""
     if not filepath.exists():
         return None
 
     text = filepath.read_text()
 
-    # Extract sysbench-run.sh section and parse flags
+    # Extract <script>-run.sh section and parse flags
     params = {}
     in_run_script = False
     for line in text.split('\n'):
-        if 'sysbench-run.sh' in line:
+        if f'{script}-run.sh' in line:
             in_run_script = True
             continue
         if in_run_script:
-            if line.strip().startswith('sysbench-') and line.strip().endswith('.sh: |'):
+            if line.strip().endswith(': |'):
                 break  # next script section
             m = re.match(r'\s*--(\S+?)(?:=(.+?))?\s*\\?\s*$', line)
             if m:
                 key = m.group(1)
                 val = (m.group(2) or "true").rstrip(' \\')
                 params[key] = val
-            # Also capture the workload name (e.g. "exec sysbench oltp_read_write")
-            m2 = re.match(r'\s*exec sysbench\s+(\S+)', line)
+            # Also capture the workload name (e.g. "exec sysbench oltp_read_write",
+            # "exec python3 /scripts/pyload.py oltp_read_write run")
+            m2 = re.match(r'\s*exec (?:sysbench|python3 \S*pyload\.py)\s+(\S+)', line)
             if m2:
                 params["workload"] = m2.group(1)
 
@@ -1901,8 +2675,8 @@ def format_number(value: float, suffix: str = "") -> str:
 
 def main():
     parser = argparse.ArgumentParser(description="Generate stress test report from Prometheus metrics")
-    parser.add_argument("--start", type=float, required=True, help="Start timestamp (Unix)")
-    parser.add_argument("--end", type=float, required=True, help="End timestamp (Unix)")
+    parser.add_argument("--start", type=float, help="Start timestamp (Unix; required unless --replay)")
+    parser.add_argument("--end", type=float, help="End timestamp (Unix; required unless --replay)")
     parser.add_argument("--warmup-end", type=float, default=None,
                         help="Warmup end timestamp (Unix); shaded on charts if set")
     parser.add_argument("--step", type=int, default=30, help="Query step in seconds (default: 30)")
@@ -1922,13 +2696,51 @@ def main():
     parser.add_argument("--output-dir", default="reports", help="Output directory")
     parser.add_argument("--metrics-dump-base-url", default="",
                         help="S3 website base URL for metrics dump (e.g. http://bucket.s3-website.region.amazonaws.com)")
-    parser.add_argument("--workload-type", default="sysbench", choices=["sysbench", "k6"],
-                        help="Workload type (sysbench or k6)")
+    parser.add_argument("--workload-type", default="sysbench", choices=["sysbench", "pyload", "k6", "cdc"],
+                        help="Workload type (sysbench, pyload, k6 or cdc)")
+    parser.add_argument("--query-chunk-points", type=int, default=720,
+                        help="Max points per query_range request; longer windows are "
+                             "split and fetched in parallel (0 disables, default: 720)")
+    parser.add_argument("--dump-max-series", type=int, default=0,
+                        help="Series budget for the YB metrics dump; most expensive metric "
+                             "names are skipped first (0 = unlimited)")
+    parser.add_argument("--dump-max-mb", type=float, default=0,
+                        help="Estimated raw-JSON size budget (MB) for the YB metrics dump "
+                             "(0 = unlimited)")
+    parser.add_argument("--dump-format", default="tsz", choices=["tsz", "json"],
+                        help="Metrics dump encoding: Gorilla-compressed tsz or legacy json "
+                             "(default: tsz)")
+    parser.add_argument("--record", action="store_true",
+                        help=f"Save every Prometheus response and kubectl output to {ARCHIVE_NAME} "
+                             "in the report directory")
+    parser.add_argument("--replay", metavar="ARCHIVE", default="",
+                        help="Regenerate a report offline from a recorded query archive; run "
+                             "parameters come from the archive and workload output files from "
+                             "its directory")
+    parser.add_argument("--results-parquet", action="store_true",
+                        help=f"Also write the {RESULTS_NAME} intervals as results.parquet "
+                             "(requires pyarrow)")
+    parser.add_argument("--profile", action="store_true",
+                        help="Run under cProfile (writes generator.prof next to the report) "
+                             "and record per-phase Python heap peaks with tracemalloc")
 
     args = parser.parse_args()
 
-    if args.mode == "k8s" and (not args.kube_context or not args.namespace):
-        parser.error("--kube-context and --namespace are required for k8s mode")
+    if args.replay:
+        if args.record:
+            parser.error("--record and --replay are mutually exclusive")
+        with gzip.open(args.replay, "rt") as f:
+            archived = json.loads(f.readline()).get("config", {})
+        for name, value in archived.items():
+            setattr(args, name, value)
+        args.start, args.end = archived["start_time"], archived["end_time"]
+        args.workload_dir = str(Path(args.replay).resolve().parent)
+    else:
+        if args.start is None or args.end is None:
+            parser.error("--start and --end are required (unless --replay)")
+        if args.mode == "k8s" and (not args.kube_context or not args.namespace):
+            parser.error("--kube-context and --namespace are required for k8s mode")
+        args.workload_dir = ""
 
     config = ReportConfig(
         start_time=args.start,
@@ -1947,12 +2759,38 @@ def main():
         metrics_dump_base_url=args.metrics_dump_base_url,
         workload_type=args.workload_type,
         mode=args.mode,
+        query_chunk_points=args.query_chunk_points,
+        dump_max_series=args.dump_max_series,
+        dump_max_mb=args.dump_max_mb,
+        dump_format=args.dump_format,
+        workload_dir=args.workload_dir,
+        record=args.record,
+        replay=args.replay,
+        results_parquet=args.results_parquet,
     )
 
     generator = ReportGenerator(config)
     generator.validate_connectivity()
+
+    profiler = None
+    if args.profile:
+        # tracemalloc slows allocation-heavy phases noticeably, so it is
+        # tied to --profile rather than always on. cProfile only sees the
+        # main thread; chunked query fetches show up as pool waits.
+        tracemalloc.start()
+        profiler = cProfile.Profile()
+        profiler.enable()
+
     html = generator.generate_report()
-    generator.save_report(html)
+    output_file = generator.save_report(html)
+
+    if profiler:
+        import pstats
+        profiler.disable()
+        prof_file = output_file.parent / "generator.prof"
+        profiler.dump_stats(prof_file)
+        print(f"Saved cProfile output: {prof_file} (view with: python3 -m pstats {prof_file})")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
 
 
 if __name__ == "__main__":
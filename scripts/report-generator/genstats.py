@@ -0,0 +1,159 @@
+"""
+Instrumentation for the report generator.
+
+GeneratorStats collects two kinds of records:
+
+- queries: one entry per Prometheus HTTP request made through
+  PrometheusClient — endpoint, fetch time (kubectl exec / curl), JSON
+  parse time, response bytes, series returned and whether it succeeded.
+- phases: one entry per `with stats.phase(name):` block in
+  ReportGenerator — wall time, CPU time, current RSS at phase end and its
+  growth over the phase and, when tracemalloc is running (--profile), the
+  Python heap peak reached inside the phase. Only the latter is a
+  per-phase peak: the process high-water RSS (ru_maxrss) never goes down,
+  so it is reported once for the whole run.
+
+to_dict() is written to generator_stats.json and embedded in the report's
+"Generator Stats" panel.
+"""
+
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Queries listed individually in the report panel / summary.
+_SLOWEST_QUERIES = 15
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process high-water RSS in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current RSS in MB from /proc/self/statm (Linux only)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * resource.getpagesize() / (1024 * 1024) if resource else None
+
+
+class GeneratorStats:
+    """Thread-safe recorder; chunked range queries report from pool threads."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._phase = ""
+        self.queries: list[dict] = []
+        self.phases: list[dict] = []
+
+    def record_query(self, endpoint: str, query: str, fetch_s: float, parse_s: float,
+                     nbytes: int, series: int, ok: bool):
+        entry = {
+            "phase": self._phase,
+            "endpoint": endpoint,
+            "query": query[:300],
+            "fetch_s": round(fetch_s, 4),
+            "parse_s": round(parse_s, 4),
+            "bytes": nbytes,
+            "series": series,
+            "ok": ok,
+        }
+        with self._lock:
+            self.queries.append(entry)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a generator phase. Phases are sequential; queries issued
+        inside one (from any thread) are tagged with its name."""
+        self._phase = name
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        rss0 = current_rss_mb()
+        n_queries = len(self.queries)
+        try:
+            yield
+        finally:
+            entry = {
+                "name": name,
+                "wall_s": round(time.perf_counter() - wall0, 3),
+                "cpu_s": round(time.process_time() - cpu0, 3),
+                "queries": len(self.queries) - n_queries,
+            }
+            rss = current_rss_mb()
+            if rss is not None:
+                entry["rss_mb"] = round(rss, 1)
+                # Negative when the phase released more than it allocated.
+                entry["rss_growth_mb"] = round(rss - rss0, 1)
+            if tracing:
+                entry["py_heap_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / 1024 / 1024, 1)
+            self.phases.append(entry)
+            self._phase = ""
+
+    def query_summary(self) -> dict:
+        """Totals per endpoint plus the slowest individual queries."""
+        with self._lock:
+            queries = list(self.queries)
+        by_endpoint: dict[str, dict] = {}
+        for q in queries:
+            agg = by_endpoint.setdefault(q["endpoint"], {
+                "count": 0, "failed": 0, "fetch_s": 0.0, "parse_s": 0.0, "bytes": 0, "series": 0,
+            })
+            agg["count"] += 1
+            agg["failed"] += 0 if q["ok"] else 1
+            agg["fetch_s"] += q["fetch_s"]
+            agg["parse_s"] += q["parse_s"]
+            agg["bytes"] += q["bytes"]
+            agg["series"] += q["series"]
+        for agg in by_endpoint.values():
+            agg["fetch_s"] = round(agg["fetch_s"], 3)
+            agg["parse_s"] = round(agg["parse_s"], 3)
+        slowest = sorted(queries, key=lambda q: q["fetch_s"] + q["parse_s"], reverse=True)
+        return {
+            "count": len(queries),
+            "failed": sum(1 for q in queries if not q["ok"]),
+            "by_endpoint": by_endpoint,
+            "slowest": slowest[:_SLOWEST_QUERIES],
+        }
+
+    def to_dict(self, include_queries: bool = True) -> dict:
+        out = {
+            "total_wall_s": round(time.perf_counter() - self._start, 3),
+            "total_cpu_s": round(time.process_time(), 3),
+            "peak_rss_mb": peak_rss_mb(),
+            "phases": list(self.phases),
+            "query_summary": self.query_summary(),
+        }
+        if include_queries:
+            with self._lock:
+                out["queries"] = list(self.queries)
+        return out
+
+    def print_summary(self):
+        """One line per phase, for the console log."""
+        print("Generator phases (wall / cpu / queries):")
+        for p in self.phases:
+            print(f"  {p['name']:<24} {p['wall_s']:>8.2f}s {p['cpu_s']:>8.2f}s {p['queries']:>6}")
+        s = self.query_summary()
+        fetch = sum(a["fetch_s"] for a in s["by_endpoint"].values())
+        parse = sum(a["parse_s"] for a in s["by_endpoint"].values())
+        mb = sum(a["bytes"] for a in s["by_endpoint"].values()) / 1024 / 1024
+        print(f"  {s['count']} queries ({s['failed']} failed): {fetch:.1f}s fetch, "
+              f"{parse:.1f}s JSON parse, {mb:.1f} MB received")
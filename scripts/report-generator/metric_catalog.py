@@ -0,0 +1,264 @@
+"""
+Declarative metric catalog (metric_catalog.yaml) and the planner that
+fetches each catalog metric once per report and derives every view of it
+locally.
+
+The same cAdvisor and node_exporter counters used to be queried three
+times with near-identical PromQL: per pod/node for the charts, summed over
+the DB tier for the per-interval table, and per pod+container (or per
+node) for the Metrics Explorer dump. Here each metric is one query_range,
+summed by the union of the labels its views filter or group on, and the
+views are label filters plus sum/avg/max over that shared result. Sums
+and maxes of irate() commute with grouping, so the derived series equal
+what the separate queries returned.
+
+Used by generate_report.py:
+
+    plan = MetricPlan(load_catalog(), {"namespace": ..., "client": ...,
+                                       "node_filter": ..., "tserver_node_filter": ...})
+    for name, query, step in plan.fetches("cadvisor"):
+        plan.add(name, prometheus.query_range_raw(query, start, end, step))
+    plan.charts("cadvisor")     # [(key, title, [(labels, timestamps, values)])]
+    plan.intervals()            # {key: {ts: value}} for the interval table
+    plan.dump(name)             # Explorer rows of a fetched name
+"""
+
+import math
+import operator
+import re
+import sys
+from pathlib import Path
+from string import Template
+from typing import Optional
+
+try:
+    import yaml
+except ImportError:
+    print("Error: PyYAML is required. Install with: pip install PyYAML")
+    sys.exit(1)
+
+DEFAULT_CATALOG = Path(__file__).parent / "metric_catalog.yaml"
+
+_MATCHER = re.compile(r'\s*([a-zA-Z_]\w*)\s*(=~|!~|!=|=)\s*"((?:[^"\\]|\\.)*)"\s*')
+
+_AGG = {
+    "sum": sum,
+    "avg": lambda vs: sum(vs) / len(vs),
+    "max": max,
+}
+
+
+def parse_matchers(text: str) -> list[tuple[str, str, str]]:
+    """PromQL label matchers ('a="x",b=~"y.*"') as (label, op, value)
+    triples. An empty string has none and matches every series."""
+    matchers = []
+    pos = 0
+    while pos < len(text):
+        if text[pos] in ", ":
+            pos += 1
+            continue
+        m = _MATCHER.match(text, pos)
+        if not m:
+            raise ValueError(f"Bad label matcher at {text[pos:]!r} in {text!r}")
+        matchers.append((m.group(1), m.group(2), m.group(3)))
+        pos = m.end()
+    return matchers
+
+
+def format_matchers(matchers: list[tuple[str, str, str]]) -> str:
+    return ",".join(f'{label}{op}"{value}"' for label, op, value in matchers)
+
+
+def _matches(labels: dict, matchers: list[tuple[str, str, str]]) -> bool:
+    """PromQL semantics: a missing label is the empty string; regexes are anchored."""
+    for label, op, value in matchers:
+        v = labels.get(label, "")
+        if op == "=":
+            ok = v == value
+        elif op == "!=":
+            ok = v != value
+        elif op == "=~":
+            ok = re.fullmatch(value, v) is not None
+        else:
+            ok = re.fullmatch(value, v) is None
+        if not ok:
+            return False
+    return True
+
+
+def load_catalog(path: Path = DEFAULT_CATALOG) -> dict:
+    """Parse and check the catalog: every metric names a known source and
+    type, every view a known role and aggregation."""
+    with open(path) as f:
+        catalog = yaml.safe_load(f)
+    sources, roles = catalog["sources"], catalog["roles"]
+    for name, metric in catalog["metrics"].items():
+        if metric.get("source") not in sources:
+            raise ValueError(f"{path}: {name}: unknown source {metric.get('source')!r}")
+        if metric.get("type") not in ("counter", "gauge"):
+            raise ValueError(f"{path}: {name}: type must be counter or gauge")
+        for view in metric.get("views", []):
+            if ("chart" in view) == ("interval" in view):
+                raise ValueError(f"{path}: {name}: each view is either a chart or an interval")
+            if "chart" in view and "title" not in view:
+                raise ValueError(f"{path}: {name}: chart {view['chart']} needs a title")
+            for role in view.get("roles", []):
+                if role not in roles:
+                    raise ValueError(f"{path}: {name}: unknown role {role!r}")
+            for key in ("agg", "across"):
+                if key in view and view[key] not in _AGG:
+                    raise ValueError(f"{path}: {name}: {key} must be one of {', '.join(_AGG)}")
+            for key in ("minus", "over"):
+                other = view.get(key, {}).get("metric")
+                if other and other not in catalog["metrics"]:
+                    raise ValueError(f"{path}: {name}: {key} refers to unknown metric {other!r}")
+    return catalog
+
+
+class MetricPlan:
+    """One report's catalog: placeholders filled from params, fetched rows
+    (query_range_raw results) kept per metric name."""
+
+    def __init__(self, catalog: dict, params: dict[str, str]):
+        self.catalog = catalog
+        self.params = dict(params)
+        self.rows: dict[str, list[dict]] = {}
+
+    def _fill(self, text: str) -> str:
+        return Template(text).substitute(self.params)
+
+    def source(self, name: str) -> dict:
+        return self.catalog["sources"][name]
+
+    def _fetch_by(self, name: str) -> list[str]:
+        metric = self.catalog["metrics"][name]
+        return self.source(metric["source"])["by"] + metric.get("by", [])
+
+    def query(self, name: str, by: Optional[list[str]] = None, match: str = "") -> str:
+        """PromQL for a catalog metric: its source's selector plus `match`,
+        irate() over the source's window for counters, summed by `by`
+        (default: the fetch grouping)."""
+        metric = self.catalog["metrics"][name]
+        src = self.source(metric["source"])
+        matchers = parse_matchers(self._fill(src["match"])) + parse_matchers(self._fill(match))
+        selector = f"{name}{{{format_matchers(matchers)}}}"
+        if metric["type"] == "counter":
+            selector = f"irate({selector}[{src['window']}])"
+        return f"sum by ({', '.join(by or self._fetch_by(name))}) ({selector})"
+
+    def fetches(self, source: str) -> list[tuple[str, str, int]]:
+        """(name, PromQL, step) for every catalog metric of source."""
+        step = self.source(source)["step"]
+        return [(name, self.query(name), step)
+                for name, metric in self.catalog["metrics"].items() if metric["source"] == source]
+
+    def add(self, name: str, rows: list[dict]):
+        self.rows[name] = rows
+
+    def _select(self, name: str, filters: list[list[tuple]], by: list[str],
+                agg: str) -> dict[tuple, dict[float, float]]:
+        """Fetched rows of name matching any of filters, grouped by `by`,
+        aggregated per timestamp: {group label values: {ts: value}}."""
+        fetch_by = set(self._fetch_by(name))
+        for label in {m[0] for f in filters for m in f} | set(by):
+            if label not in fetch_by:
+                raise ValueError(f"{name}: label {label!r} is not in the fetch grouping "
+                                 f"({', '.join(sorted(fetch_by))}); add it to `by` in the catalog")
+        groups: dict[tuple, dict[float, list[float]]] = {}
+        for r in self.rows.get(name, []):
+            labels = r.get("metric", {})
+            if not any(_matches(labels, f) for f in filters):
+                continue
+            points = groups.setdefault(tuple(labels.get(label, "") for label in by), {})
+            for ts, v in r.get("values", []):
+                v = float(v)
+                if not math.isnan(v):
+                    points.setdefault(float(ts), []).append(v)
+        fn = _AGG[agg]
+        return {key: {ts: fn(vs) for ts, vs in pts.items()} for key, pts in groups.items()}
+
+    def _view(self, name: str, view: dict, by: list[str]) -> dict[tuple, dict[float, float]]:
+        """Evaluate one view (see the catalog header) grouped by `by`."""
+        roles = [parse_matchers(self._fill(self.catalog["roles"][r])) for r in view.get("roles", [])]
+        agg = view.get("agg", "sum")
+
+        def side(spec: dict):
+            match = parse_matchers(self._fill(spec.get("match", "")))
+            filters = [role + match for role in roles] or [match]
+            return self._select(spec.get("metric", name), filters, by, agg)
+
+        out = side(view)
+        for key, op in (("minus", operator.sub), ("over", operator.truediv)):
+            if key not in view:
+                continue
+            other = side(view[key])
+            out = {
+                g: {ts: op(v, other[g][ts]) for ts, v in pts.items()
+                    if ts in other.get(g, {}) and (key == "minus" or other[g][ts])}
+                for g, pts in out.items()
+            }
+        if "across" in view:
+            collapsed: dict[float, list[float]] = {}
+            for pts in out.values():
+                for ts, v in pts.items():
+                    collapsed.setdefault(ts, []).append(v)
+            fn = _AGG[view["across"]]
+            out = {(): {ts: fn(vs) for ts, vs in collapsed.items()}} if collapsed else {}
+        scale = view.get("multiply", 1) / view.get("divide", 1)
+        if scale != 1:
+            out = {g: {ts: v * scale for ts, v in pts.items()} for g, pts in out.items()}
+        return out
+
+    def _views(self, kind: str, source: Optional[str] = None):
+        for name, metric in self.catalog["metrics"].items():
+            if source and metric["source"] != source:
+                continue
+            for view in metric.get("views", []):
+                if kind in view:
+                    yield name, metric, view
+
+    def charts(self, source: str) -> list[tuple[str, str, list[tuple[dict, list[float], list[float]]]]]:
+        """(key, title, series) for each chart view of source; series are
+        (labels, timestamps, values), one per group."""
+        charts = []
+        for name, _, view in self._views("chart", source):
+            by = view.get("by", self.source(source)["chart_by"])
+            series = []
+            for key, pts in sorted(self._view(name, view, by).items()):
+                ts = sorted(pts)
+                series.append((dict(zip(by, key)), ts, [pts[t] for t in ts]))
+            charts.append((view["chart"], view["title"], series))
+        return charts
+
+    def intervals(self) -> dict[str, dict[int, float]]:
+        """{key: {ts: value}} for every interval view; {} where the metric
+        was not fetched (e.g. cAdvisor in VM mode)."""
+        out = {}
+        for name, metric, view in self._views("interval"):
+            if name not in self.rows:
+                out[view["interval"]] = {}
+                continue
+            default_by = self.source(metric["source"])["chart_by"] if "across" in view else []
+            groups = self._view(name, view, view.get("by", default_by))
+            pts = groups.get((), {}) if len(groups) <= 1 else {}
+            out[view["interval"]] = {int(ts): v for ts, v in pts.items()}
+        return out
+
+    def dump_query(self, name: str) -> str:
+        """PromQL equivalent of the Explorer series dump() derives for name."""
+        src = self.source(self.catalog["metrics"][name]["source"])
+        return self.query(name, src["dump_by"], src.get("dump_match", ""))
+
+    def dump(self, name: str) -> Optional[list[dict]]:
+        """Explorer rows (query_range_raw format, __name__ set) of a fetched
+        catalog metric, summed by its source's dump_by; None if not fetched."""
+        if name not in self.rows:
+            return None
+        src = self.source(self.catalog["metrics"][name]["source"])
+        by = src["dump_by"]
+        groups = self._select(name, [parse_matchers(self._fill(src.get("dump_match", "")))], by, "sum")
+        return [
+            {"metric": {"__name__": name, **dict(zip(by, key))},
+             "values": [[int(ts) if ts.is_integer() else ts, repr(pts[ts])] for ts in sorted(pts)]}
+            for key, pts in sorted(groups.items())
+        ]
@@ -1,7 +1,7 @@
 #!/bin/bash
 set -eo pipefail
 
-# Report generation script for benchmark stress tests (sysbench or k6)
+# Report generation script for benchmark stress tests (sysbench, pyload, k6 or cdc)
 # Auto-detects workload type from timestamps file and generates HTML report
 # Supports both k8s and vm-virsh deployment modes.
 
@@ -18,6 +18,10 @@ fi
 OUTPUT_DIR="${OUTPUT_DIR:-${PROJECT_ROOT}/reports}"
 RELEASE_NAME="${RELEASE_NAME:-yb-benchmark}"
 METRICS_DUMP_BASE_URL="${METRICS_DUMP_BASE_URL:-}"
+DUMP_MAX_SERIES="${DUMP_MAX_SERIES:-0}"
+DUMP_MAX_MB="${DUMP_MAX_MB:-0}"
+REPORT_PROFILE="${REPORT_PROFILE:-}"
+REPORT_RECORD="${REPORT_RECORD:-}"
 
 KUBE_CONTEXT="${KUBE_CONTEXT:?KUBE_CONTEXT must be set}"
 NAMESPACE="${NAMESPACE:?NAMESPACE must be set}"
@@ -48,7 +52,7 @@ TIMES_FILE="${PROJECT_ROOT}/output/test_times.txt"
 
 if [[ ! -f "$TIMES_FILE" ]]; then
     echo "Error: timestamp file not found: $TIMES_FILE"
-    echo "Run 'make sysbench-run' or 'make k6-run' first."
+    echo "Run 'make sysbench-run', 'make pyload-run', 'make k6-run' or 'make cdc-test' first."
     exit 1
 fi
 
@@ -70,6 +74,12 @@ fi
 if [[ "$WORKLOAD_TYPE" == "k6" ]]; then
     REPORT_TITLE="k6 Stress Test Report"
     POD_PATTERNS=("yb-tserver.*" "yb-master.*" "k6.*")
+elif [[ "$WORKLOAD_TYPE" == "cdc" ]]; then
+    REPORT_TITLE="CDC Replication Test Report"
+    POD_PATTERNS=("yb-tserver.*" "yb-master.*" "cdc-.*")
+elif [[ "$WORKLOAD_TYPE" == "pyload" ]]; then
+    REPORT_TITLE="pyload Stress Test Report"
+    POD_PATTERNS=("yb-tserver.*" "yb-master.*" ".*pyload.*")
 else
     REPORT_TITLE="Sysbench Stress Test Report"
     POD_PATTERNS=("yb-tserver.*" "yb-master.*" "sysbench.*")
@@ -96,6 +106,8 @@ PYTHON_ARGS=(
     --pods "${POD_PATTERNS[@]}"
     --workload-type "$WORKLOAD_TYPE"
     --metrics-dump-base-url "$METRICS_DUMP_BASE_URL"
+    --dump-max-series "$DUMP_MAX_SERIES"
+    --dump-max-mb "$DUMP_MAX_MB"
 )
 if [[ "$REPORT_MODE" == "k8s" ]]; then
     PYTHON_ARGS+=(
@@ -107,6 +119,12 @@ fi
 if [[ -n "$WARMUP_END_TIME" ]]; then
     PYTHON_ARGS+=(--warmup-end "$WARMUP_END_TIME")
 fi
+if [[ -n "$REPORT_PROFILE" ]]; then
+    PYTHON_ARGS+=(--profile)
+fi
+if [[ -n "$REPORT_RECORD" ]]; then
+    PYTHON_ARGS+=(--record)
+fi
 REPORT_LOG=$(mktemp)
 trap 'rm -f "$REPORT_LOG"' EXIT
 python3 "${SCRIPT_DIR}/generate_report.py" "${PYTHON_ARGS[@]}" 2>&1 | tee "$REPORT_LOG"
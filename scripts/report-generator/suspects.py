@@ -0,0 +1,243 @@
+"""
+Bottleneck suspects: dumped metrics that move with throughput drops and
+latency spikes.
+
+Every series of the metrics dump is resampled onto the workload's
+interval grid (mean of its samples in each interval, else the last sample
+before it) and compared with the post-warmup TPS and p95 series. Each
+series is standardized once, both as ranks (Spearman: any monotone
+relation, robust to outliers) and as values (Pearson: short dips and
+spikes, which barely move ranks), so a correlation at any lag is a
+normalized dot product of two prepared vectors over their overlap:
+
+    rho(lag) = cos(zm[i - lag], zy[i])     (lag > 0: the metric leads)
+
+The score of a series is the largest of -rho with TPS and +rho with p95,
+over both methods and lags within +/- max_lag intervals: a suspect rises
+when throughput drops or latency climbs. Metrics that merely follow
+throughput (operation counters, RPC rates) correlate positively with TPS
+and score low by design. Scores below 4.5/sqrt(n) (n intervals) are
+dropped: the best chance correlation among thousands of series, lags and
+both methods reaches about 4/sqrt(n).
+
+rank_suspects() keeps the best-scoring series per metric name, so each
+suspect maps to one Explorer card. Used by generate_report.py (results
+summary, report panel, summary.txt) and on its own against a saved report:
+
+    python3 suspects.py reports/<run>        # reads results.json + metrics_dump.*
+"""
+
+import json
+import math
+import operator
+import sys
+from pathlib import Path
+from typing import Optional
+
+import tscodec
+
+# Fewer aligned intervals than this make rank correlation meaningless.
+MIN_POINTS = 8
+
+
+def _ranks(values: list[float]) -> list[float]:
+    """Average ranks (ties share the mean of their positions)."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        r = (i + j) / 2.0
+        for k in range(i, j + 1):
+            ranks[order[k]] = r
+        i = j + 1
+    return ranks
+
+
+def _standardize(values: list[float]) -> Optional[list[float]]:
+    """Zero mean, unit variance; None for a series without variation."""
+    n = len(values)
+    mean = sum(values) / n
+    sd = math.sqrt(sum((v - mean) ** 2 for v in values) / n)
+    if sd == 0:
+        return None
+    return [(v - mean) / sd for v in values]
+
+
+def _zscores(values: list[float]) -> Optional[dict]:
+    """{"rank": standardized ranks, "linear": standardized values}, or None
+    for a series without variation."""
+    linear = _standardize(values)
+    if linear is None:
+        return None
+    return {"rank": _standardize(_ranks(values)), "linear": linear}
+
+
+def _lagged_rho(zm: list[float], zy: list[float], max_lag: int) -> tuple[float, int]:
+    """(rho, lag) with the largest rho over lags -max_lag..max_lag."""
+    n = len(zy)
+    best = (-2.0, 0)
+    for lag in range(-max_lag, max_lag + 1):
+        if lag >= 0:
+            a, b = zm[:n - lag], zy[lag:]
+        else:
+            a, b = zm[-lag:], zy[:n + lag]
+        if len(a) < MIN_POINTS:
+            continue
+        norm = math.sqrt(sum(map(operator.mul, a, a)) * sum(map(operator.mul, b, b)))
+        if norm == 0:
+            continue
+        rho = sum(map(operator.mul, a, b)) / norm
+        if rho > best[0]:
+            best = (rho, lag)
+    return best
+
+
+def resample(values: list, ends: list[float], width: float) -> Optional[list[float]]:
+    """Series values on an interval grid: mean of the samples in
+    (end - width, end], else the last sample before the interval. None if
+    any interval has no sample at or before it."""
+    points = sorted((float(t), float(v)) for t, v in values)
+    out = []
+    i = 0
+    last = None
+    for end in ends:
+        total = count = 0
+        while i < len(points) and points[i][0] <= end:
+            t, v = points[i]
+            if t > end - width and math.isfinite(v):
+                total += v
+                count += 1
+            if math.isfinite(v):
+                last = v
+            i += 1
+        if count:
+            out.append(total / count)
+        elif last is not None:
+            out.append(last)
+        else:
+            return None
+    return out
+
+
+def series_label(metric: dict) -> str:
+    labels = {k: v for k, v in metric.items() if k != "__name__"}
+    return ",".join(f"{k}={v}" for k, v in sorted(labels.items()))
+
+
+def rank_suspects(dump: list[dict], intervals: list[dict], start_epoch: float,
+                  warmup_s: float = 0, top_k: int = 15, max_lag: int = 3,
+                  min_score: Optional[float] = None) -> list[dict]:
+    """Top-k metric names by suspect score (see module docstring).
+
+    intervals are the report's workload intervals (`time` = seconds since
+    start_epoch at the end of the interval, `tps`, `lat_95`); only those
+    after warmup are used. Each suspect carries its best series (labels),
+    rho with TPS and p95 at their best lags (seconds, positive = the metric
+    leads), the method that scored and how many series of that metric
+    scored at least min_score (default 4.5/sqrt(n)).
+    """
+    rows = [iv for iv in intervals if iv.get("time", 0) > warmup_s and iv.get("tps") is not None]
+    if len(rows) < MIN_POINTS:
+        return []
+    width = rows[1]["time"] - rows[0]["time"]
+    if width <= 0:
+        return []
+    ends = [start_epoch + iv["time"] for iv in rows]
+    if min_score is None:
+        min_score = 4.5 / math.sqrt(len(rows))
+    targets = {"tps": _zscores([float(iv["tps"]) for iv in rows])}
+    lat = [iv.get("lat_95") for iv in rows]
+    if all(v is not None for v in lat):
+        targets["lat_95"] = _zscores([float(v) for v in lat])
+
+    best_by_name: dict[str, dict] = {}
+    hits: dict[str, int] = {}
+    for s in dump:
+        if s.get("constant"):
+            continue
+        name = s.get("metric", {}).get("__name__", "")
+        values = resample(s.get("values", []), ends, width)
+        zm = _zscores(values) if values else None
+        if zm is None:
+            continue
+        # rho[target] = (rho, lag, method), best over both methods.
+        rho = {}
+        for key, zy in targets.items():
+            if zy is None:
+                continue
+            for method in ("rank", "linear"):
+                y = [-z for z in zy[method]] if key == "tps" else zy[method]
+                r, lag = _lagged_rho(zm[method], y, max_lag)
+                if key not in rho or r > rho[key][0]:
+                    rho[key] = (r, lag, method)
+        if not rho:
+            continue
+        key, (score, lag, method) = max(rho.items(), key=lambda kv: kv[1][0])
+        if score < min_score:
+            continue
+        hits[name] = hits.get(name, 0) + 1
+        if name in best_by_name and best_by_name[name]["score"] >= score:
+            continue
+        best_by_name[name] = {
+            "name": name,
+            "series": series_label(s.get("metric", {})),
+            "score": round(score, 3),
+            "driver": "TPS drop" if key == "tps" else "p95 spike",
+            "method": method,
+            "lag_s": lag * width,
+            # Signed rho: negative with TPS and positive with p95 are suspect.
+            "rho_tps": round(-rho["tps"][0], 3) if "tps" in rho else None,
+            "rho_lat": round(rho["lat_95"][0], 3) if "lat_95" in rho else None,
+        }
+    ranked = sorted(best_by_name.values(), key=lambda x: -x["score"])[:top_k]
+    for sus in ranked:
+        sus["series_hits"] = hits[sus["name"]]
+    return ranked
+
+
+def format_suspects(suspects: list[dict]) -> str:
+    def rho(v):
+        return "-" if v is None else f"{v:+.2f}"
+
+    lines = [f"  {'#':>2}  {'score':>5}  {'driver':<9}  {'method':<6}  {'rho TPS':>7}  {'rho p95':>7}  "
+             f"{'lead':>6}  metric"]
+    for i, s in enumerate(suspects, 1):
+        series = f" {{{s['series']}}}" if s["series"] else ""
+        hits = f" ({s['series_hits']} series)" if s["series_hits"] > 1 else ""
+        lines.append(f"  {i:>2}  {s['score']:5.2f}  {s['driver']:<9}  {s['method']:<6}  {rho(s['rho_tps']):>7}  "
+                     f"{rho(s['rho_lat']):>7}  {s['lag_s']:>+5.0f}s  {s['name']}{series}{hits}")
+    return "\n".join(lines)
+
+
+def load_report(report_dir: Path) -> tuple[list[dict], float, float, Optional[list[dict]]]:
+    """(intervals, start_epoch, warmup_s, dump) of a saved report: the
+    results.json interval columns as rows, and the metrics dump (None if
+    the report has none)."""
+    results = json.loads((report_dir / "results.json").read_text())
+    dump_file = next((p for p in (report_dir / "metrics_dump.tsz.gz", report_dir / "metrics_dump.json.gz")
+                      if p.exists()), None)
+    cols = results.get("intervals", {})
+    intervals = [dict(zip(cols, row)) for row in zip(*cols.values())]
+    warmup = results.get("warmup_end_epoch")
+    return (intervals, results["start_epoch"], warmup - results["start_epoch"] if warmup else 0,
+            tscodec.load_dump(dump_file) if dump_file else None)
+
+
+def main():
+    if len(sys.argv) != 2:
+        print("Usage: suspects.py <report dir>", file=sys.stderr)
+        sys.exit(1)
+    report_dir = Path(sys.argv[1])
+    intervals, start_epoch, warmup_s, dump = load_report(report_dir)
+    if dump is None:
+        print(f"No metrics dump in {report_dir}", file=sys.stderr)
+        sys.exit(1)
+    suspects = rank_suspects(dump, intervals, start_epoch, warmup_s)
+    print(format_suspects(suspects) if suspects else "No suspects (too few intervals or no correlated series)")
+
+
+if __name__ == "__main__":
+    main()
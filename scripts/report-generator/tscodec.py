@@ -0,0 +1,253 @@
+"""
+Gorilla-style compression for metric time series.
+
+Timestamps are stored as delta-of-delta in milliseconds and values as the
+XOR of consecutive float64 bit patterns (Pelkonen et al., "Gorilla: A Fast,
+Scalable, In-Memory Time Series Database", VLDB 2015). On a fixed query step
+nearly every timestamp costs one bit, and flat or slowly-changing values
+cost one bit or a short XOR window.
+
+Two containers are built on the same per-series bit stream:
+
+- encode_dump() / decode_dump(): the metrics dump file. Layout is the
+  4-byte magic "TSZ1", a big-endian u32 header length, a JSON header
+  (one {"metric", "n", "len"} entry per series), then the per-series
+  blobs back to back. The file is gzipped on top, so labels in the header
+  still compress well.
+- encode_series_fields(): replaces timestamps/values arrays inside the
+  report's inline chart JSON with a base64 blob.
+
+report_template.html carries the matching JavaScript decoder
+(tszDecodePoints and friends) — keep the two in sync.
+"""
+
+import base64
+import gzip
+import json
+import struct
+from pathlib import Path
+
+MAGIC = b"TSZ1"
+
+
+class _BitWriter:
+    """Append-only MSB-first bit stream."""
+
+    def __init__(self):
+        self._out = bytearray()
+        self._acc = 0
+        self._nbits = 0
+
+    def write(self, value: int, nbits: int):
+        self._acc = (self._acc << nbits) | (value & ((1 << nbits) - 1))
+        self._nbits += nbits
+        while self._nbits >= 8:
+            self._nbits -= 8
+            self._out.append((self._acc >> self._nbits) & 0xFF)
+        self._acc &= (1 << self._nbits) - 1
+
+    def getvalue(self) -> bytes:
+        if self._nbits:
+            return bytes(self._out) + bytes([(self._acc << (8 - self._nbits)) & 0xFF])
+        return bytes(self._out)
+
+
+class _BitReader:
+    """MSB-first reader over a byte buffer, starting at a byte offset."""
+
+    def __init__(self, data: bytes, offset: int = 0):
+        self._data = data
+        self._pos = offset * 8
+
+    def read(self, nbits: int) -> int:
+        start = self._pos >> 3
+        end = (self._pos + nbits + 7) >> 3
+        chunk = int.from_bytes(self._data[start:end], "big")
+        shift = (end - start) * 8 - (self._pos & 7) - nbits
+        self._pos += nbits
+        return (chunk >> shift) & ((1 << nbits) - 1)
+
+
+def _zigzag(n: int) -> int:
+    return n << 1 if n >= 0 else ((-n) << 1) - 1
+
+
+def _unzigzag(z: int) -> int:
+    return -((z + 1) >> 1) if z & 1 else z >> 1
+
+
+def _float_bits(v: float) -> int:
+    return struct.unpack(">Q", struct.pack(">d", v))[0]
+
+
+def _bits_float(b: int) -> float:
+    return struct.unpack(">d", struct.pack(">Q", b))[0]
+
+
+def encode_points(timestamps_ms: list[int], values: list[float]) -> bytes:
+    """Encode one series: all timestamps first, then all values."""
+    n = len(timestamps_ms)
+    if n == 0:
+        return b""
+    w = _BitWriter()
+
+    # Timestamps: first raw, first delta zigzagged, then delta-of-delta buckets.
+    w.write(timestamps_ms[0], 64)
+    if n > 1:
+        prev_delta = timestamps_ms[1] - timestamps_ms[0]
+        w.write(_zigzag(prev_delta), 32)
+        for i in range(2, n):
+            delta = timestamps_ms[i] - timestamps_ms[i - 1]
+            dod = delta - prev_delta
+            prev_delta = delta
+            if dod == 0:
+                w.write(0, 1)
+            elif -63 <= dod <= 64:
+                w.write(0b10, 2)
+                w.write(dod + 63, 7)
+            elif -255 <= dod <= 256:
+                w.write(0b110, 3)
+                w.write(dod + 255, 9)
+            elif -2047 <= dod <= 2048:
+                w.write(0b1110, 4)
+                w.write(dod + 2047, 12)
+            else:
+                w.write(0b1111, 4)
+                w.write(_zigzag(dod), 32)
+
+    # Values: first raw, then XOR against the previous value. A control
+    # bit pair either reuses the previous leading/trailing-zero window or
+    # opens a new one (5 bits leading, 6 bits significant length; 0 = 64).
+    prev = _float_bits(values[0])
+    w.write(prev, 64)
+    prev_lead = prev_trail = -1
+    for v in values[1:]:
+        cur = _float_bits(v)
+        x = cur ^ prev
+        prev = cur
+        if x == 0:
+            w.write(0, 1)
+            continue
+        lead = min(64 - x.bit_length(), 31)
+        trail = (x & -x).bit_length() - 1
+        if prev_lead >= 0 and lead >= prev_lead and trail >= prev_trail:
+            w.write(0b10, 2)
+            w.write(x >> prev_trail, 64 - prev_lead - prev_trail)
+        else:
+            sig = 64 - lead - trail
+            w.write(0b11, 2)
+            w.write(lead, 5)
+            w.write(sig & 63, 6)
+            w.write(x >> trail, sig)
+            prev_lead, prev_trail = lead, trail
+    return w.getvalue()
+
+
+def decode_points(data: bytes, n: int, offset: int = 0) -> tuple[list[int], list[float]]:
+    """Inverse of encode_points(). Returns (timestamps_ms, values)."""
+    if n == 0:
+        return [], []
+    r = _BitReader(data, offset)
+
+    timestamps = [r.read(64)]
+    if n > 1:
+        delta = _unzigzag(r.read(32))
+        timestamps.append(timestamps[0] + delta)
+        for _ in range(2, n):
+            if r.read(1) == 0:
+                dod = 0
+            elif r.read(1) == 0:
+                dod = r.read(7) - 63
+            elif r.read(1) == 0:
+                dod = r.read(9) - 255
+            elif r.read(1) == 0:
+                dod = r.read(12) - 2047
+            else:
+                dod = _unzigzag(r.read(32))
+            delta += dod
+            timestamps.append(timestamps[-1] + delta)
+
+    prev = r.read(64)
+    values = [_bits_float(prev)]
+    lead = trail = 0
+    for _ in range(1, n):
+        if r.read(1) == 0:
+            values.append(values[-1])
+            continue
+        if r.read(1) == 1:
+            lead = r.read(5)
+            sig = r.read(6) or 64
+            trail = 64 - lead - sig
+        prev ^= r.read(64 - lead - trail) << trail
+        values.append(_bits_float(prev))
+    return timestamps, values
+
+
+def encode_dump(dump: list[dict]) -> bytes:
+    """Encode a metrics dump (list of {metric, values: [[ts, "v"], ...]})."""
+    header = []
+    blobs = []
+    for s in dump:
+        pairs = s.get("values", [])
+        blob = encode_points(
+            [round(float(p[0]) * 1000) for p in pairs],
+            [float(p[1]) for p in pairs],
+        )
+        entry = {"metric": s.get("metric", {}), "n": len(pairs), "len": len(blob)}
+        if s.get("constant"):
+            entry["constant"] = True
+        header.append(entry)
+        blobs.append(blob)
+    head = json.dumps(header, separators=(",", ":")).encode()
+    return MAGIC + struct.pack(">I", len(head)) + head + b"".join(blobs)
+
+
+def decode_dump(data: bytes) -> list[dict]:
+    """Inverse of encode_dump(). Values come back as [ts_seconds, float]."""
+    if data[:4] != MAGIC:
+        raise ValueError("not a TSZ1 metrics dump")
+    (head_len,) = struct.unpack(">I", data[4:8])
+    offset = 8 + head_len
+    dump = []
+    for entry in json.loads(data[8:offset]):
+        ts, vals = decode_points(data, entry["n"], offset)
+        offset += entry["len"]
+        s = {"metric": entry["metric"], "values": [[t / 1000, v] for t, v in zip(ts, vals)]}
+        if entry.get("constant"):
+            s["constant"] = True
+        dump.append(s)
+    return dump
+
+
+def load_dump(path: Path) -> list[dict]:
+    """Read a metrics dump in either format (TSZ1 or legacy JSON), gzipped or not."""
+    raw = Path(path).read_bytes()
+    if raw[:2] == b"\x1f\x8b":
+        raw = gzip.decompress(raw)
+    if raw[:4] == MAGIC:
+        return decode_dump(raw)
+    return json.loads(raw)
+
+
+def encode_series_fields(obj):
+    """Return a copy of `obj` with every {timestamps, values} pair replaced
+    by {"tsz": base64 blob, "n": count}.
+
+    Used for the report's inline chart data (metricsData, byPod, byNode);
+    tszDecodeSeriesFields() in the template restores the arrays.
+    """
+    if isinstance(obj, list):
+        return [encode_series_fields(v) for v in obj]
+    if not isinstance(obj, dict):
+        return obj
+    ts = obj.get("timestamps")
+    vals = obj.get("values")
+    if not (isinstance(ts, list) and isinstance(vals, list) and len(ts) == len(vals)):
+        return {k: encode_series_fields(v) for k, v in obj.items()}
+
+    out = {k: encode_series_fields(v) for k, v in obj.items()
+           if k not in ("timestamps", "values")}
+    blob = encode_points([round(t * 1000) for t in ts], [float(v) for v in vals])
+    out["tsz"] = base64.b64encode(blob).decode("ascii")
+    out["n"] = len(ts)
+    return out
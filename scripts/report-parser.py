@@ -6,6 +6,8 @@ import os
 import re
 import sys
 
+import sysbench_parser
+
 
 def parse_node_spec(report_path):
     """Parse RUN_NODE_SPEC.txt for tserver pod to node mapping with resources"""
@@ -53,7 +55,7 @@ def read_times(report_path):
 
 def parse_workload_spec(report_path, workload_type="sysbench"):
     """Print workload client pod-to-node mapping."""
-    label = "k6 Clients" if workload_type == "k6" else "Sysbench Clients"
+    label = {"k6": "k6 Clients", "pyload": "pyload Clients"}.get(workload_type, "Sysbench Clients")
     spec_path = os.path.join(report_path, 'CLIENT_NODE_SPEC.txt')
 
     if not os.path.exists(spec_path):
@@ -74,15 +76,26 @@ def parse_workload_spec(report_path, workload_type="sysbench"):
             print(f"  {parts[0]} -> {parts[1]}")
 
 
-INTERVAL_RE = re.compile(
-    r'\[\s*(\d+)s\s*\]\s*thds:\s*\d+\s*tps:\s*([\d.]+)\s*qps:\s*[\d.]+\s*'
-    r'\(r/w/o:\s*[\d.]+/[\d.]+/[\d.]+\)\s*lat\s*\(ms,95%\):\s*([\d.]+)\s*'
-    r'err/s:\s*([\d.]+)'
-)
+def read_results(report_path):
+    """Load results.json written by generate_report.py, or None for older reports."""
+    path = os.path.join(report_path, 'results.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
 
+def from_columns(columns):
+    """{column: values} -> list of row dicts."""
+    keys = list(columns)
+    return [dict(zip(keys, values)) for values in zip(*(columns[k] for k in keys))]
 
-def read_intervals(report_path):
-    """Extract the embedded sysbenchIntervals JSON array from report.html."""
+
+def read_intervals(report_path, results=None):
+    """Enriched workload intervals, from results.json when present."""
+    if results is not None:
+        return from_columns(results.get('intervals', {}))
+    # Reports generated before results.json: scrape the embedded array.
     html_path = os.path.join(report_path, 'report.html')
     if not os.path.exists(html_path):
         return []
@@ -97,23 +110,23 @@ def read_intervals(report_path):
         return []
 
 
-def read_per_pod_intervals(report_path):
-    """Read per-pod sysbench_output_N.txt files. Returns list of {time -> {tps, lat_95, err_s}}."""
+def read_per_pod_intervals(report_path, results=None, prefix="sysbench"):
+    """Per-pod sysbench (or pyload) intervals. Returns list of {time -> {tps, lat_95, err_s}}."""
+    if results is not None:
+        return [
+            {iv['time']: {'tps': iv['tps'], 'lat_95': iv['lat_95'], 'err_s': iv['err_s']}
+             for iv in from_columns(pod['intervals'])}
+            for pod in results.get('per_pod', [])
+        ]
     pods = []
     i = 0
     while True:
-        path = os.path.join(report_path, f'sysbench_output_{i}.txt')
+        path = os.path.join(report_path, f'{prefix}_output_{i}.txt')
         if not os.path.exists(path):
             break
-        with open(path) as f:
-            text = f.read()
         by_time = {}
-        for m in INTERVAL_RE.finditer(text):
-            by_time[int(m.group(1))] = {
-                'tps': float(m.group(2)),
-                'lat_95': float(m.group(3)),
-                'err_s': float(m.group(4)),
-            }
+        for iv in sysbench_parser.iter_intervals(path):
+            by_time[iv.time] = {'tps': iv.tps, 'lat_95': iv.lat_95, 'err_s': iv.err_s}
         pods.append(by_time)
         i += 1
     return pods
@@ -168,37 +181,140 @@ def print_interval_table(intervals, warmup_len, per_pod=None, workload_name="Sys
             print(f"{t:4d}  {phase:<6}  {tps:8,.0f}  {lat:8.1f}  {err:6.2f}  {cpu_s}  {mem_s}  {net_s}  {wio_s}  {cli_s}")
 
 
-def parse_sysbench_totals(report_path):
-    """Print sysbench-reported totals from sysbench_output.txt (includes warmup)."""
-    sysbench_path = os.path.join(report_path, 'sysbench_output.txt')
+def print_sweep_table(results):
+    """Print the rate-sweep steps (sweep-run-with-timestamps.sh) from results.json."""
+    summary = (results or {}).get('summary', {})
+    sweep = summary.get('sweep')
+    if not sweep:
+        return
+    knee = summary.get('sweep_knee_step')
+
+    def ms(v):
+        return f"{v:>8.2f}" if v is not None else f"{'-':>8}"
+
+    print("\n=== Rate Sweep (achieved vs offered) ===")
+    print(f"{'Step':>4}  {'%max':>4}  {'Offered':>8}  {'Achieved':>9}  {'p50(ms)':>8}  {'p95(ms)':>8}  {'p99(ms)':>8}  {'err/s':>6}")
+    print("-" * 68)
+    for p in sweep:
+        mark = "  <- knee" if p['step'] == knee else ""
+        print(f"{p['step']:>4}  {p['load_pct']:>4}  {p['offered']:>8}  {p['achieved']:>9.1f}  "
+              f"{ms(p.get('lat_p50'))}  {ms(p.get('lat_p95'))}  {ms(p.get('lat_p99'))}  "
+              f"{p.get('err_s', 0):>6.2f}{mark}")
+    if summary.get('max_sustainable_tps') is not None:
+        print(f"Max sustainable (step before knee): {summary['max_sustainable_tps']:,.1f}/s")
+    elif knee is None:
+        print("No knee: latency and throughput held up at every step")
+
+
+def print_anomalies(results):
+    """Print the anomaly windows (report-generator/anomalies.py) from results.json."""
+    anomalies = (results or {}).get('summary', {}).get('anomalies')
+    if not anomalies:
+        return
+
+    print("\n=== Anomalies (post-warmup, robust z-score; metrics vs surrounding baseline) ===")
+    for i, an in enumerate(anomalies, 1):
+        kinds = ", ".join(f"{k} (z {z:+.1f})" for k, z in an['kinds'].items())
+        print(f"#{i}  {an['start_s']:.0f}-{an['end_s']:.0f}s  {kinds}")
+        line = f"    TPS {an['tps']:.1f} vs median {an['tps_median']:.1f}"
+        if an.get('lat_95') is not None:
+            line += f"  p95 up to {an['lat_95']:.1f}ms vs {an['lat_95_median']:.1f}"
+        if an.get('err_s'):
+            line += f"  err/s up to {an['err_s']:.2f}"
+        print(line)
+        for m in an.get('metrics', []):
+            change = f"{m['change_pct']:+.0f}%" if m.get('change_pct') is not None else "from 0"
+            series = f" {{{m['series']}}}" if m.get('series') else ""
+            print(f"    {m['z']:>+7.1f}  {change:>7}  {m['name']}{series}")
+
+
+def print_suspects(results):
+    """Print the bottleneck suspects (report-generator/suspects.py) from results.json."""
+    suspects = (results or {}).get('summary', {}).get('suspects')
+    if not suspects:
+        return
+
+    def rho(v):
+        return f"{v:>+7.2f}" if v is not None else f"{'-':>7}"
+
+    print("\n=== Bottleneck Suspects (rise with TPS drops / latency spikes) ===")
+    print(f"{'#':>2}  {'Score':>5}  {'Driver':<9}  {'Method':<6}  {'rho TPS':>7}  {'rho lat':>7}  {'Lead':>6}  Metric")
+    print("-" * 80)
+    for i, sus in enumerate(suspects, 1):
+        series = f" {{{sus['series']}}}" if sus.get('series') else ""
+        hits = f" ({sus['series_hits']} series)" if sus.get('series_hits', 1) > 1 else ""
+        print(f"{i:>2}  {sus['score']:>5.2f}  {sus['driver']:<9}  {sus['method']:<6}  {rho(sus.get('rho_tps'))}  "
+              f"{rho(sus.get('rho_lat'))}  {sus['lag_s']:>+5.0f}s  {sus['name']}{series}{hits}")
+
+
+def parse_sysbench_totals(report_path, prefix="sysbench", results=None):
+    """Print sysbench-reported totals from sysbench_output.txt (includes warmup).
+
+    pyload totals exclude warmup; with results.json, its p50/p95/p99 from
+    the exactly merged pod histograms (bucket estimates, <1% wide above
+    256us) are printed too."""
+    sysbench_path = os.path.join(report_path, f'{prefix}_output.txt')
     if not os.path.exists(sysbench_path):
         return
 
-    with open(sysbench_path, 'r') as f:
-        content = f.read()
+    t = sysbench_parser.read_totals(sysbench_path)
 
-    tps = re.search(r'transactions:\s+(\d+)\s+\(([\d.]+) per sec\.\)', content)
-    qps = re.search(r'queries:\s+(\d+)\s+\(([\d.]+) per sec\.\)', content)
-    errs = re.search(r'ignored errors:\s+(\d+)\s+\(([\d.]+) per sec\.\)', content)
-    recs = re.search(r'reconnects:\s+(\d+)\s+\(([\d.]+) per sec\.\)', content)
-    p95 = re.search(r'95th percentile:\s+([\d.]+)', content)
-    elapsed = re.search(r'time elapsed:\s+([\d.]+)s', content)
-
-    print("\n=== Sysbench Totals (as reported by sysbench; INCLUDES warmup) ===")
-    print("NOTE: these are run-averaged over warmup+run. For steady-state numbers,")
-    print("      read the per-interval table above and eyeball the post-warmup rows.")
-    if tps:
-        print(f"  TPS avg:      {float(tps.group(2)):>12,.2f}  (total txns: {int(tps.group(1)):,})")
-    if qps:
-        print(f"  QPS avg:      {float(qps.group(2)):>12,.2f}  (total qrys: {int(qps.group(1)):,})")
-    if p95:
-        print(f"  p95 latency:  {float(p95.group(1)):>12,.2f} ms")
-    if errs:
-        print(f"  Errors:       {int(errs.group(1)):>12,}  ({float(errs.group(2)):.2f}/s)")
-    if recs:
-        print(f"  Reconnects:   {int(recs.group(1)):>12,}  ({float(recs.group(2)):.2f}/s)")
-    if elapsed:
-        print(f"  Elapsed:      {float(elapsed.group(1)):>12,.1f} s")
+    if prefix == "pyload":
+        print("\n=== pyload Totals (post-warmup) ===")
+    else:
+        print("\n=== Sysbench Totals (as reported by sysbench; INCLUDES warmup) ===")
+        print("NOTE: these are run-averaged over warmup+run. For steady-state numbers,")
+        print("      read the per-interval table above and eyeball the post-warmup rows.")
+    if t.transactions is not None:
+        print(f"  TPS avg:      {t.tps:>12,.2f}  (total txns: {t.transactions:,})")
+    if t.queries is not None:
+        print(f"  QPS avg:      {t.qps:>12,.2f}  (total qrys: {t.queries:,})")
+    summary = (results or {}).get('summary', {})
+    if summary.get('lat_p99') is not None:
+        print(f"  p50/p95/p99:  {summary['lat_p50']:>12,.2f} / {summary['lat_p95']:,.2f}"
+              f" / {summary['lat_p99']:,.2f} ms  (merged histograms)")
+    elif t.lat_p95 is not None:
+        print(f"  p95 latency:  {t.lat_p95:>12,.2f} ms")
+    if t.errors is not None:
+        print(f"  Errors:       {t.errors:>12,}  ({t.errors_ps:.2f}/s)")
+    if t.reconnects is not None:
+        print(f"  Reconnects:   {t.reconnects:>12,}  ({t.reconnects_ps:.2f}/s)")
+    if t.elapsed is not None:
+        print(f"  Elapsed:      {t.elapsed:>12,.1f} s")
+
+
+def print_k6_totals(results):
+    """Print k6 steady-state totals from results.json; p50/p95/p99 are
+    merged across pods from the latency_bucket counter when present."""
+    summary = (results or {}).get('summary', {})
+    if not summary:
+        return
+    print("\n=== k6 Totals (post-warmup latency) ===")
+    if summary.get('tps') is not None:
+        print(f"  TPS avg:      {summary['tps']:>12,.2f}  (total iters: {summary.get('transactions', 0):,})")
+    if summary.get('lat_p99') is not None:
+        print(f"  p50/p95/p99:  {summary['lat_p50']:>12,.2f} / {summary['lat_p95']:,.2f}"
+              f" / {summary['lat_p99']:,.2f} ms  (merged histograms)")
+    elif summary.get('lat_p95') is not None:
+        print(f"  p95 latency:  {summary['lat_p95']:>12,.2f} ms  (p95 of interval p95s)")
+    if summary.get('dropped_iterations') is not None:
+        print(f"  Dropped:      {summary['dropped_iterations']:>12,}")
+
+
+def print_cdc_totals(results):
+    """Print CDC per-row lag and catch-up totals from results.json."""
+    summary = (results or {}).get('summary', {})
+    if summary.get('lag_p99') is None:
+        return
+    print("\n=== CDC Totals (per-row lag, MariaDB commit -> YugabyteDB apply) ===")
+    print(f"  Rows:         {summary['rows']:>12,}")
+    print(f"  p50/p95/p99:  {summary['lag_p50']:>12,.1f} / {summary['lag_p95']:,.1f}"
+          f" / {summary['lag_p99']:,.1f} ms  (max {summary['lag_max']:,.1f})")
+    for key, label in (('source_rows_s', 'Source'), ('apply_rows_s', 'Applied'),
+                       ('catch_up_rows_s', 'Catch-up')):
+        if summary.get(key) is not None:
+            print(f"  {label + ':':<13} {summary[key]:>12,.0f} rows/s")
+    print(f"  End to end:   {summary['end_to_end_s']:>12,.2f} s")
 
 
 def main():
@@ -212,20 +328,31 @@ def main():
         sys.exit(1)
 
     times = read_times(report_path)
+    results = read_results(report_path)
     run_start = times.get('RUN_START_TIME')
     warmup_end = times.get('WARMUP_END_TIME')
     warmup_len = (warmup_end - run_start) if (run_start and warmup_end) else None
+    if warmup_len is None and results and results.get('warmup_end_epoch'):
+        warmup_len = results['warmup_end_epoch'] - results['start_epoch']
 
     workload_type = times.get('WORKLOAD_TYPE', 'sysbench')
-    workload_name = 'k6' if workload_type == 'k6' else 'Sysbench'
+    workload_name = {'k6': 'k6', 'pyload': 'pyload', 'cdc': 'CDC'}.get(workload_type, 'Sysbench')
+    prefix = 'pyload' if workload_type == 'pyload' else 'sysbench'
 
     parse_node_spec(report_path)
     parse_workload_spec(report_path, workload_type)
-    intervals = read_intervals(report_path)
-    per_pod = read_per_pod_intervals(report_path) if workload_type != 'k6' else []
+    intervals = read_intervals(report_path, results)
+    per_pod = read_per_pod_intervals(report_path, results, prefix) if workload_type not in ('k6', 'cdc') else []
     print_interval_table(intervals, warmup_len, per_pod, workload_name)
-    if workload_type != 'k6':
-        parse_sysbench_totals(report_path)
+    print_sweep_table(results)
+    if workload_type == 'k6':
+        print_k6_totals(results)
+    elif workload_type == 'cdc':
+        print_cdc_totals(results)
+    else:
+        parse_sysbench_totals(report_path, prefix, results)
+    print_anomalies(results)
+    print_suspects(results)
 
 
 if __name__ == '__main__':
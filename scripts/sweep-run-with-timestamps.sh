@@ -0,0 +1,207 @@
+#!/bin/bash
+set -e
+
+# Throughput-vs-latency ("hockey stick") sweep: drives the cluster at a series
+# of fixed offered rates, one open-loop run per step, each with its own warmup.
+# Rates are percentages of SWEEP_MAX_RATE; when that is 0, a closed-loop
+# calibration run measures it first. Step boundaries are appended to
+# test_times.txt as SWEEP_STEP lines so the report can plot achieved
+# throughput and latency percentiles against offered load.
+#
+#   SWEEP_WORKLOAD       sysbench | k6 (default: sysbench)
+#   SWEEP_MAX_RATE       100% rate in txn/s (sysbench) or iterations/s (k6); 0 = calibrate
+#   SWEEP_STEPS          comma-separated % of max (default: 10,20,...,120)
+#   SWEEP_STEP_TIME      measured seconds per step, after its warmup (default: 60)
+#   SWEEP_WARMUP         warmup seconds per step (default: 15)
+#   SWEEP_CALIBRATE_TIME closed-loop calibration seconds (default: 60)
+
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PROJECT_ROOT="$(cd "${SCRIPT_DIR}/.." && pwd)"
+
+KUBE_CONTEXT="${KUBE_CONTEXT:?KUBE_CONTEXT must be set}"
+NAMESPACE="${NAMESPACE:?NAMESPACE must be set}"
+RELEASE_NAME="${RELEASE_NAME:-yb-benchmark}"
+K6_SCRIPT="${K6_SCRIPT:-test.js}"
+
+SWEEP_WORKLOAD="${SWEEP_WORKLOAD:-sysbench}"
+SWEEP_MAX_RATE="${SWEEP_MAX_RATE:-0}"
+SWEEP_STEPS="${SWEEP_STEPS:-10,20,30,40,50,60,70,80,90,100,110,120}"
+SWEEP_STEP_TIME="${SWEEP_STEP_TIME:-60}"
+SWEEP_WARMUP="${SWEEP_WARMUP:-15}"
+SWEEP_CALIBRATE_TIME="${SWEEP_CALIBRATE_TIME:-60}"
+
+if [[ "$SWEEP_WORKLOAD" != "sysbench" && "$SWEEP_WORKLOAD" != "k6" ]]; then
+    echo "ERROR: SWEEP_WORKLOAD=${SWEEP_WORKLOAD}: expected sysbench or k6" >&2
+    exit 1
+fi
+
+OUTPUT_DIR="${PROJECT_ROOT}/output"
+mkdir -p "$OUTPUT_DIR"
+# Drop artifacts of earlier runs so the report cannot pick them up.
+rm -f "${OUTPUT_DIR}"/sweep_step_*.txt "${OUTPUT_DIR}"/sweep_calibrate_*.txt \
+    "${OUTPUT_DIR}"/sysbench_output*.txt "${OUTPUT_DIR}"/k6_output_*.txt
+
+KUBECTL="kubectl --context ${KUBE_CONTEXT} -n ${NAMESPACE}"
+
+echo "=== ${SWEEP_WORKLOAD} Rate Sweep ==="
+echo "Context: ${KUBE_CONTEXT}"
+echo "Namespace: ${NAMESPACE}"
+echo "Steps (% of max): ${SWEEP_STEPS}"
+echo "Per step: ${SWEEP_WARMUP}s warmup + ${SWEEP_STEP_TIME}s"
+echo ""
+
+# Discover client pods
+PODS=($($KUBECTL get pods -l "app.kubernetes.io/component=${SWEEP_WORKLOAD}" \
+    -o jsonpath='{.items[*].metadata.name}' | tr ' ' '\n' | sort))
+NUM_PODS=${#PODS[@]}
+
+if [[ $NUM_PODS -eq 0 ]]; then
+    echo "ERROR: No ${SWEEP_WORKLOAD} pods found" >&2
+    exit 1
+fi
+
+echo "${SWEEP_WORKLOAD} pods (${NUM_PODS}): ${PODS[*]}"
+echo ""
+
+# Collect tserver pod-to-node mapping with node allocatable specs
+echo "Collecting node specs..."
+echo -e "pod_name\tnode_name\tcpu\tmemory" > "${OUTPUT_DIR}/RUN_NODE_SPEC.txt"
+for pod in $($KUBECTL get pods -l app=yb-tserver -o jsonpath='{.items[*].metadata.name}'); do
+    node=$($KUBECTL get pod "$pod" -o jsonpath='{.spec.nodeName}')
+    read -r cpu mem <<< "$(kubectl --context "${KUBE_CONTEXT}" get node "$node" -o jsonpath='{.status.allocatable.cpu} {.status.allocatable.memory}')"
+    echo -e "${pod}\t${node}\t${cpu}\t${mem}" >> "${OUTPUT_DIR}/RUN_NODE_SPEC.txt"
+done
+
+# Collect client pod-to-node mapping
+echo -e "pod_name\tnode_name" > "${OUTPUT_DIR}/CLIENT_NODE_SPEC.txt"
+for pod in "${PODS[@]}"; do
+    node=$($KUBECTL get pod "$pod" -o jsonpath='{.spec.nodeName}')
+    echo -e "${pod}\t${node}" >> "${OUTPUT_DIR}/CLIENT_NODE_SPEC.txt"
+done
+echo "Node specs saved."
+echo ""
+
+# run_on_pods <outfile-prefix> <per-pod rate> <warmup> <time>
+# Runs one step on every pod in parallel; rate 0 = closed loop.
+run_on_pods() {
+    local prefix=$1 rate=$2 warmup=$3 time=$4
+    local pids=() cmd
+    for i in "${!PODS[@]}"; do
+        if [[ "$SWEEP_WORKLOAD" == "sysbench" ]]; then
+            cmd=(/scripts/sysbench-run.sh --rate="${rate}" --time="${time}"
+                 --warmup-time="${warmup}" --histogram=on)
+        elif [[ "$rate" -gt 0 ]]; then
+            cmd=(k6 run --out experimental-prometheus-rw
+                 -e K6_EXECUTOR=constant-arrival-rate -e K6_RATE="${rate}"
+                 -e BENCH_WARMUP="${warmup}" -e BENCH_DURATION="${time}s"
+                 "/scripts/${K6_SCRIPT}")
+        else
+            cmd=(k6 run --out experimental-prometheus-rw
+                 -e K6_EXECUTOR=constant-vus
+                 -e BENCH_WARMUP="${warmup}" -e BENCH_DURATION="${time}s"
+                 "/scripts/${K6_SCRIPT}")
+        fi
+        if [[ $i -eq 0 ]]; then
+            $KUBECTL exec "${PODS[$i]}" -- "${cmd[@]}" 2>&1 | tee "${prefix}_${i}.txt" &
+        else
+            $KUBECTL exec "${PODS[$i]}" -- "${cmd[@]}" > "${prefix}_${i}.txt" 2>&1 &
+        fi
+        pids+=($!)
+    done
+    local failed=0
+    for i in "${!pids[@]}"; do
+        if ! wait "${pids[$i]}"; then
+            echo "ERROR: ${SWEEP_WORKLOAD} on ${PODS[$i]} failed" >&2
+            failed=1
+        fi
+    done
+    return $failed
+}
+
+# achieved_rate <outfile-prefix>: summed per-second rate reported by the pods
+achieved_rate() {
+    local prefix=$1
+    for i in "${!PODS[@]}"; do
+        if [[ "$SWEEP_WORKLOAD" == "sysbench" ]]; then
+            # transactions:                        2000   (99.95 per sec.)
+            grep -oE 'transactions: +[0-9]+ +\([0-9.]+ per sec' "${prefix}_${i}.txt" | grep -oE '[0-9.]+ per' | cut -d' ' -f1
+        else
+            # iterations.....................: 1234   41.1/s
+            # (not dropped_iterations........: 12     0.4/s)
+            grep -E '(^|[[:space:]])iterations\.+: +[0-9]+ +[0-9.]+/s' "${prefix}_${i}.txt" |
+                grep -oE '[0-9.]+/s' | tr -d '/s'
+        fi
+    done | awk '{s += $1} END {printf "%d\n", s}'
+}
+
+if [[ "$SWEEP_MAX_RATE" -le 0 ]]; then
+    echo "=== Calibration: closed loop for ${SWEEP_CALIBRATE_TIME}s ==="
+    run_on_pods "${OUTPUT_DIR}/sweep_calibrate" 0 "$SWEEP_WARMUP" "$SWEEP_CALIBRATE_TIME"
+    SWEEP_MAX_RATE=$(achieved_rate "${OUTPUT_DIR}/sweep_calibrate")
+    if [[ -z "$SWEEP_MAX_RATE" || "$SWEEP_MAX_RATE" -le 0 ]]; then
+        echo "ERROR: could not read the calibration throughput; set SWEEP_MAX_RATE" >&2
+        exit 1
+    fi
+    echo "Measured max: ${SWEEP_MAX_RATE}/s"
+    echo ""
+fi
+
+# Record start time
+START_TIME=$(date +%s)
+TIMES_FILE="${OUTPUT_DIR}/test_times.txt"
+{
+    echo "WORKLOAD_TYPE=${SWEEP_WORKLOAD}"
+    echo "RUN_START_TIME=${START_TIME}"
+    echo "WARMUP_END_TIME=$(( START_TIME + SWEEP_WARMUP ))"
+    if [[ "$SWEEP_WORKLOAD" == "k6" ]]; then
+        echo "NUM_K6_PODS=${NUM_PODS}"
+    else
+        echo "NUM_SYSBENCH_PODS=${NUM_PODS}"
+    fi
+    echo "SWEEP_MAX_RATE=${SWEEP_MAX_RATE}"
+} > "$TIMES_FILE"
+echo "Start time: $(date -d @${START_TIME} '+%Y-%m-%d %H:%M:%S')"
+echo ""
+
+STEP=0
+IFS=',' read -ra PCTS <<< "$SWEEP_STEPS"
+for pct in "${PCTS[@]}"; do
+    STEP=$(( STEP + 1 ))
+    # Split the offered rate evenly across pods; record what was really offered.
+    per_pod=$(( SWEEP_MAX_RATE * pct / 100 / NUM_PODS ))
+    per_pod=$(( per_pod > 0 ? per_pod : 1 ))
+    offered=$(( per_pod * NUM_PODS ))
+    echo "=== Step ${STEP}: ${pct}% = ${offered}/s (${per_pod}/s per pod) ==="
+
+    STEP_START=$(date +%s)
+    run_on_pods "${OUTPUT_DIR}/sweep_step_${STEP}" "$per_pod" "$SWEEP_WARMUP" "$SWEEP_STEP_TIME"
+    STEP_END=$(date +%s)
+    # SWEEP_STEP=<n>,<% of max>,<offered/s>,<start>,<warmup end>,<end>
+    echo "SWEEP_STEP=${STEP},${pct},${offered},${STEP_START},$(( STEP_START + SWEEP_WARMUP )),${STEP_END}" >> "$TIMES_FILE"
+
+    if [[ "$SWEEP_WORKLOAD" == "sysbench" ]]; then
+        step_files=()
+        for i in "${!PODS[@]}"; do
+            step_files+=("${OUTPUT_DIR}/sweep_step_${STEP}_${i}.txt")
+        done
+        if [[ $NUM_PODS -gt 1 ]]; then
+            python3 "${PROJECT_ROOT}/scripts/merge-sysbench-output.py" \
+                "${step_files[@]}" -o "${OUTPUT_DIR}/sweep_step_${STEP}.txt"
+        else
+            cp "${step_files[0]}" "${OUTPUT_DIR}/sweep_step_${STEP}.txt"
+        fi
+    fi
+    echo "Achieved: $(achieved_rate "${OUTPUT_DIR}/sweep_step_${STEP}")/s"
+    echo ""
+done
+
+# Record end time
+END_TIME=$(date +%s)
+echo "RUN_END_TIME=${END_TIME}" >> "$TIMES_FILE"
+echo "End time: $(date -d @${END_TIME} '+%Y-%m-%d %H:%M:%S')"
+echo "Duration: $(( (END_TIME - START_TIME) / 60 )) minutes $(( (END_TIME - START_TIME) % 60 )) seconds"
+
+echo ""
+echo "=== Sweep Complete ==="
+echo "Output saved to: ${OUTPUT_DIR}"
+echo "Run 'make report' to generate the performance report."
@@ -0,0 +1,268 @@
+"""Streaming parser for sysbench run output.
+
+Shared by merge-sysbench-output.py, report-parser.py and
+report-generator/generate_report.py. Output is read once, line by line:
+interval lines are yielded as Interval records as they are reached, while
+the header text and the end-of-run statistics are collected into
+OutputReader.header / OutputReader.totals along the way. Memory stays
+constant however long the run (1s intervals over 24h is ~86k lines per
+pod), unless the caller keeps the intervals.
+
+    reader = OutputReader(open(path))
+    for iv in reader.intervals():
+        ...
+    reader.totals.tps
+    reader.histogram   # [(latency_ms, count), ...] with --histogram=on
+"""
+
+import re
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+# [ 10s ] thds: 24 tps: 98.19 qps: 3372.21 (r/w/o: 997.53/2176.67/198.01) lat (ms,95%): 297.92 err/s: 1.02 reconn/s: 0.00
+INTERVAL_RE = re.compile(
+    r'\[\s*(\d+)s\s*\]\s*thds:\s*(\d+)\s*tps:\s*([\d.]+)\s*qps:\s*([\d.]+)\s*'
+    r'\(r/w/o:\s*([\d.]+)/([\d.]+)/([\d.]+)\)\s*lat\s*\(ms,95%\):\s*([\d.]+)\s*'
+    r'err/s:\s*([\d.]+)(?:\s*reconn/s:\s*([\d.]+))?'
+)
+# Printed after each interval line when sysbench runs open-loop (--rate):
+# [ 10s ] queue length: 0, concurrency: 4
+QUEUE_RE = re.compile(r'\[\s*(\d+)s\s*\]\s*queue length:\s*(\d+),\s*concurrency:\s*(\d+)')
+# Printed at the end of the run with --histogram=on:
+#        2.300 |****                                     41
+HISTOGRAM_RE = re.compile(r'^\s*([\d.]+)\s*\|\**\s+(\d+)\s*$')
+_PER_SEC_RE = re.compile(r'(\d+)\s+\(([\d.]+) per sec\.\)')
+_PAIR_RE = re.compile(r'([\d.]+)/([\d.]+)')
+_NUMBER_RE = re.compile(r'[\d.]+')
+
+
+@dataclass
+class Interval:
+    """One `[ Ns ]` progress line."""
+    time: int
+    threads: int
+    tps: float
+    qps: float
+    read_qps: float
+    write_qps: float
+    other_qps: float
+    lat_95: float
+    err_s: float
+    reconn_s: float = 0.0
+    # Open-loop runs only (--rate): events waiting to start, and events in flight.
+    queue_length: Optional[int] = None
+    concurrency: Optional[int] = None
+
+    def as_dict(self) -> dict:
+        d = asdict(self)
+        if self.queue_length is None:
+            del d["queue_length"], d["concurrency"]
+        return d
+
+
+@dataclass
+class Totals:
+    """End-of-run statistics. Fields missing from the output stay None."""
+    threads: Optional[int] = None
+    sql_read: Optional[int] = None
+    sql_write: Optional[int] = None
+    sql_other: Optional[int] = None
+    sql_total: Optional[int] = None
+    transactions: Optional[int] = None
+    tps: Optional[float] = None
+    queries: Optional[int] = None
+    qps: Optional[float] = None
+    errors: Optional[int] = None
+    errors_ps: Optional[float] = None
+    reconnects: Optional[int] = None
+    reconnects_ps: Optional[float] = None
+    eps: Optional[float] = None
+    elapsed: Optional[float] = None
+    total_events: Optional[int] = None
+    lat_min: Optional[float] = None
+    lat_avg: Optional[float] = None
+    lat_max: Optional[float] = None
+    lat_p95: Optional[float] = None
+    lat_sum: Optional[float] = None
+    fair_events_avg: Optional[float] = None
+    fair_events_stddev: Optional[float] = None
+    fair_time_avg: Optional[float] = None
+    fair_time_stddev: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        """Only the fields that were present in the output."""
+        return {f.name: getattr(self, f.name) for f in fields(self)
+                if getattr(self, f.name) is not None}
+
+
+# "key: value" lines in the statistics block, by stripped key. The first
+# occurrence wins, matching what a top-down search of the file would find.
+_COUNT_KEYS = {
+    "read": "sql_read", "write": "sql_write", "other": "sql_other", "total": "sql_total",
+    "total number of events": "total_events", "Number of threads": "threads",
+}
+_FLOAT_KEYS = {
+    "events/s (eps)": "eps", "time elapsed": "elapsed",
+    "min": "lat_min", "avg": "lat_avg", "max": "lat_max",
+    "95th percentile": "lat_p95", "sum": "lat_sum",
+}
+_PER_SEC_KEYS = {
+    "transactions": ("transactions", "tps"),
+    "queries": ("queries", "qps"),
+    "ignored errors": ("errors", "errors_ps"),
+    "reconnects": ("reconnects", "reconnects_ps"),
+}
+_PAIR_KEYS = {
+    "events (avg/stddev)": ("fair_events_avg", "fair_events_stddev"),
+    "execution time (avg/stddev)": ("fair_time_avg", "fair_time_stddev"),
+}
+
+
+def parse_interval(line: str) -> Optional[Interval]:
+    """Parse one progress line, or return None if it is not one."""
+    if "thds:" not in line:
+        return None
+    m = INTERVAL_RE.search(line)
+    if not m:
+        return None
+    return Interval(
+        time=int(m.group(1)),
+        threads=int(m.group(2)),
+        tps=float(m.group(3)),
+        qps=float(m.group(4)),
+        read_qps=float(m.group(5)),
+        write_qps=float(m.group(6)),
+        other_qps=float(m.group(7)),
+        lat_95=float(m.group(8)),
+        err_s=float(m.group(9)),
+        reconn_s=float(m.group(10)) if m.group(10) else 0.0,
+    )
+
+
+class OutputReader:
+    """Single pass over sysbench output lines.
+
+    intervals() yields Interval records, each after the line that follows
+    it so an open-loop queue line can be attached. header (text before the first
+    interval, or before "SQL statistics:" when there are none) is complete
+    once the first interval has been yielded; totals is complete once the
+    iterator is exhausted, as is histogram (the --histogram=on buckets,
+    empty without it). The input is consumed exactly once.
+    """
+
+    def __init__(self, lines: Iterable[str]):
+        self._lines = lines
+        self._header_lines: list[str] = []
+        self._in_header = True
+        self.totals = Totals()
+        self.histogram: list[tuple[float, int]] = []
+
+    @property
+    def header(self) -> str:
+        return "\n".join(self._header_lines).rstrip()
+
+    def intervals(self) -> Iterator[Interval]:
+        pending = None
+        for line in self._lines:
+            iv = parse_interval(line)
+            if iv is not None:
+                self._in_header = False
+                if pending is not None:
+                    yield pending
+                pending = iv
+                continue
+            if pending is not None:
+                q = QUEUE_RE.search(line) if "queue length:" in line else None
+                if q and int(q.group(1)) == pending.time:
+                    pending.queue_length = int(q.group(2))
+                    pending.concurrency = int(q.group(3))
+                    yield pending
+                    pending = None
+                    continue
+                yield pending
+                pending = None
+            line = line.rstrip("\n")
+            if "|" in line:
+                h = HISTOGRAM_RE.match(line)
+                if h:
+                    self.histogram.append((float(h.group(1)), int(h.group(2))))
+                    continue
+            if self._in_header:
+                if line.startswith("SQL statistics:"):
+                    self._in_header = False
+                else:
+                    self._header_lines.append(line)
+            self._parse_stat(line)
+        if pending is not None:
+            yield pending
+
+    def _parse_stat(self, line: str):
+        key, sep, rest = line.partition(":")
+        if not sep:
+            return
+        key = key.strip()
+        t = self.totals
+        if key in _COUNT_KEYS:
+            name = _COUNT_KEYS[key]
+            m = _NUMBER_RE.search(rest)
+            if m and getattr(t, name) is None and m.group(0).isdigit():
+                setattr(t, name, int(m.group(0)))
+        elif key in _FLOAT_KEYS:
+            name = _FLOAT_KEYS[key]
+            m = _NUMBER_RE.search(rest)
+            if m and getattr(t, name) is None:
+                setattr(t, name, float(m.group(0)))
+        elif key in _PER_SEC_KEYS:
+            count_name, rate_name = _PER_SEC_KEYS[key]
+            m = _PER_SEC_RE.search(rest)
+            if m and getattr(t, count_name) is None:
+                setattr(t, count_name, int(m.group(1)))
+                setattr(t, rate_name, float(m.group(2)))
+        elif key in _PAIR_KEYS:
+            a, b = _PAIR_KEYS[key]
+            m = _PAIR_RE.search(rest)
+            if m and getattr(t, a) is None:
+                setattr(t, a, float(m.group(1)))
+                setattr(t, b, float(m.group(2)))
+
+
+def merge_histograms(histograms: Iterable[list[tuple[float, int]]]) -> list[tuple[float, int]]:
+    """Sum bucket counts across runs (e.g. one histogram per pod). sysbench
+    uses the same fixed bucket boundaries everywhere, so buckets line up."""
+    counts: dict[float, int] = {}
+    for hist in histograms:
+        for value, count in hist:
+            counts[value] = counts.get(value, 0) + count
+    return sorted(counts.items())
+
+
+def histogram_percentile(histogram: list[tuple[float, int]], pct: float) -> Optional[float]:
+    """Latency (ms) of the bucket holding the pct-th percentile, the way
+    sysbench reports its own percentile; None for an empty histogram."""
+    total = sum(count for _, count in histogram)
+    if not total:
+        return None
+    threshold = total * pct / 100.0
+    buckets = sorted(histogram)
+    seen = 0
+    for value, count in buckets:
+        seen += count
+        if seen >= threshold:
+            return value
+    return buckets[-1][0]
+
+
+def iter_intervals(path: Path) -> Iterator[Interval]:
+    """Stream the intervals of one output file."""
+    with open(path) as f:
+        yield from OutputReader(f).intervals()
+
+
+def read_totals(path: Path) -> Totals:
+    """End-of-run statistics of one output file (still a single streaming pass)."""
+    with open(path) as f:
+        reader = OutputReader(f)
+        for _ in reader.intervals():
+            pass
+    return reader.totals
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""Availability analysis for a fault tolerance run.
+
+Reads writer-journal.csv and test-config.txt from a report directory and
+computes, per second, insert attempts, successes, errors by class and write
+latency percentiles (py writer journals only). For each event (failure
+injection, recovery start) it derives:
+
+- first error: first failed attempt at or after the event
+- time to first success (TTFS): event to the first OK attempt started after
+  that first error
+- longest write stall: longest gap between consecutive OK completions
+- RTO: event to the start of the first --steady-seconds run of seconds that
+  all match the baseline (success rate, throughput and p99 latency)
+
+Results go to availability.json and availability.html (Chart.js, with the
+tserver metrics from --prometheus-url overlaid when given). Uses the report
+generator's PrometheusClient and executors.
+
+Usage:
+    ft-analyze.py <report_dir> [--prometheus-url URL --kube-context CTX --namespace NS]
+"""
+
+import argparse
+import bisect
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    from jinja2 import Template
+except ImportError:
+    print("Error: Jinja2 is required. Install with: pip install Jinja2", file=sys.stderr)
+    sys.exit(1)
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = SCRIPT_DIR.parent.parent
+REPORT_GENERATOR_DIR = PROJECT_ROOT / "scripts" / "report-generator"
+
+# Events in test-config.txt, in run order: (key, label, phase that follows).
+EVENTS = (
+    ("failure_inject_time", "failure injected", "failure"),
+    ("recovery_start_time", "recovery started", "recovery"),
+    ("recovery_end_time", "recovery done", "stabilization"),
+)
+
+# ft-writer.sh journals the raw ysqlsh/kubectl error; map it to a short class.
+# ft-writer.py journals ERROR:<sqlstate|exception class|timeout> <message>.
+_SH_ERROR_CLASSES = (
+    (re.compile(r"timed? ?out|timeout", re.I), "timeout"),
+    (re.compile(r"connection refused", re.I), "conn_refused"),
+    (re.compile(r"server closed the connection|connection reset|terminating connection", re.I), "conn_lost"),
+    (re.compile(r"could not connect|connection to server", re.I), "connect"),
+    (re.compile(r"leader|not the leader|LeaderNotReady", re.I), "leader"),
+    (re.compile(r"unable to upgrade connection|container not found|pods? .* not found|error from server", re.I),
+     "kubectl"),
+)
+
+
+def parse_iso(ts: str) -> float:
+    """Epoch seconds from 2026-01-01T00:00:00[.123]Z."""
+    return datetime.fromisoformat(ts.strip().replace("Z", "+00:00")).timestamp()
+
+
+def iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def read_config(path: Path) -> dict:
+    """test-config.txt ("key: value" lines) as a dict."""
+    config = {}
+    for line in path.read_text().splitlines():
+        key, sep, value = line.partition(":")
+        if sep:
+            config[key.strip()] = value.strip()
+    return config
+
+
+def error_class(status: str, py_writer: bool) -> str:
+    detail = status[len("ERROR:"):].strip()
+    if py_writer:
+        return detail.split(" ", 1)[0] or "unknown"
+    for pattern, name in _SH_ERROR_CLASSES:
+        if pattern.search(detail):
+            return name
+    return "other"
+
+
+def read_journal(path: Path) -> tuple[list[tuple], bool]:
+    """Journal attempts as (start, latency_ms or None, status, error class).
+
+    Handles both formats: timestamp,writer_id,seq_num[,latency_ms],status.
+    Status is last and may itself contain commas.
+    """
+    with open(path) as f:
+        header = f.readline().strip().split(",")
+        has_latency = "latency_ms" in header
+        ncols = len(header)
+        attempts = []
+        for line in f:
+            parts = line.rstrip("\n").split(",", ncols - 1)
+            if len(parts) < ncols:
+                continue  # partial last line
+            try:
+                start = parse_iso(parts[0])
+                latency = float(parts[3]) if has_latency else None
+            except ValueError:
+                continue
+            status = parts[-1]
+            cls = None if status == "OK" else error_class(status, has_latency)
+            attempts.append((start, latency, status, cls))
+    attempts.sort(key=lambda a: a[0])
+    return attempts, has_latency
+
+
+def percentile(sorted_values: list[float], p: float):
+    """Nearest-rank percentile of an ascending list (None if empty)."""
+    if not sorted_values:
+        return None
+    idx = max(0, math.ceil(p / 100.0 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+def per_second(attempts: list[tuple]) -> list[dict]:
+    """One bucket per wall-clock second from the first to the last attempt."""
+    if not attempts:
+        return []
+    first = int(attempts[0][0])
+    last = int(attempts[-1][0])
+    buckets = [{"t": first + i, "attempts": 0, "ok": 0, "errors": Counter(), "lat": []}
+               for i in range(last - first + 1)]
+    for start, latency, status, cls in attempts:
+        b = buckets[int(start) - first]
+        b["attempts"] += 1
+        if cls is None:
+            b["ok"] += 1
+            if latency is not None:
+                b["lat"].append(latency)
+        else:
+            b["errors"][cls] += 1
+    for b in buckets:
+        lat = sorted(b.pop("lat"))
+        b["error_count"] = sum(b["errors"].values())
+        b["errors"] = dict(b["errors"])
+        b["success_rate"] = b["ok"] / b["attempts"] if b["attempts"] else None
+        b["p50"], b["p95"], b["p99"] = (percentile(lat, p) for p in (50, 95, 99))
+    return buckets
+
+
+def baseline_stats(attempts: list[tuple], seconds: list[dict], until: float) -> dict:
+    """Throughput and latency before the first event.
+
+    The first and last partial seconds are left out of the ok/s figure.
+    """
+    full = [b for b in seconds[1:] if b["t"] + 1 <= until]
+    lat = sorted(a[1] for a in attempts if a[0] < until and a[3] is None and a[1] is not None)
+    ok_per_s = sorted(b["ok"] for b in full)
+    return {
+        "seconds": len(full),
+        "ok_per_s": percentile(ok_per_s, 50) if ok_per_s else None,
+        "p50": percentile(lat, 50),
+        "p99": percentile(lat, 99),
+    }
+
+
+def is_steady(b: dict, baseline: dict, args) -> bool:
+    if not b["attempts"] or b["success_rate"] < args.min_success:
+        return False
+    if baseline["ok_per_s"] and b["ok"] < args.min_throughput * baseline["ok_per_s"]:
+        return False
+    if baseline["p99"] and b["p99"] is not None and b["p99"] > args.max_p99_factor * baseline["p99"]:
+        return False
+    return True
+
+
+def longest_stall(attempts: list[tuple], start: float, end: float) -> tuple:
+    """Longest gap between consecutive OK completions that starts before end.
+
+    A gap that runs past end (writes still stalled at the next event) is
+    counted whole. With no OK completion after the last one, the gap runs
+    to end or to the journal's last completion, whichever is earlier: the
+    writer stopping is not a stall. Completion is start + latency for py
+    writer journals, the attempt start otherwise. Returns (seconds, gap
+    start, gap end).
+    """
+    done = sorted(a[0] + (a[1] or 0) / 1000.0 for a in attempts if a[3] is None)
+    last = max(a[0] + (a[1] or 0) / 1000.0 for a in attempts)
+    i = bisect.bisect_left(done, start)
+    prev = done[i - 1] if i > 0 else start
+    best = (0.0, None, None)
+    for t in done[i:]:
+        if prev >= end:
+            break
+        if t - prev > best[0]:
+            best = (t - prev, prev, t)
+        prev = t
+    else:
+        # No OK completion after the last one: stalled until the window end
+        # or until the last attempt, failed, finished.
+        stop = min(end, last)
+        if stop - prev > best[0]:
+            best = (stop - prev, prev, stop)
+    return best
+
+
+def analyze_event(name: str, label: str, t_event: float, window_end: float,
+                  attempts: list[tuple], seconds: list[dict], baseline: dict, args) -> dict:
+    starts = [a[0] for a in attempts]
+    i = bisect.bisect_left(starts, t_event)
+    errors_in_window = [a for a in attempts[i:] if a[0] < window_end and a[3] is not None]
+    first_error = errors_in_window[0][0] if errors_in_window else None
+
+    first_success = None
+    if first_error is not None:
+        j = bisect.bisect_right(starts, first_error)
+        first_success = next((a[0] for a in attempts[j:] if a[3] is None), None)
+
+    # Steady state is searched from the first error (or from the event when
+    # the writes never failed) up to the end of the journal: an outage that
+    # only ends after the next event is still attributed to this one.
+    # The last second is cut short by the writer stopping, so never counts.
+    search_from = first_error if first_error is not None else t_event
+    steady_at = None
+    run = 0
+    for b in seconds[:-1]:
+        if b["t"] + 1 <= search_from:
+            continue
+        if is_steady(b, baseline, args):
+            run += 1
+            if run == args.steady_seconds:
+                steady_at = b["t"] - args.steady_seconds + 1
+                break
+        else:
+            run = 0
+    if steady_at is not None:
+        steady_at = max(steady_at, t_event)
+
+    stall_s, stall_from, stall_to = longest_stall(attempts, t_event, window_end)
+    window = [b for b in seconds if t_event <= b["t"] < window_end]
+    lat_peak = max((b["p99"] for b in window if b["p99"] is not None), default=None)
+
+    return {
+        "event": name,
+        "label": label,
+        "time": iso(t_event),
+        "epoch": t_event,
+        "window_end": window_end,
+        "errors": len(errors_in_window),
+        "error_classes": dict(Counter(a[3] for a in errors_in_window).most_common()),
+        "first_error_s": round(first_error - t_event, 3) if first_error is not None else None,
+        "ttfs_s": round(first_success - t_event, 3) if first_success is not None else None,
+        "longest_stall_s": round(stall_s, 3),
+        "stall_from": stall_from,
+        "stall_to": stall_to,
+        "rto_s": round(steady_at - t_event, 3) if steady_at is not None else None,
+        "steady_at": steady_at,
+        "peak_p99_ms": lat_peak,
+    }
+
+
+def phase_stats(attempts: list[tuple], phases: list[tuple]) -> list[dict]:
+    rows = []
+    for name, start, end in phases:
+        sel = [a for a in attempts if start <= a[0] < end]
+        ok = [a for a in sel if a[3] is None]
+        lat = sorted(a[1] for a in ok if a[1] is not None)
+        span = max(end - start, 1e-9)
+        rows.append({
+            "phase": name,
+            "seconds": round(end - start, 1),
+            "attempts": len(sel),
+            "ok": len(ok),
+            "errors": len(sel) - len(ok),
+            "success_rate": len(ok) / len(sel) if sel else None,
+            "ok_per_s": len(ok) / span,
+            "p50": percentile(lat, 50),
+            "p99": percentile(lat, 99),
+        })
+    return rows
+
+
+# Tserver metrics overlaid on the availability charts: (key, title, unit, query).
+# {ns} is the namespace; cAdvisor series only exist in k8s mode.
+TSERVER_QUERIES = (
+    ("up", "Tserver scrape up", "up",
+     'up{{job="yb-tserver"}}'),
+    ("write_rpcs", "Tserver write RPCs", "RPC/s",
+     'sum by (instance) (irate(handler_latency_yb_tserver_TabletServerService_Write_count'
+     '{{job="yb-tserver"}}[30s]))'),
+    ("leaders", "Raft leaders per tserver", "tablets",
+     'sum by (instance) (is_raft_leader{{job="yb-tserver"}})'),
+    ("cpu", "Tserver CPU", "cores",
+     'sum by (pod) (irate(container_cpu_usage_seconds_total{{namespace="{ns}",'
+     'pod=~"yb-tserver.*",container="yb-tserver"}}[30s]))'),
+)
+
+
+def collect_tserver_metrics(args, start: float, end: float) -> list[dict]:
+    """Query the tserver overlays through the report generator's PrometheusClient."""
+    sys.path.insert(0, str(REPORT_GENERATOR_DIR))
+    from generate_report import HttpQueryExecutor, KubectlQueryExecutor, PrometheusClient
+
+    if args.mode == "vm":
+        executor = HttpQueryExecutor()
+    else:
+        executor = KubectlQueryExecutor(args.kube_context, args.namespace, args.release_name)
+    prometheus = PrometheusClient(executor, args.prometheus_url)
+
+    charts = []
+    for key, title, unit, query in TSERVER_QUERIES:
+        series = prometheus.query_range(query.format(ns=args.namespace), start, end, args.step)
+        if not series:
+            print(f"  {title}: no data", file=sys.stderr)
+            continue
+        charts.append({
+            "key": key,
+            "title": title,
+            "unit": unit,
+            "series": [{
+                "name": s.labels.get("pod") or s.labels.get("instance") or s.name,
+                "timestamps": s.timestamps,
+                "values": s.values,
+            } for s in series],
+        })
+    return charts
+
+
+def fmt_s(v) -> str:
+    return "-" if v is None else f"{v:.1f}s"
+
+
+def print_summary(result: dict):
+    b = result["baseline"]
+    print("Baseline: "
+          f"{b['ok_per_s'] or 0:.0f} ok/s"
+          + (f", p50/p99 {b['p50']:.1f}/{b['p99']:.1f} ms" if b["p99"] is not None else ""))
+    for e in result["events"]:
+        print(f"{e['label']} at {e['time']}: {e['errors']} errors, "
+              f"first error +{fmt_s(e['first_error_s'])}, TTFS {fmt_s(e['ttfs_s'])}, "
+              f"longest stall {e['longest_stall_s']:.1f}s, RTO {fmt_s(e['rto_s'])}")
+        if e["error_classes"]:
+            print("  " + ", ".join(f"{k}={v}" for k, v in e["error_classes"].items()))
+
+
+def render_html(result: dict, report_dir: Path, template_path: Path, output: Path):
+    vendor = os.path.relpath(PROJECT_ROOT / "reports" / "vendor", report_dir)
+    with open(template_path) as f:
+        template = Template(f.read())
+    data = json.dumps(result, separators=(",", ":")).replace("</", "<\\/")
+    output.write_text(template.render(result=result, data_json=data, vendor=vendor))
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Availability / RTO analysis of a fault tolerance run")
+    p.add_argument("report_dir", help="tests/ft/reports/<scenario>_<timestamp>")
+    p.add_argument("--journal", default="", help="journal file (default: <report_dir>/writer-journal.csv)")
+    p.add_argument("--steady-seconds", type=int, default=5,
+                   help="consecutive healthy seconds that mark steady state (default: 5)")
+    p.add_argument("--min-success", type=float, default=0.99,
+                   help="steady state: minimum per-second success rate (default: 0.99)")
+    p.add_argument("--min-throughput", type=float, default=0.9,
+                   help="steady state: minimum ok/s as a fraction of baseline (default: 0.9)")
+    p.add_argument("--max-p99-factor", type=float, default=2.0,
+                   help="steady state: maximum p99 as a multiple of baseline p99 (default: 2)")
+    p.add_argument("--mode", default="k8s", choices=["k8s", "vm"],
+                   help="how to reach Prometheus, as for generate_report.py (default: k8s)")
+    p.add_argument("--prometheus-url", default="", help="VictoriaMetrics/Prometheus URL (empty = no overlays)")
+    p.add_argument("--kube-context", default="", help="Kubernetes context (default: from test-config.txt)")
+    p.add_argument("--namespace", default="", help="Kubernetes namespace (default: from test-config.txt)")
+    p.add_argument("--release-name", default="yb-benchmark", help="Helm release name")
+    p.add_argument("--step", type=int, default=5, help="metrics query step in seconds (default: 5)")
+    return p.parse_args(argv)
+
+
+def main():
+    args = parse_args()
+    report_dir = Path(args.report_dir)
+    journal_path = Path(args.journal) if args.journal else report_dir / "writer-journal.csv"
+    config = read_config(report_dir / "test-config.txt")
+    args.kube_context = args.kube_context or config.get("kube_context", "")
+    args.namespace = args.namespace or config.get("namespace", "")
+
+    attempts, has_latency = read_journal(journal_path)
+    if not attempts:
+        print(f"Error: no insert attempts in {journal_path}", file=sys.stderr)
+        sys.exit(1)
+    seconds = per_second(attempts)
+    run_start, run_end = attempts[0][0], attempts[-1][0] + 1
+
+    events = [(key, label, phase, parse_iso(config[key]))
+              for key, label, phase in EVENTS if config.get(key)]
+    first_event = events[0][3] if events else run_end
+    baseline = baseline_stats(attempts, seconds, first_event)
+
+    analyzed = []
+    for i, (key, label, _, t) in enumerate(events):
+        window_end = events[i + 1][3] if i + 1 < len(events) else run_end
+        analyzed.append(analyze_event(key, label, t, window_end, attempts, seconds, baseline, args))
+
+    bounds = [("baseline", run_start)] + [(phase, t) for _, _, phase, t in events] + [(None, run_end)]
+    phases = [(name, start, bounds[i + 1][1]) for i, (name, start) in enumerate(bounds[:-1])
+              if bounds[i + 1][1] > start]
+
+    result = {
+        "scenario": config.get("scenario", report_dir.name),
+        "targets": config.get("targets", ""),
+        "failure_mode": config.get("failure_mode", ""),
+        "writer": config.get("writer", "sh"),
+        "has_latency": has_latency,
+        "run_start": run_start,
+        "run_end": run_end,
+        "steady_criteria": {
+            "seconds": args.steady_seconds,
+            "min_success": args.min_success,
+            "min_throughput": args.min_throughput,
+            "max_p99_factor": args.max_p99_factor,
+        },
+        "baseline": baseline,
+        "events": analyzed,
+        "phases": phase_stats(attempts, phases),
+        "seconds": seconds,
+        "metrics": [],
+    }
+
+    print_summary(result)
+
+    if args.prometheus_url:
+        print(f"Querying tserver metrics from {args.prometheus_url}...")
+        try:
+            result["metrics"] = collect_tserver_metrics(args, run_start - 30, run_end + 30)
+        except Exception as e:  # overlays are optional; never lose the analysis
+            print(f"Warning: tserver metrics unavailable: {e}", file=sys.stderr)
+
+    with open(report_dir / "availability.json", "w") as f:
+        json.dump(result, f, indent=1)
+    render_html(result, report_dir, SCRIPT_DIR / "ft-report-template.html", report_dir / "availability.html")
+    print(f"Availability report: {report_dir / 'availability.html'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,6 +11,7 @@ set -euo pipefail
 #   ft-run.sh --scenario 1-tserver-down --target yb-tserver-1 --failure-mode vm-destroy --duration 60
 #   ft-run.sh --scenario 2-tserver-down --target "yb-tserver-0 yb-tserver-1"
 #   ft-run.sh --scenario 1-master-down --target yb-master-0
+#   ft-run.sh --scenario 1-tserver-down --target yb-tserver-0 --writer py --writers 16 --rate 200
 
 KUBE_CONTEXT="${KUBE_CONTEXT:?KUBE_CONTEXT must be set}"
 NAMESPACE="${NAMESPACE:?NAMESPACE must be set}"
@@ -19,6 +20,12 @@ FAILURE_DURATION="${FAILURE_DURATION:-30}"
 BASELINE_DURATION="${BASELINE_DURATION:-10}"
 RECOVERY_WAIT="${RECOVERY_WAIT:-30}"
 INSERT_INTERVAL_MS="${INSERT_INTERVAL_MS:-100}"
+# py: ft-writer.py with WRITERS persistent connections at WRITER_RATE inserts/s
+# each, run inside FT_WRITER_POD (needs python3 + asyncpg, e.g. the pyload pod)
+WRITER="${WRITER:-sh}"
+WRITERS="${WRITERS:-8}"
+WRITER_RATE="${WRITER_RATE:-100}"
+FT_WRITER_POD="${FT_WRITER_POD:-yb-benchmark-pyload-0}"
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
@@ -34,6 +41,9 @@ while [[ $# -gt 0 ]]; do
         --baseline) BASELINE_DURATION="$2"; shift 2 ;;
         --recovery-wait) RECOVERY_WAIT="$2"; shift 2 ;;
         --interval) INSERT_INTERVAL_MS="$2"; shift 2 ;;
+        --writer) WRITER="$2"; shift 2 ;;
+        --writers) WRITERS="$2"; shift 2 ;;
+        --rate) WRITER_RATE="$2"; shift 2 ;;
         *) echo "Unknown option: $1" >&2; exit 1 ;;
     esac
 done
@@ -47,6 +57,14 @@ if [ -z "$SCENARIO" ] || [ -z "$TARGETS" ]; then
     echo "  --baseline        baseline write duration before failure (default: 10)" >&2
     echo "  --recovery-wait   wait time after recovery (default: 30)" >&2
     echo "  --interval        insert interval in ms (default: 100)" >&2
+    echo "  --writer          sh (ft-writer.sh) or py (ft-writer.py in \$FT_WRITER_POD) (default: sh)" >&2
+    echo "  --writers         concurrent py writers (default: 8)" >&2
+    echo "  --rate            inserts/s per py writer (default: 100)" >&2
+    exit 1
+fi
+
+if [ "$WRITER" != "sh" ] && [ "$WRITER" != "py" ]; then
+    echo "ERROR: --writer must be sh or py" >&2
     exit 1
 fi
 
@@ -64,7 +82,11 @@ echo "Failure mode: $FAILURE_MODE"
 echo "Baseline: ${BASELINE_DURATION}s"
 echo "Failure duration: ${FAILURE_DURATION}s"
 echo "Recovery wait: ${RECOVERY_WAIT}s"
-echo "Insert interval: ${INSERT_INTERVAL_MS}ms"
+if [ "$WRITER" = "py" ]; then
+    echo "Writer: ft-writer.py in $FT_WRITER_POD, $WRITERS x ${WRITER_RATE}/s"
+else
+    echo "Insert interval: ${INSERT_INTERVAL_MS}ms"
+fi
 echo "Report dir: $REPORT_DIR"
 echo ""
 
@@ -77,6 +99,9 @@ baseline_duration: $BASELINE_DURATION
 failure_duration: $FAILURE_DURATION
 recovery_wait: $RECOVERY_WAIT
 insert_interval_ms: $INSERT_INTERVAL_MS
+writer: $WRITER
+writers: $WRITERS
+writer_rate: $WRITER_RATE
 start_time: $(date -u '+%Y-%m-%dT%H:%M:%SZ')
 kube_context: $KUBE_CONTEXT
 namespace: $NAMESPACE
@@ -91,8 +116,19 @@ echo ""
 
 # --- Step 2: Start writer ---
 echo "=== Step 2: Start Writer ==="
-export KUBE_CONTEXT NAMESPACE INSERT_INTERVAL_MS
-bash "$SCRIPT_DIR/ft-writer.sh" "$JOURNAL_FILE" &
+KUBECTL="kubectl --context $KUBE_CONTEXT -n $NAMESPACE"
+if [ "$WRITER" = "py" ]; then
+    $KUBECTL wait --for=condition=Ready "pod/$FT_WRITER_POD" --timeout=5m
+    # The journal streams back over stdout; progress goes to writer.log.
+    $KUBECTL exec -i "$FT_WRITER_POD" -- sh -c 'cat > /tmp/ft-writer.py' < "$SCRIPT_DIR/ft-writer.py"
+    $KUBECTL exec "$FT_WRITER_POD" -- python3 /tmp/ft-writer.py \
+        --writers "$WRITERS" --rate "$WRITER_RATE" \
+        --stop-file /tmp/ft-writer.stop --journal - \
+        > "$JOURNAL_FILE" 2> "$REPORT_DIR/writer.log" &
+else
+    export KUBE_CONTEXT NAMESPACE INSERT_INTERVAL_MS
+    bash "$SCRIPT_DIR/ft-writer.sh" "$JOURNAL_FILE" &
+fi
 WRITER_PID=$!
 echo "  Writer PID: $WRITER_PID"
 echo ""
@@ -130,6 +166,7 @@ echo "recovery_start_time: $recovery_time" >> "$REPORT_DIR/test-config.txt"
 for target in $TARGETS; do
     FAILURE_MODE="$FAILURE_MODE" bash "$SCRIPT_DIR/ft-inject.sh" recover "$target"
 done
+echo "recovery_end_time: $(date -u '+%Y-%m-%dT%H:%M:%SZ')" >> "$REPORT_DIR/test-config.txt"
 echo ""
 
 # --- Step 7: Wait for recovery ---
@@ -139,7 +176,11 @@ echo ""
 
 # --- Step 8: Stop writer ---
 echo "=== Step 8: Stop Writer ==="
-kill "$WRITER_PID" 2>/dev/null || true
+if [ "$WRITER" = "py" ]; then
+    $KUBECTL exec "$FT_WRITER_POD" -- touch /tmp/ft-writer.stop
+else
+    kill "$WRITER_PID" 2>/dev/null || true
+fi
 wait "$WRITER_PID" 2>/dev/null || true
 total_inserts=$(tail -n +2 "$JOURNAL_FILE" | wc -l)
 echo "  Total insert attempts: $total_inserts"
@@ -153,6 +194,19 @@ bash "$SCRIPT_DIR/ft-verify.sh" "$JOURNAL_FILE" "$REPORT_DIR"
 verify_exit=$?
 echo ""
 
+# --- Step 10: Availability analysis ---
+# Informational only: never changes the test result.
+echo "=== Step 10: Availability Analysis ==="
+if [ -z "${PROMETHEUS_URL:-}" ]; then
+    VM_SVC=$($KUBECTL get svc -l app.kubernetes.io/component=victoriametrics \
+        -o jsonpath='{.items[0].metadata.name}' 2>/dev/null || true)
+    PROMETHEUS_URL="${VM_SVC:+http://${VM_SVC}:8428}"
+fi
+python3 "$SCRIPT_DIR/ft-analyze.py" "$REPORT_DIR" \
+    --mode "$([ -n "${IS_VM_ENV:-}" ] && echo vm || echo k8s)" \
+    --prometheus-url "$PROMETHEUS_URL" || echo "  WARN: availability analysis failed"
+echo ""
+
 # --- Final status ---
 echo "end_time: $(date -u '+%Y-%m-%dT%H:%M:%SZ')" >> "$REPORT_DIR/test-config.txt"
 echo "result: $([ $verify_exit -eq 0 ] && echo 'PASS' || echo 'FAIL')" >> "$REPORT_DIR/test-config.txt"
@@ -4,7 +4,13 @@ set -euo pipefail
 # Verifies data consistency after fault tolerance test.
 # Compares writer journal against actual database contents.
 #
+# The journal is streamed into a temp table with COPY and compared against
+# ft_test with set-based joins in one ysqlsh session, so verification takes
+# seconds even for journals with hundreds of thousands of rows.
+#
 # Usage: ft-verify.sh <journal_file> [report_dir]
+# YSQLSH overrides the SQL client (e.g. a local psql for testing); it must
+# read SQL from stdin.
 
 KUBE_CONTEXT="${KUBE_CONTEXT:?KUBE_CONTEXT must be set}"
 NAMESPACE="${NAMESPACE:?NAMESPACE must be set}"
@@ -17,16 +23,18 @@ if [ ! -f "$JOURNAL_FILE" ]; then
     exit 1
 fi
 
-YSQLSH="kubectl --context $KUBE_CONTEXT -n $NAMESPACE exec yb-tserver-0 -c yb-tserver -- /home/yugabyte/bin/ysqlsh -h yb-tserver-service -t -A"
+YSQLSH="${YSQLSH:-kubectl --context $KUBE_CONTEXT -n $NAMESPACE exec -i yb-tserver-0 -c yb-tserver -- /home/yugabyte/bin/ysqlsh -h yb-tserver-service}"
 
 echo "=== Fault Tolerance Verification ==="
 echo "Journal: $JOURNAL_FILE"
 echo ""
 
 # --- Parse journal ---
-total_inserts=$(tail -n +2 "$JOURNAL_FILE" | wc -l)
-committed=$(tail -n +2 "$JOURNAL_FILE" | grep -c ',OK$' || true)
-failed=$(tail -n +2 "$JOURNAL_FILE" | grep -c ',ERROR:' || true)
+# Lines are timestamp,writer_id,seq_num[,latency_ms],status; status is last
+# (error messages may contain commas).
+read -r total_inserts committed failed < <(tail -n +2 "$JOURNAL_FILE" | awk -F, '
+    { n++ } $NF == "OK" { ok++ } index($0, ",ERROR:") { err++ }
+    END { print n + 0, ok + 0, err + 0 }')
 
 echo "Journal summary:"
 echo "  Total insert attempts: $total_inserts"
@@ -34,47 +42,58 @@ echo "  Committed (OK): $committed"
 echo "  Failed (ERROR): $failed"
 echo ""
 
-# Extract committed seq_nums per writer
-committed_seqs=$(tail -n +2 "$JOURNAL_FILE" | grep ',OK$' | awk -F, '{print $2 ":" $3}' | sort -t: -k1,1n -k2,2n)
-
-# --- Query database ---
-echo "Querying database..."
-db_rows=$($YSQLSH -c "SELECT writer_id, seq_num, payload FROM ft_test ORDER BY writer_id, seq_num;" 2>/dev/null)
-db_count=$($YSQLSH -c "SELECT COUNT(*) FROM ft_test;" 2>/dev/null | tr -d ' ')
+# --- Compare journal and database in one session ---
+echo "Loading journal and comparing with database..."
+result=$(
+    {
+        cat << 'SQL'
+\set ON_ERROR_STOP on
+CREATE TEMP TABLE ft_journal (writer_id INT, seq_num INT, ok BOOLEAN);
+COPY ft_journal FROM STDIN WITH (FORMAT csv);
+SQL
+        tail -n +2 "$JOURNAL_FILE" | awk -F, '{ print $2 "," $3 "," ($NF == "OK" ? "t" : "f") }'
+        cat << 'SQL'
+\.
+CREATE TEMP TABLE ft_check AS
+WITH j AS (
+    SELECT writer_id, seq_num, bool_or(ok) AS ok FROM ft_journal GROUP BY writer_id, seq_num
+), d AS (
+    SELECT writer_id, seq_num, count(*) AS n, min(payload) AS payload,
+           bool_and(payload = md5(writer_id::text || ':' || seq_num::text)) AS intact
+    FROM ft_test GROUP BY writer_id, seq_num
+)
+SELECT j.writer_id AS j_writer, j.seq_num AS j_seq, j.ok,
+       d.writer_id AS d_writer, d.seq_num AS d_seq, d.n, d.payload, d.intact
+FROM j FULL OUTER JOIN d ON j.writer_id = d.writer_id AND j.seq_num = d.seq_num;
+\echo SUMMARY
+SELECT (SELECT count(*) FROM ft_test),
+       count(*) FILTER (WHERE ok AND d_writer IS NULL),
+       count(*) FILTER (WHERE ok AND NOT intact),
+       count(*) FILTER (WHERE n > 1),
+       count(*) FILTER (WHERE d_writer IS NOT NULL AND NOT ok),
+       count(*) FILTER (WHERE d_writer IS NOT NULL AND j_writer IS NULL)
+FROM ft_check;
+\echo MISSING
+SELECT j_writer, j_seq FROM ft_check WHERE ok AND d_writer IS NULL
+ORDER BY j_writer, j_seq LIMIT 50;
+\echo CORRUPT
+SELECT j_writer, j_seq, md5(j_writer::text || ':' || j_seq::text), payload FROM ft_check
+WHERE ok AND NOT intact ORDER BY j_writer, j_seq LIMIT 50;
+\echo DUPLICATE
+SELECT d_writer, d_seq, n FROM ft_check WHERE n > 1 ORDER BY d_writer, d_seq LIMIT 50;
+SQL
+    } | $YSQLSH -q -t -A -X
+)
+
+section() {
+    echo "$result" | awk -v s="$1" '/^[A-Z]+$/ { cur = $0; next } cur == s && NF'
+}
+
+IFS='|' read -r db_count missing corrupted duplicates extra_failed extra_unjournaled <<< "$(section SUMMARY)"
+extra=$((extra_failed + extra_unjournaled))
 
 echo "  Rows in database: $db_count"
 echo "  Expected (committed): $committed"
-echo ""
-
-# --- Verify committed rows exist in DB ---
-echo "Verifying committed rows..."
-missing=0
-corrupted=0
-missing_list=""
-
-while IFS=: read -r writer_id seq_num; do
-    expected_payload=$(echo -n "${writer_id}:${seq_num}" | md5sum | awk '{print $1}')
-
-    # Check if row exists with correct payload (exact match on writer_id and seq_num, first match only)
-    row=$(echo "$db_rows" | awk -F'|' -v w="$writer_id" -v s="$seq_num" '$1==w && $2==s {print; exit}' || true)
-
-    if [ -z "$row" ]; then
-        missing=$((missing + 1))
-        missing_list="${missing_list}  writer=${writer_id} seq=${seq_num}\n"
-    else
-        actual_payload=$(echo "$row" | awk -F'|' '{print $3}')
-        if [ "$actual_payload" != "$expected_payload" ]; then
-            corrupted=$((corrupted + 1))
-            echo "  CORRUPT: writer=$writer_id seq=$seq_num expected=$expected_payload got=$actual_payload"
-        fi
-    fi
-done <<< "$committed_seqs"
-
-# --- Check for extra rows (uncommitted but present) ---
-extra=$((db_count - committed))
-if [ "$extra" -lt 0 ]; then
-    extra=0
-fi
 
 # --- Report ---
 echo ""
@@ -85,7 +104,8 @@ pass=true
 
 if [ "$missing" -gt 0 ]; then
     echo "FAIL: $missing committed rows MISSING from database"
-    echo -e "$missing_list"
+    section MISSING | awk -F'|' '{ print "  writer=" $1 " seq=" $2 }'
+    [ "$missing" -gt 50 ] && echo "  ... (first 50 shown)"
     pass=false
 else
     echo "PASS: All $committed committed rows present"
@@ -93,13 +113,21 @@ fi
 
 if [ "$corrupted" -gt 0 ]; then
     echo "FAIL: $corrupted rows have CORRUPTED payloads"
+    section CORRUPT | awk -F'|' '{ print "  CORRUPT: writer=" $1 " seq=" $2 " expected=" $3 " got=" $4 }'
+    [ "$corrupted" -gt 50 ] && echo "  ... (first 50 shown)"
     pass=false
 else
     echo "PASS: All payloads intact (checksum verified)"
 fi
 
+if [ "$duplicates" -gt 0 ]; then
+    echo "WARN: $duplicates (writer, seq) keys stored more than once"
+    section DUPLICATE | awk -F'|' '{ print "  writer=" $1 " seq=" $2 " copies=" $3 }'
+fi
+
 if [ "$extra" -gt 0 ]; then
     echo "INFO: $extra extra rows in DB (uncommitted but persisted — acceptable)"
+    echo "  $extra_failed journaled as ERROR, $extra_unjournaled not in journal (in flight at stop)"
 fi
 
 echo ""
@@ -123,7 +151,10 @@ Failed: $failed
 DB rows: $db_count
 Missing: $missing
 Corrupted: $corrupted
+Duplicates: $duplicates
 Extra: $extra
+Extra journaled as error: $extra_failed
+Extra not in journal: $extra_unjournaled
 Result: $([ "$pass" = true ] && echo "PASS" || echo "FAIL")
 EOF
     echo ""
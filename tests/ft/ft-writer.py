@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""High-rate insert writer for fault tolerance testing.
+
+Runs N concurrent writers, each on its own persistent connection, inserting
+into ft_test at a fixed rate and journaling every attempt, like ft-writer.sh
+but at thousands of inserts per second. Journal lines are
+timestamp,writer_id,seq_num,latency_ms,status (status last, so ft-verify.sh
+reads them unchanged); they are buffered and appended every --flush-interval.
+
+A writer whose connection breaks logs the attempt as an ERROR and reconnects
+on its next attempt (through the service, so to a surviving tserver). An
+insert that exceeds --timeout is logged as an ERROR and its connection
+dropped; such a row may still have committed (an "extra" row to the verifier).
+
+Usage:
+    ft-writer.py --host yb-tserver-service --writers 16 --rate 200 --journal -
+Stops on SIGTERM/SIGINT, after --duration seconds, or when --stop-file exists.
+Needs asyncpg (pip install asyncpg).
+"""
+
+import argparse
+import asyncio
+import hashlib
+import os
+import signal
+import sys
+import time
+from datetime import datetime, timezone
+
+try:
+    import asyncpg
+except ImportError:
+    print("Error: asyncpg is required. Install with: pip install asyncpg", file=sys.stderr)
+    sys.exit(1)
+
+JOURNAL_HEADER = "timestamp,writer_id,seq_num,latency_ms,status"
+
+
+def payload(writer_id: int, seq_num: int) -> str:
+    """md5 of "<writer_id>:<seq_num>", as ft-writer.sh and ft-verify.sh compute it."""
+    return hashlib.md5(f"{writer_id}:{seq_num}".encode()).hexdigest()
+
+
+def iso_ms(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+def error_status(e: BaseException) -> str:
+    """ERROR:<sqlstate or exception class> <message>, on one line."""
+    code = getattr(e, "sqlstate", None) or type(e).__name__
+    msg = " ".join(str(e).split())
+    return f"ERROR:{code} {msg}"[:200]
+
+
+class Journal:
+    """Buffered journal; lines are appended in batches by flush()."""
+
+    def __init__(self, path: str):
+        self.f = sys.stdout if path == "-" else open(path, "w")
+        self.lines: list[str] = []
+        self.ok = self.errors = 0
+        self.latencies: list[float] = []
+        self.write(JOURNAL_HEADER)
+        self.flush()
+
+    def write(self, line: str):
+        self.lines.append(line)
+
+    def record(self, start: float, writer_id: int, seq_num: int, latency_ms: float, status: str):
+        self.write(f"{iso_ms(start)},{writer_id},{seq_num},{latency_ms:.3f},{status}")
+        if status == "OK":
+            self.ok += 1
+            self.latencies.append(latency_ms)
+        else:
+            self.errors += 1
+
+    def flush(self):
+        if self.lines:
+            self.f.write("\n".join(self.lines) + "\n")
+            self.f.flush()
+            self.lines.clear()
+
+    def close(self):
+        self.flush()
+        if self.f is not sys.stdout:
+            self.f.close()
+
+
+class Writer:
+    def __init__(self, args, writer_id: int, journal: Journal, stop: asyncio.Event):
+        self.args = args
+        self.writer_id = writer_id
+        self.journal = journal
+        self.stop = stop
+        self.conn = None
+        self.seq_num = 0
+
+    async def connect(self):
+        a = self.args
+        self.conn = await asyncpg.connect(
+            host=a.host, port=a.port, user=a.user, password=a.password, database=a.db,
+            timeout=a.timeout)
+
+    def drop_connection(self):
+        if self.conn is not None:
+            self.conn.terminate()
+            self.conn = None
+
+    async def insert(self):
+        if self.conn is None:
+            await self.connect()
+        await self.conn.execute(
+            "INSERT INTO ft_test (writer_id, seq_num, payload) VALUES ($1, $2, $3)",
+            self.writer_id, self.seq_num, payload(self.writer_id, self.seq_num))
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.args.rate if self.args.rate > 0 else 0.0
+        due = loop.time()
+        while not self.stop.is_set():
+            self.seq_num += 1
+            start_wall = time.time()
+            t0 = loop.time()
+            try:
+                await asyncio.wait_for(self.insert(), timeout=self.args.timeout)
+                status = "OK"
+            except asyncio.TimeoutError:
+                # Outcome unknown; the connection may be stuck on a dead tserver.
+                self.drop_connection()
+                status = f"ERROR:timeout no reply within {self.args.timeout}s"
+            except (asyncpg.PostgresError, asyncpg.InterfaceError, OSError) as e:
+                if self.conn is None or self.conn.is_closed() or not isinstance(e, asyncpg.PostgresError):
+                    self.drop_connection()
+                status = error_status(e)
+            latency_ms = (loop.time() - t0) * 1000.0
+            self.journal.record(start_wall, self.writer_id, self.seq_num, latency_ms, status)
+
+            if status != "OK" and self.conn is None:
+                # Back off before reconnecting so a down cluster is not hammered.
+                await self.sleep(self.args.retry_delay)
+                due = loop.time()
+            elif interval:
+                due += interval
+                # After a stall, resume the schedule instead of bursting to catch up.
+                due = max(due, loop.time() - interval)
+                await self.sleep(due - loop.time())
+
+    async def sleep(self, seconds: float):
+        if seconds > 0:
+            try:
+                await asyncio.wait_for(self.stop.wait(), timeout=seconds)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def setup_table(args):
+    conn = await asyncpg.connect(host=args.host, port=args.port, user=args.user,
+                                 password=args.password, database=args.db, timeout=args.timeout)
+    try:
+        await conn.execute("""
+            CREATE TABLE IF NOT EXISTS ft_test (
+                id SERIAL PRIMARY KEY,
+                writer_id INT NOT NULL,
+                seq_num INT NOT NULL,
+                payload VARCHAR(64) NOT NULL,
+                created_at TIMESTAMPTZ DEFAULT NOW()
+            )""")
+        await conn.execute("TRUNCATE ft_test")
+    finally:
+        await conn.close()
+
+
+async def watch(args, journal: Journal, stop: asyncio.Event):
+    """Flush the journal, print progress to stderr and check stop conditions."""
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    last_report = started
+    last_ok = last_err = 0
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=args.flush_interval)
+        except asyncio.TimeoutError:
+            pass
+        journal.flush()
+        now = loop.time()
+        if args.duration and now - started >= args.duration:
+            stop.set()
+        if args.stop_file and os.path.exists(args.stop_file):
+            stop.set()
+        if now - last_report >= args.progress_interval:
+            lat = sorted(journal.latencies)
+            journal.latencies.clear()
+            p50 = lat[len(lat) // 2] if lat else 0.0
+            p99 = lat[min(len(lat) - 1, int(len(lat) * 0.99))] if lat else 0.0
+            span = now - last_report
+            print(f"[{now - started:6.0f}s] ok/s: {(journal.ok - last_ok) / span:8.1f}  "
+                  f"err/s: {(journal.errors - last_err) / span:7.1f}  "
+                  f"lat ms p50/p99: {p50:.1f}/{p99:.1f}", file=sys.stderr)
+            last_report, last_ok, last_err = now, journal.ok, journal.errors
+
+
+async def main_async(args):
+    if args.stop_file and os.path.exists(args.stop_file):
+        os.remove(args.stop_file)
+    if not args.no_setup:
+        await setup_table(args)
+    journal = Journal(args.journal)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop.set)
+
+    writers = [Writer(args, args.writer_id_base + i, journal, stop) for i in range(args.writers)]
+    print(f"{len(writers)} writer(s) started (ids {writers[0].writer_id}-{writers[-1].writer_id}, "
+          f"{args.rate or 'max'}/s each), journal: {args.journal}", file=sys.stderr)
+    try:
+        await asyncio.gather(watch(args, journal, stop), *(w.run() for w in writers))
+    finally:
+        for w in writers:
+            if w.conn is not None:
+                w.conn.terminate()
+        journal.close()
+    print(f"Writers stopped after {journal.ok + journal.errors} inserts "
+          f"({journal.ok} OK, {journal.errors} errors)", file=sys.stderr)
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="High-rate fault tolerance writer (journal compatible with ft-verify.sh)")
+    p.add_argument("--host", default="yb-tserver-service")
+    p.add_argument("--port", type=int, default=5433)
+    p.add_argument("--user", default="yugabyte")
+    p.add_argument("--password", default="yugabyte")
+    p.add_argument("--db", default="yugabyte")
+    p.add_argument("--writers", type=int, default=8, help="concurrent writers, one connection each")
+    p.add_argument("--writer-id-base", type=int, default=1, help="writer_id of the first writer")
+    p.add_argument("--rate", type=float, default=100,
+                   help="inserts/s per writer (0 = back to back)")
+    p.add_argument("--timeout", type=float, default=10,
+                   help="seconds before an insert or connect attempt counts as failed")
+    p.add_argument("--retry-delay", type=float, default=0.2,
+                   help="seconds to wait before reconnecting after a connection failure")
+    p.add_argument("--journal", default="-", help="journal file ('-' = stdout)")
+    p.add_argument("--flush-interval", type=float, default=0.5)
+    p.add_argument("--progress-interval", type=float, default=5)
+    p.add_argument("--duration", type=float, default=0, help="stop after N seconds (0 = until signalled)")
+    p.add_argument("--stop-file", default="", help="stop once this file exists (removed at start)")
+    p.add_argument("--no-setup", action="store_true", help="do not create/truncate ft_test")
+    args = p.parse_args(argv)
+    if args.writers < 1:
+        p.error("--writers must be >= 1")
+    return args
+
+
+def main():
+    asyncio.run(main_async(parse_args()))
+
+
+if __name__ == "__main__":
+    main()